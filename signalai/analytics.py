@@ -1,65 +1,146 @@
-import csv
 import datetime
-from collections import defaultdict
+import json
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Set
+from typing import Any, Dict, Optional, Set
 
+from .io import eventlog
 from .models import Item
 
 # Path for engagement events log
-LOG_PATH = Path(__file__).resolve().parent.parent / "out" / "engagement_log.csv"
+LOG_PATH = Path(__file__).resolve().parent.parent / "out" / "engagement_log"
+_LOG_FIELDS = ["timestamp", "item_url", "source", "themes", "event"]
 
-
-def _ensure_header() -> None:
-    if LOG_PATH.exists():
-        return
-    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with LOG_PATH.open("w", newline="") as fh:
-        writer = csv.DictWriter(
-            fh,
-            fieldnames=["timestamp", "item_url", "source", "themes", "event"],
-        )
-        writer.writeheader()
+# Half-life of the time-decayed engagement counters.
+DECAY_HALF_LIFE_DAYS = 14.0
+_VIEW_VERSION = 1
+_view_lock = threading.Lock()
 
 
 def log_event(item: Item, event: str) -> None:
-    """Log a user engagement event for an item."""
-    _ensure_header()
-    with LOG_PATH.open("a", newline="") as fh:
-        writer = csv.DictWriter(
-            fh,
-            fieldnames=["timestamp", "item_url", "source", "themes", "event"],
-        )
-        writer.writerow(
-            {
-                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-                "item_url": item.url,
-                "source": item.source,
-                "themes": "|".join(item.tags),
-                "event": event,
-            }
-        )
-
-
-def summarize() -> Dict[str, Dict[str, int]]:
-    """Aggregate engagement counts by source and theme."""
-    by_source: Dict[str, int] = defaultdict(int)
-    by_theme: Dict[str, int] = defaultdict(int)
-    if not LOG_PATH.exists():
-        return {"source": {}, "theme": {}}
-    with LOG_PATH.open() as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            by_source[row["source"]] += 1
-            themes = row["themes"].split("|") if row["themes"] else []
-            for t in themes:
-                by_theme[t] += 1
-    return {"source": dict(by_source), "theme": dict(by_theme)}
-
-
-def engagement_boost(item: Item) -> float:
-    """Return a normalized engagement boost for the given item."""
-    summary = summarize()
+    """Log a user engagement event for an item (buffered, see :mod:`signalai.io.eventlog`)."""
+    eventlog.get_log(LOG_PATH, _LOG_FIELDS).append(
+        {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "item_url": item.url,
+            "source": item.source,
+            "themes": "|".join(item.tags),
+            "event": event,
+        }
+    )
+
+
+def _view_path() -> Path:
+    """Materialized aggregates live next to the log they summarise."""
+    return LOG_PATH.with_name(LOG_PATH.stem + ".agg.json")
+
+
+def _empty_view() -> Dict[str, Any]:
+    return {
+        "version": _VIEW_VERSION,
+        "cursor": None,
+        "half_life_days": DECAY_HALF_LIFE_DAYS,
+        "decay_ref": time.time(),
+        "counts": {"source": {}, "theme": {}},
+        "decayed": {"source": {}, "theme": {}},
+    }
+
+
+def _load_view() -> Dict[str, Any]:
+    path = _view_path()
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            view = json.load(f)
+        if view.get("version") == _VIEW_VERSION and view.get("half_life_days") == DECAY_HALF_LIFE_DAYS:
+            return view
+    # Missing, outdated or built with another half-life: rebuild from the log.
+    return _empty_view()
+
+
+def _save_view(view: Dict[str, Any]) -> None:
+    path = _view_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(view, f)
+    os.replace(tmp, path)
+
+
+def _decay(view: Dict[str, Any], now: float) -> float:
+    """Return the factor that moves decayed counters from ``decay_ref`` to *now*."""
+    half_life_s = view["half_life_days"] * 86400.0
+    return 0.5 ** (max(0.0, now - view["decay_ref"]) / half_life_s)
+
+
+def _event_time(timestamp: str, now: float) -> float:
+    try:
+        return min(now, datetime.datetime.fromisoformat(timestamp).timestamp())
+    except (TypeError, ValueError):
+        return now
+
+
+def refresh_view() -> Dict[str, Any]:
+    """Fold events logged since the last refresh into the materialized view.
+
+    The view stores raw and time-decayed counts by source and theme plus the
+    log cursor they cover, so only the log tail is read. Delete the
+    ``.agg.json`` file to rebuild it from the whole log.
+    """
+    with _view_lock:
+        view = _load_view()
+        changed = False
+        tail = eventlog.read_tail(LOG_PATH, ["timestamp", "source", "themes"], view["cursor"])
+        for block, cursor in tail:
+            if cursor == view["cursor"]:
+                continue
+            changed = True
+            now = time.time()
+            # Move the decayed counters to a common reference time before adding.
+            factor = _decay(view, now)
+            for group in view["decayed"].values():
+                for key in group:
+                    group[key] *= factor
+            view["decay_ref"] = now
+            half_life_s = view["half_life_days"] * 86400.0
+            for ts, source, themes in zip(block["timestamp"], block["source"], block["themes"]):
+                weight = 0.5 ** ((now - _event_time(ts, now)) / half_life_s)
+                keys = [("source", source)] + [("theme", t) for t in themes.split("|") if t]
+                for group, key in keys:
+                    view["counts"][group][key] = view["counts"][group].get(key, 0) + 1
+                    view["decayed"][group][key] = view["decayed"][group].get(key, 0.0) + weight
+            view["cursor"] = cursor
+        if changed:
+            _save_view(view)
+        return view
+
+
+def summarize(decayed: bool = False) -> Dict[str, Dict[str, float]]:
+    """Aggregate engagement counts by source and theme.
+
+    Counts come from the incrementally maintained view (see
+    :func:`refresh_view`), so the cost depends on the number of events logged
+    since the last call rather than the size of the log. With *decayed* the
+    counts fade with a half-life of :data:`DECAY_HALF_LIFE_DAYS`.
+    """
+    view = refresh_view()
+    if not decayed:
+        return {"source": dict(view["counts"]["source"]), "theme": dict(view["counts"]["theme"])}
+    factor = _decay(view, time.time())
+    return {group: {k: v * factor for k, v in counts.items()} for group, counts in view["decayed"].items()}
+
+
+def engagement_boost(
+    item: Item, summary: Optional[Dict[str, Dict[str, int]]] = None
+) -> float:
+    """Return a normalized engagement boost for the given item.
+
+    Pass a precomputed :func:`summarize` result as *summary* to avoid
+    re-reading the log when boosting many items at once.
+    """
+    if summary is None:
+        summary = summarize()
     source_counts = summary["source"]
     theme_counts = summary["theme"]
     source_max = max(source_counts.values(), default=0)
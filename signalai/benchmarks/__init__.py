@@ -0,0 +1 @@
+"""Small, dependency-free benchmarks runnable with ``python -m``."""
@@ -0,0 +1,87 @@
+"""Compare memory and lookup speed of the seen-hash set and :class:`HashIndex`.
+
+Run with ``python -m signalai.benchmarks.hashindex [--items N]``. The old
+ingest path kept every stored item's 40-character SHA-1 hex hash in a Python
+``set``; the index keeps 64-bit keys in a sorted array behind a Bloom filter.
+Memory is measured with :mod:`tracemalloc`, and lookups are timed for hashes
+that are stored (hits) and that are not (misses, the common case at ingest).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterable, List, Tuple
+
+from signalai.io.hashindex import HashIndex, key_of
+
+
+def _hashes(n: int, salt: str) -> Iterable[str]:
+    for i in range(n):
+        yield hashlib.sha1(f"{salt}{i}".encode()).hexdigest()
+
+
+def _measure(build: Callable[[], object]) -> Tuple[object, float, float]:
+    """Return ``(result, MiB retained, build seconds)``."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, retained / 2**20, elapsed
+
+
+def _lookups_per_s(container, probes: List[str]) -> float:
+    start = time.perf_counter()
+    for h in probes:
+        h in container
+    return len(probes) / (time.perf_counter() - start)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--probes", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    seen, set_mb, set_s = _measure(lambda: set(_hashes(args.items, "stored")))
+
+    def build_index() -> HashIndex:
+        index = HashIndex()
+        index.rebuild(_hashes(args.items, "stored"))
+        return index
+
+    index, index_mb, index_s = _measure(build_index)
+    with tempfile.TemporaryDirectory() as tmp:
+        index.path = Path(tmp) / "store.hashidx"
+        index.save()
+        file_mb = index.path.stat().st_size / 2**20
+        start = time.perf_counter()
+        HashIndex(index.path)
+        load_s = time.perf_counter() - start
+
+    hits = [h for _, h in zip(range(args.probes), _hashes(args.items, "stored"))]
+    misses = list(_hashes(args.probes, "new"))
+    false_pos = sum(index._maybe(key_of(h)) for h in misses) / len(misses)
+
+    print(f"{args.items:,} stored hashes")
+    print(f"{'':12} {'memory':>10} {'build':>8} {'hits/s':>12} {'misses/s':>12}")
+    print(
+        f"{'set[str]':12} {set_mb:>7.1f} MiB {set_s:>7.2f}s "
+        f"{_lookups_per_s(seen, hits):>12,.0f} {_lookups_per_s(seen, misses):>12,.0f}"
+    )
+    print(
+        f"{'HashIndex':12} {index_mb:>7.1f} MiB {index_s:>7.2f}s "
+        f"{_lookups_per_s(index, hits):>12,.0f} {_lookups_per_s(index, misses):>12,.0f}"
+    )
+    print(f"index file {file_mb:.1f} MiB, loaded in {load_s * 1000:.0f} ms; "
+          f"Bloom false-positive rate {false_pos:.2%}")
+
+
+if __name__ == "__main__":
+    main()
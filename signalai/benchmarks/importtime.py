@@ -0,0 +1,96 @@
+"""Measure cold-start import cost of each CLI subcommand.
+
+Run with ``python -m signalai.benchmarks.importtime``. Every subcommand is
+measured in a fresh interpreter with ``-X importtime`` so earlier imports do
+not hide later ones, and the total is compared against a cold-start target.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Modules each subcommand imports before doing any work.
+SUBCOMMANDS: Dict[str, List[str]] = {
+    "config": ["signalai.cli"],
+    "analytics": ["signalai.cli", "signalai.analytics"],
+    "migrate-store": ["signalai.cli", "signalai.io.storage", "signalai.pipeline.normalize"],
+    "restore-store": ["signalai.cli", "signalai.io.backup", "signalai.io.storage"],
+    "migrate-logs": ["signalai.cli", "signalai.analytics", "signalai.pipeline.ranker"],
+    "run": [
+        "signalai.cli",
+        "signalai.io.http",
+        "signalai.llm.summarize",
+        "signalai.llm.impacts",
+        "signalai.llm.cache",
+        "signalai.llm.client",
+        "signalai.pipeline.ingest",
+        "signalai.pipeline.ranker",
+        "signalai.pipeline.theme",
+        "signalai.pipeline.draft",
+        "signalai.pipeline.formatter",
+        "signalai.pipeline.emitter",
+    ],
+}
+
+# Cold-start budgets in milliseconds.
+TARGET_MS: Dict[str, float] = {
+    "config": 250.0,
+    "analytics": 300.0,
+    "migrate-store": 300.0,
+    "restore-store": 300.0,
+    "migrate-logs": 400.0,
+    "run": 800.0,
+}
+
+
+def measure(modules: List[str]) -> Tuple[float, List[Tuple[float, str]]]:
+    """Import *modules* in a fresh interpreter.
+
+    Returns the total import time in milliseconds and ``(ms, module)`` pairs
+    for every top-level import, slowest first.
+    """
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    top: List[Tuple[float, str]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = line[len("import time:") :].split("|", 2)
+        # Only imports at the outermost level; nested ones are included in them.
+        if name.startswith(" ") and not name.startswith("  "):
+            top.append((int(cumulative) / 1000.0, name.strip()))
+    total = sum(ms for ms, _ in top)
+    return total, sorted(top, reverse=True)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports to list")
+    parser.add_argument("commands", nargs="*", help="Subcommands to measure (default: all)")
+    args = parser.parse_args(argv)
+    unknown = set(args.commands) - set(SUBCOMMANDS)
+    if unknown:
+        parser.error(f"unknown subcommand(s): {', '.join(sorted(unknown))}")
+
+    slow = 0
+    for command in args.commands or SUBCOMMANDS:
+        total, top = measure(SUBCOMMANDS[command])
+        target = TARGET_MS[command]
+        status = "OK" if total <= target else "SLOW"
+        slow += status == "SLOW"
+        print(f"{command:<14} {total:8.1f} ms  (target {target:.0f} ms)  {status}")
+        for ms, name in top[: args.top]:
+            print(f"    {ms:8.1f} ms  {name}")
+    return 1 if slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Compare keyword matching throughput before and after the shared matcher.
+
+Run with ``python -m signalai.benchmarks.keywords [--items N]``. A synthetic
+store of titles and summaries is scored with the original per-keyword
+substring loops and with :mod:`signalai.rules.matcher`:
+
+- keyword match: one scan per item. The original loop counted the
+  ``BOOST_TERMS``; the matcher finds every ranking and theme keyword at once.
+  It runs once per item at ingest, where the hits are stored with the item.
+- rank features: ``BOOST_TERMS`` hits per item on every run. The ranker now
+  reads the stored hits instead of scanning the text.
+- theme detection over the whole store.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+from typing import Callable, List
+
+from signalai.rules import matcher
+from signalai.rules.keywords import BOOST_TERMS, THEME_KEYWORDS
+
+# Filler words contain no keyword, so hits come only from KEYWORDS (about one
+# or two per item, roughly like real feed items).
+FILLER = (
+    "model training data results paper method show improve we propose large language "
+    "scaling study open weights release suite dataset policy team update"
+).split()
+KEYWORDS = list(BOOST_TERMS) + [kw for kws in THEME_KEYWORDS.values() for kw in kws]
+
+
+def synthetic_store(n: int, seed: int = 0) -> List[SimpleNamespace]:
+    rnd = random.Random(seed)
+    vocab = FILLER * 60 + KEYWORDS
+    items = []
+    for i in range(n):
+        title = " ".join(rnd.choice(vocab) for _ in range(8)).capitalize()
+        summary = " ".join(rnd.choice(vocab) for _ in range(40))
+        items.append(SimpleNamespace(title=f"{title} {i}", summary=summary))
+    return items
+
+
+def legacy_hits(item) -> int:
+    text = (item.title + " " + item.summary).lower()
+    return sum(1 for kw in BOOST_TERMS if kw in text)
+
+
+_BOOST_SET = frozenset(BOOST_TERMS)
+
+
+def matcher_hits(item) -> int:
+    return len(matcher.keyword_hits(item.title + " " + item.summary) & _BOOST_SET)
+
+
+def stored_hits(hits) -> int:
+    # Same as ranker.extract_features on a normalized item.
+    return len(_BOOST_SET.intersection(hits))
+
+
+def legacy_detect(items):
+    text_join = lambda it: (it.title + " " + it.summary).lower()
+    cat = lambda keys: any(any(k in text_join(it) for k in keys) for it in items)
+    return {name: cat(keywords) for name, keywords in THEME_KEYWORDS.items()}
+
+
+def matcher_detect(items):
+    hits = set()
+    for it in items:
+        hits |= matcher.keyword_hits(it.title + " " + it.summary)
+    return {name: any(k in hits for k in kws) for name, kws in THEME_KEYWORDS.items()}
+
+
+def _rate(fn: Callable[[], object], n: int, repeat: int = 3) -> float:
+    """Items per second of the fastest of *repeat* runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return n / best
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000, help="Synthetic store size")
+    args = parser.parse_args(argv)
+
+    items = synthetic_store(args.items)
+    # Theme detection stops at the first item mentioning a theme, so measure
+    # it on a store where no item does (its worst case).
+    misses = [
+        SimpleNamespace(
+            title=" ".join(w for w in it.title.lower().split() if w in FILLER),
+            summary=" ".join(w for w in it.summary.split() if w in FILLER),
+        )
+        for it in items
+    ]
+    assert [legacy_hits(it) for it in items[:1000]] == [matcher_hits(it) for it in items[:1000]]
+    assert legacy_detect(items) == matcher_detect(items)
+    assert legacy_detect(misses) == matcher_detect(misses)
+
+    n = len(items)
+    stored = [sorted(matcher.keyword_hits(it.title + " " + it.summary)) for it in items]
+    assert [legacy_hits(it) for it in items[:1000]] == [stored_hits(h) for h in stored[:1000]]
+    rows = [
+        ("keyword match", lambda: [legacy_hits(it) for it in items], lambda: [matcher_hits(it) for it in items]),
+        ("rank features", lambda: [legacy_hits(it) for it in items], lambda: [stored_hits(h) for h in stored]),
+        ("theme detect", lambda: legacy_detect(misses), lambda: matcher_detect(misses)),
+    ]
+    backend = "aho-corasick" if matcher.KEYWORDS._automaton is not None else "substring"
+    print(f"{n} items, {len(matcher.KEYWORDS.patterns)} patterns, matcher backend: {backend}")
+    for name, before, after in rows:
+        b, a = _rate(before, n), _rate(after, n)
+        print(f"{name:<17} before {b:>12,.0f} items/s  after {a:>12,.0f} items/s  ({a / b:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+"""Compare load time and memory of stored items as ``Item`` and ``ItemRecord``.
+
+Run with ``python -m signalai.benchmarks.records [--items N ...]``. Each
+representation is built in a fresh interpreter from the same stream of
+stored item dicts (as read back from the store, with a normalized record)
+and kept in a list, the way a full-store ranking pass would hold them:
+
+- ``validate``: :meth:`Item.model_validate`, the old load path;
+- ``from_stored``: :meth:`Item.from_stored`, trusted construction;
+- ``record``: :class:`ItemRecord`, the compact bulk representation.
+
+``stream`` only generates the dicts and keeps nothing; it is the baseline
+the other times include. Memory is the growth in resident set size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List
+
+VARIANTS = ("stream", "validate", "from_stored", "record")
+
+
+def _rss_mib() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def _stored(n: int) -> Iterator[Dict[str, Any]]:
+    from signalai.models import Item
+    from signalai.pipeline.normalize import normalize
+
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    template = Item(
+        title="Open-weight agent model tops coding benchmark",
+        url="https://example.com/posts/0",
+        summary="<p>The release adds tool use, a 128k context window and an eval harness.</p>",
+        published=start,
+        tags=["agents", "evals"],
+        source="rss",
+        hash="0" * 40,
+        domain="example.com",
+    )
+    template.norm = normalize(template)
+    base = template.model_dump(mode="json")
+    for i in range(n):
+        norm = dict(base["norm"])
+        norm["title"] = f"{norm['title']} {i}"
+        norm["summary"] = f"{norm['summary']} {i}"
+        norm["search_text"] = f"{norm['search_text']} {i}"
+        norm["keyword_hits"] = list(norm["keyword_hits"])
+        yield {
+            **base,
+            "title": f"{base['title']} {i}",
+            "url": f"https://example{i % 500}.com/posts/{i}",
+            "summary": f"{base['summary']} {i}",
+            "published": (start + timedelta(minutes=i)).isoformat(),
+            "tags": list(base["tags"]),
+            "hash": f"{i:040x}",
+            "domain": f"example{i % 500}.com",
+            "norm": norm,
+        }
+
+
+def _measure(variant: str, n: int) -> None:
+    """Build *n* items as *variant* and print ``seconds MiB``."""
+    from signalai.models import Item, ItemRecord
+
+    build = {
+        "stream": lambda d: None,
+        "validate": Item.model_validate,
+        "from_stored": Item.from_stored,
+        "record": ItemRecord,
+    }[variant]
+    gc.collect()
+    before = _rss_mib()
+    start = time.perf_counter()
+    kept = [build(d) for d in _stored(n)]
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    print(f"{elapsed:.3f} {_rss_mib() - before:.1f}")
+    del kept
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument("--measure", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        _measure(args.measure, args.items[0])
+        return
+
+    for n in args.items:
+        print(f"{n:,} stored items")
+        print(f"{'':12} {'load':>8} {'RSS':>10} {'per item':>10}")
+        for variant in args.variants:
+            out = subprocess.run(
+                [sys.executable, "-m", __spec__.name, "--items", str(n), "--measure", variant],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+            seconds, mib = float(out[0]), float(out[1])
+            print(f"{variant:12} {seconds:>7.2f}s {mib:>6.1f} MiB {mib * 2**20 / n:>7.0f} B")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,30 @@
+from __future__ import annotations
+
 import argparse
 import datetime
 import os
 import subprocess
 from pathlib import Path
-from typing import List
 
 from pydantic import ValidationError
 
-from signalai.pipeline import ingest, ranker, theme, draft, formatter, emitter
-from signalai.llm import summarize, impacts
-from signalai.llm.client import LLMClient
 from signalai.config import load_settings
-from signalai.models import Item
-from signalai import analytics
 from signalai.logging import get_logger
 
-
+# Pipeline, LLM and HTTP modules are imported inside the subcommands that use
+# them so that lightweight commands (config, analytics) start quickly.
 logger = get_logger(__name__)
 
 
-def _filter_and_order_candidates(
-    ranked_items: List[Item],
-    new_items: List[Item],
-    window_days: int,
-    prefer_new: bool,
-    only_new: bool,
-) -> List[Item]:
-    """Build the candidate pool based on recency and novelty preferences.
-
-    - If only_new: take ranked new items only.
-    - Else, start from items within the window (if window_days>0) else all.
-      If prefer_new, place new items first (preserving rank), then fill with recent non-new.
-    - If the window is too restrictive and yields nothing, fall back to all ranked items.
-    """
-    new_hashes = {it.hash for it in new_items if it.hash}
-
-    # Build recency-filtered list
-    if window_days and window_days > 0:
-        now = datetime.datetime.now(datetime.timezone.utc)
-        cutoff = now - datetime.timedelta(days=window_days)
-        recent = [it for it in ranked_items if (it.published.tzinfo and it.published >= cutoff) or (not it.published.tzinfo and it.published.replace(tzinfo=datetime.timezone.utc) >= cutoff)]
-    else:
-        recent = list(ranked_items)
-
-    if only_new:
-        pool = [it for it in ranked_items if it.hash in new_hashes]
-        if not pool:
-            logger.info("No new items found; falling back to recent window (%s days)", window_days)
-            pool = recent
-        return pool
-
-    if prefer_new:
-        new_first = [it for it in recent if it.hash in new_hashes]
-        rest = [it for it in recent if it.hash not in new_hashes]
-        pool = new_first + rest
-    else:
-        pool = recent
-
-    if not pool:
-        logger.info("No items in recent window; falling back to all ranked items")
-        pool = ranked_items
-
-    return pool
-
-
 def _run(args: argparse.Namespace) -> None:
     """Run the signal pipeline."""
+    from signalai.io import http
+    from signalai.llm import impacts, summarize
+    from signalai.llm.cache import DiskLLMCache
+    from signalai.llm.client import LLMClient
+    from signalai.models import ItemRecord
+    from signalai.pipeline import draft, emitter, formatter, ingest, ranker, theme
+
     settings = load_settings()
     if args.no_format:
         settings.formatter.enable = False
@@ -81,39 +40,82 @@ def _run(args: argparse.Namespace) -> None:
         timeout=settings.formatter.timeout_s,
     )
 
-    all_items, new_items = ingest.run(Path(args.feeds), Path(args.store))
-
-    for it in all_items:
-        it.signal = ranker.score(it)
-
-    ranked_items = sorted(all_items, key=lambda x: (x.signal, x.published), reverse=True)
-
-    candidates = _filter_and_order_candidates(
-        ranked_items=ranked_items,
-        new_items=new_items,
-        window_days=args.window_days,
-        prefer_new=args.prefer_new,
-        only_new=args.only_new,
+    cache = None
+    if settings.formatter.cache_enable and not args.no_llm_cache:
+        cache_path = Path(args.llm_cache) if args.llm_cache else Path(args.out) / "llm_cache.sqlite"
+        cache = DiskLLMCache(
+            cache_path,
+            max_entries=settings.formatter.cache_max_entries,
+            ttl_s=settings.formatter.cache_ttl_hours * 3600,
+        )
+
+    # Theme clustering reuses embeddings cached next to the store.
+    theme.set_embedding_store(theme.embedding_root(Path(args.store)))
+
+    # Push the recency window down to storage: only partitions overlapping
+    # it are read. Without a window the store is streamed lazily below.
+    now = datetime.datetime.now(datetime.timezone.utc)
+    since = now - datetime.timedelta(days=args.window_days) if args.window_days > 0 else None
+    stored, new_items = ingest.run(
+        Path(args.feeds),
+        Path(args.store),
+        mode=args.ingest_mode,
+        max_concurrency=args.max_concurrency,
+        per_host=args.per_host,
+        since=since,
+        load_store=since is not None,
     )
-
-    top_k = ranker.select(
-        candidates,
+    if since is not None and not any(ranker.published_utc(it) >= since for it in stored):
+        logger.info("No stored items in the %s-day window; scanning the whole store", args.window_days)
+        since = None
+    if since is None:
+        # Rank the whole store as compact records; only the selected ones
+        # are promoted to full items below.
+        stored = ingest.iter_records(Path(args.store))
+
+    n_stories = 0
+
+    def _stories():
+        # Near-duplicates only compete through their cluster's representative.
+        nonlocal n_stories
+        for it in stored:
+            if not it.duplicate_of:
+                n_stories += 1
+                yield it
+
+    top_k, n_candidates = ranker.select_top_k(
+        ranker.score_stream(_stories()),
         args.k,
         settings.style.per_domain_cap,
+        new_hashes={it.hash for it in new_items if it.hash},
+        window_days=args.window_days,
+        prefer_new=args.prefer_new,
+        only_new=args.only_new,
+        now=now,
     )
+    top_k = [it.to_item() if isinstance(it, ItemRecord) else it for it in top_k]
+    ranker.log_impressions(top_k)
 
     logger.info(
-        "Selecting %d items (k=%d) from %d candidates | window_days=%s prefer_new=%s only_new=%s new_ingested=%d total_store=%d",
-        len(top_k), args.k, len(candidates), args.window_days, args.prefer_new, args.only_new, len(new_items), len(all_items)
+        "Selecting %d items (k=%d) from %d candidates | window_days=%s prefer_new=%s only_new=%s new_ingested=%d scored=%d",
+        len(top_k), args.k, n_candidates, args.window_days, args.prefer_new, args.only_new, len(new_items), n_stories
     )
 
     detected_themes = theme.detect(top_k)
 
-    bullets = summarize.top_bullets(top_k, args.llm_summaries, client, settings.style)
+    bullets = summarize.top_bullets(
+        top_k,
+        args.llm_summaries,
+        client,
+        settings.style,
+        cache=cache,
+        max_concurrency=settings.formatter.max_concurrency,
+        batch=settings.formatter.summary_batch,
+    )
 
     impacts_md = ""
     if args.llm_impacts:
-        impacts_md = impacts.generate_impacts_llm(top_k, client)
+        impacts_md = impacts.generate_impacts_llm(top_k, client, cache=cache)
 
     issue_draft = draft.build(
         top_items=top_k,
@@ -127,20 +129,120 @@ def _run(args: argparse.Namespace) -> None:
         cfg=settings.style,
         formatter_cfg=settings.formatter,
         client=client,
+        cache=cache,
     )
 
     emitter.write(final_issue, Path(args.out))
 
+    if cache is not None:
+        logger.info("LLM cache: %d hits, %d misses", cache.hits, cache.misses)
+        cache.close()
+    theme.set_embedding_store(None)
+
+    logger.info(
+        "HTTP: %(requests)d requests, %(retries)d retries, %(failures)d failures, "
+        "%(connections)d connections opened, %(reused)d reused",
+        http.stats(),
+    )
+
 
 def _analytics_report(args: argparse.Namespace) -> None:
     """Print engagement summary grouped by source and theme."""
-    summary = analytics.summarize()
+    from signalai import analytics
+
+    summary = analytics.summarize(decayed=args.decayed)
+    fmt = "{:.2f}" if args.decayed else "{}"
     print("Engagement by source:")
     for src, count in sorted(summary["source"].items(), key=lambda x: -x[1]):
-        print(f"  {src}: {count}")
+        print(f"  {src}: {fmt.format(count)}")
     print("\nEngagement by theme:")
     for theme_name, count in sorted(summary["theme"].items(), key=lambda x: -x[1]):
-        print(f"  {theme_name}: {count}")
+        print(f"  {theme_name}: {fmt.format(count)}")
+
+
+def _migrate_store(args: argparse.Namespace) -> None:
+    """Import every item from one store into another (e.g. JSON -> SQLite).
+
+    Normalized records that are missing or stale are recomputed on the way,
+    so ``--to`` may be omitted to back-fill them in place.
+    """
+    from signalai.io import storage
+    from signalai.pipeline.normalize import backfill_norm
+
+    dst = args.dst or args.src
+    count = storage.migrate_store(Path(args.src), Path(dst), backfill_norm)
+    print(f"Migrated {count} items from {args.src} to {dst}")
+
+
+def _restore_store(args: argparse.Namespace) -> None:
+    """List, verify or restore backed-up versions of a JSON store and its cold partitions."""
+    import gzip
+
+    from signalai.io import storage
+    from signalai.io.backup import BackupSet
+
+    store = Path(args.store)
+    sets = {"": BackupSet(store)}
+    sets.update({f"cold/{month}": b for month, b in storage.partition_backups(store).items()})
+    if args.verify:
+        problems = [
+            f"{label}: {problem}" if label else problem
+            for label, backups in sets.items()
+            for problem in backups.verify()
+        ]
+        for problem in problems:
+            print(problem)
+        if problems:
+            raise SystemExit(1)
+        count = sum(len(backups.versions()) for backups in sets.values())
+        print(f"{count} versions of {args.store} and {len(sets) - 1} cold partitions verified")
+        return
+    if args.version is None and args.to is None and args.partition is None:
+        for label, backups in sets.items():
+            if label:
+                print(label)
+            for v in backups.versions():
+                print(f"{'  ' if label else ''}v{v['version']}  {v['kind']:<8}  {v['created']}")
+        return
+    backups = sets[""] if args.partition is None else storage.partition_backup(store, args.partition)
+    try:
+        content = backups.restore(args.version)
+    except (KeyError, ValueError) as e:
+        raise SystemExit(str(e).strip("'\""))
+    dst = Path(args.to) if args.to else backups.path
+    if dst == backups.path and dst.exists():
+        # Restoring over the store is itself a new version, so it can be undone.
+        previous = dst.read_bytes()
+        backups.record(content, previous if args.partition is None else gzip.decompress(previous))
+    if args.partition is not None:
+        storage.write_partition(dst, content)
+    else:
+        tmp = dst.with_suffix(".tmp")
+        tmp.write_bytes(content)
+        tmp.replace(dst)
+    print(f"Restored {backups.path} version {args.version or 'latest'} to {dst}")
+
+
+def _migrate_logs(args: argparse.Namespace) -> None:
+    """Convert flat CSV event logs into day-partitioned logs."""
+    from signalai import analytics
+    from signalai.io import partlog
+    from signalai.pipeline import ranker
+
+    logs = [
+        (args.ranker_log, ranker.LOG_PATH, ranker.NUMERIC_FIELDS),
+        (args.engagement_log, analytics.LOG_PATH, ()),
+    ]
+    for src, dst, numeric in logs:
+        src = Path(src) if src else dst.with_suffix(".csv")
+        if not src.exists():
+            print(f"Skipping {src}: not found")
+            continue
+        if dst.exists():
+            print(f"Skipping {src}: {dst} already exists")
+            continue
+        count = partlog.migrate_csv(src, dst, numeric=numeric)
+        print(f"Migrated {count} rows from {src} to {dst}")
 
 
 def _edit_config(args: argparse.Namespace) -> None:
@@ -174,6 +276,11 @@ def build_parser() -> argparse.ArgumentParser:
     pref_group.add_argument("--no-prefer-new", dest="prefer_new", action="store_false", help="Do not prioritize newly ingested items")
     run.set_defaults(prefer_new=True)
     run.add_argument("--only-new", action="store_true", help="Only consider items newly ingested this run")
+    run.add_argument("--llm-cache", default=None, help="Path of the persistent LLM response cache (default: <out>/llm_cache.sqlite)")
+    run.add_argument("--no-llm-cache", action="store_true", help="Disable the persistent LLM response cache")
+    run.add_argument("--ingest-mode", choices=("threads", "async"), default="threads", help="Fetch feeds on a thread pool or a single asyncio event loop")
+    run.add_argument("--max-concurrency", type=int, default=16, help="Maximum number of feeds fetched at once")
+    run.add_argument("--per-host", type=int, default=4, help="Maximum concurrent fetches per host (async mode)")
     run.set_defaults(func=_run)
 
     cfg = sub.add_parser("config", help="Edit and validate the configuration file")
@@ -181,8 +288,27 @@ def build_parser() -> argparse.ArgumentParser:
     cfg.set_defaults(func=_edit_config)
 
     analytics_cmd = sub.add_parser("analytics", help="Show engagement summary")
+    analytics_cmd.add_argument("--decayed", action="store_true", help="Show time-decayed counts instead of raw counts")
     analytics_cmd.set_defaults(func=_analytics_report)
 
+    migrate = sub.add_parser("migrate-store", help="Import an existing item store into another backend")
+    migrate.add_argument("--from", dest="src", required=True, help="Source store, e.g. sources.json")
+    migrate.add_argument("--to", dest="dst", default=None, help="Destination store, e.g. sources.db (default: rewrite --from in place)")
+    migrate.set_defaults(func=_migrate_store)
+
+    restore = sub.add_parser("restore-store", help="List, verify or restore backups of a JSON store")
+    restore.add_argument("--store", required=True, help="JSON store, e.g. sources.json")
+    restore.add_argument("--version", type=int, default=None, help="Version to restore (default: latest)")
+    restore.add_argument("--to", default=None, help="Write the restored version here instead of over the store")
+    restore.add_argument("--partition", default=None, metavar="YYYY-MM", help="Restore this cold partition instead of the store file")
+    restore.add_argument("--verify", action="store_true", help="Check every retained version against its checksums")
+    restore.set_defaults(func=_restore_store)
+
+    migrate_logs = sub.add_parser("migrate-logs", help="Convert CSV event logs into partitioned logs")
+    migrate_logs.add_argument("--ranker-log", default=None, help="Ranker CSV log (default: out/ranker_log.csv)")
+    migrate_logs.add_argument("--engagement-log", default=None, help="Engagement CSV log (default: out/engagement_log.csv)")
+    migrate_logs.set_defaults(func=_migrate_logs)
+
     return ap
 
 
@@ -24,6 +24,11 @@ class FormatterConfig(BaseModel):
     temperature: float = 1.0
     max_completion_tokens: int = 1200
     timeout_s: int = 60
+    max_concurrency: int = 4
+    summary_batch: bool = False
+    cache_enable: bool = True
+    cache_max_entries: int = 5000
+    cache_ttl_hours: float = 168
 
 class Settings(BaseModel):
     style: StyleConfig = StyleConfig()
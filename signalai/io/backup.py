@@ -0,0 +1,218 @@
+"""Incremental, compressed backups of JSON files written through storage.
+
+Every save of a JSON file records a new version in ``<file>.backups/``.
+Item stores (lists of item dicts keyed by ``hash``) are recorded as gzip
+deltas holding only the items added or changed since the previous version
+and the hashes removed; every :data:`SNAPSHOT_EVERY` versions, and whenever
+the file is not a list of items, a full gzip snapshot is written instead.
+``manifest.json`` lists the versions with the SHA-256 of each backup file
+and of the content it restores to. Only the last ``keep`` versions, plus
+the snapshot they build on, are retained. The cold partitions of a JSON
+item store are versioned the same way, each in its own set under
+``<store>.backups/cold/YYYY-MM/`` (see
+:func:`signalai.io.storage.partition_backups`); the recorded content is the
+uncompressed partition.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+__all__ = ["BackupSet", "SNAPSHOT_EVERY", "dumps"]
+
+SNAPSHOT_EVERY = 24
+_MANIFEST_VERSION = 1
+
+
+def dumps(obj: Any, default=None) -> bytes:
+    """Serialize *obj* exactly as :class:`~signalai.io.storage.JsonStorage` writes it."""
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=default).encode("utf-8")
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _items(obj: Any) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Return *obj* keyed by item hash, or ``None`` if it is not a list of items."""
+    if not isinstance(obj, list):
+        return None
+    keyed: Dict[str, Dict[str, Any]] = {}
+    for item in obj:
+        if not isinstance(item, dict) or not isinstance(item.get("hash"), str):
+            return None
+        keyed[item["hash"]] = item
+    return keyed if len(keyed) == len(obj) else None
+
+
+def _apply(prev: List[Dict[str, Any]], delta: Dict[str, Any]) -> List[Dict[str, Any]]:
+    upserts = {item["hash"]: item for item in delta["upserts"]}
+    deletes = set(delta["deletes"])
+    out = [upserts.pop(item["hash"], item) for item in prev if item["hash"] not in deletes]
+    out.extend(upserts.values())
+    if "order" in delta:
+        by_hash = {item["hash"]: item for item in out}
+        out = [by_hash[h] for h in delta["order"]]
+    return out
+
+
+class BackupSet:
+    """Versioned backups of one JSON file, kept in *directory* (default ``<file>.backups/``)."""
+
+    def __init__(
+        self,
+        path: Path,
+        keep: int = 5,
+        snapshot_every: int = SNAPSHOT_EVERY,
+        directory: Optional[Path] = None,
+    ) -> None:
+        self.path = path
+        self.keep = keep
+        self.snapshot_every = snapshot_every
+        self.dir = directory or path.with_name(path.name + ".backups")
+        self._manifest_path = self.dir / "manifest.json"
+
+    def versions(self) -> List[Dict[str, Any]]:
+        """Return the manifest entries of the retained versions, oldest first."""
+        if not self._manifest_path.exists():
+            return []
+        with open(self._manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)["versions"]
+
+    def _write(self, name: str, data: bytes) -> str:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        target = self.dir / name
+        tmp = target.with_name(name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(gzip.compress(data, mtime=0))
+        os.replace(tmp, target)
+        return _sha256(target.read_bytes())
+
+    def _save_manifest(self, versions: List[Dict[str, Any]]) -> None:
+        tmp = self._manifest_path.with_name("manifest.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format": _MANIFEST_VERSION, "versions": versions}, f, indent=2)
+        os.replace(tmp, self._manifest_path)
+
+    def record(self, content: bytes, previous: Optional[bytes]) -> Optional[int]:
+        """Record *content* (the bytes about to be written) as a new version.
+
+        *previous* is the file's current content. A delta is only written
+        when it is exactly the last recorded version, so a save that was
+        interrupted or a file edited by hand starts a new snapshot. Returns
+        the new version number, or ``None`` if *content* is unchanged.
+        """
+        versions = self.versions()
+        last = versions[-1] if versions else None
+        content_sha = _sha256(content)
+        if last is not None and last["content_sha256"] == content_sha:
+            return None
+        version = last["version"] + 1 if last else 1
+
+        delta = None
+        since_snapshot = next(
+            (i for i, v in enumerate(reversed(versions)) if v["kind"] == "snapshot"), None
+        )
+        if (
+            last is not None
+            and previous is not None
+            and _sha256(previous) == last["content_sha256"]
+            and since_snapshot is not None
+            and since_snapshot + 1 < self.snapshot_every
+        ):
+            new_obj = json.loads(content)
+            prev_items = _items(json.loads(previous))
+            new_items = _items(new_obj)
+            if prev_items is not None and new_items is not None:
+                delta = {
+                    "upserts": [item for h, item in new_items.items() if prev_items.get(h) != item],
+                    "deletes": [h for h in prev_items if h not in new_items],
+                }
+                prev_list = list(prev_items.values())
+                if _apply(prev_list, delta) != new_obj:
+                    delta["order"] = list(new_items)
+                if dumps(_apply(prev_list, delta)) != content:
+                    delta = None  # e.g. reordered keys: fall back to a snapshot
+
+        if delta is None:
+            kind, name, data = "snapshot", f"v{version:06d}.snapshot.json.gz", content
+        else:
+            kind, name, data = "delta", f"v{version:06d}.delta.json.gz", dumps(delta)
+        versions.append(
+            {
+                "version": version,
+                "kind": kind,
+                "file": name,
+                "sha256": self._write(name, data),
+                "content_sha256": content_sha,
+                "created": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+        self._save_manifest(self._prune(versions))
+        return version
+
+    def _prune(self, versions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop versions older than the snapshot the oldest retained version needs."""
+        if len(versions) <= self.keep:
+            return versions
+        oldest = len(versions) - max(self.keep, 1)
+        base = max(i for i in range(oldest + 1) if versions[i]["kind"] == "snapshot")
+        for entry in versions[:base]:
+            (self.dir / entry["file"]).unlink(missing_ok=True)
+        return versions[base:]
+
+    def _read(self, entry: Dict[str, Any]) -> bytes:
+        return gzip.decompress((self.dir / entry["file"]).read_bytes())
+
+    def restore(self, version: Optional[int] = None) -> bytes:
+        """Return the file content of *version* (default: the latest).
+
+        Raises ``KeyError`` for versions that are not retained and
+        ``ValueError`` if the rebuilt content fails its checksum.
+        """
+        versions = self.versions()
+        if not versions:
+            raise KeyError(f"No backups of {self.path}")
+        if version is None:
+            version = versions[-1]["version"]
+        pos = next((i for i, v in enumerate(versions) if v["version"] == version), None)
+        if pos is None:
+            raise KeyError(f"Version {version} of {self.path} is not retained")
+        base = max(i for i in range(pos + 1) if versions[i]["kind"] == "snapshot")
+        content = self._read(versions[base])
+        if pos > base:
+            obj = json.loads(content)
+            for entry in versions[base + 1 : pos + 1]:
+                obj = _apply(obj, json.loads(self._read(entry)))
+            content = dumps(obj)
+        if _sha256(content) != versions[pos]["content_sha256"]:
+            raise ValueError(f"Version {version} of {self.path} failed its checksum")
+        return content
+
+    def verify(self) -> List[str]:
+        """Check every backup file and restored version against the manifest.
+
+        Returns a list of problems; an empty list means every retained
+        version can be restored intact.
+        """
+        problems: List[str] = []
+        for entry in self.versions():
+            path = self.dir / entry["file"]
+            if not path.exists():
+                problems.append(f"v{entry['version']}: missing {entry['file']}")
+            elif _sha256(path.read_bytes()) != entry["sha256"]:
+                problems.append(f"v{entry['version']}: {entry['file']} is corrupt")
+        if problems:
+            return problems
+        for entry in self.versions():
+            try:
+                self.restore(entry["version"])
+            except (ValueError, OSError, KeyError) as exc:
+                problems.append(f"v{entry['version']}: {exc}")
+        return problems
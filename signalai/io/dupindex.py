@@ -0,0 +1,217 @@
+"""Near-duplicate index over item text using MinHash with LSH banding.
+
+Each item's normalized text is split into word-bigram shingles and reduced
+to a :data:`NUM_PERM`-value MinHash signature. Signatures are cut into
+:data:`BANDS` bands; items sharing any band land in the same bucket, so a
+query only compares against items in its buckets instead of the whole
+store. Candidates are confirmed by the Jaccard similarity estimated from
+the full signatures.
+
+The index is persisted next to the item store as a SQLite database holding
+each signature (a packed ``uint64`` array) with its item's domain, and one
+row per band bucket, so queries read only the buckets they hit and saving
+appends only the signatures added since the index was opened.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import sqlite3
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - pure-Python signatures below
+    np = None  # type: ignore
+
+__all__ = ["DupIndex", "NUM_PERM", "BANDS", "THRESHOLD"]
+
+NUM_PERM = 64
+BANDS = 16
+# With 16 bands of 4 rows, pairs at Jaccard 0.5 collide in some band ~65% of
+# the time and pairs at 0.8 almost always; below 0.3 they rarely do.
+THRESHOLD = 0.5
+
+_ROWS = NUM_PERM // BANDS
+_MASK = (1 << 64) - 1
+_WORD_RE = re.compile(r"\w+")
+# Multiply-shift hash family; fixed seed so signatures are stable on disk.
+_rnd = random.Random(20240917)
+_A = [_rnd.getrandbits(64) | 1 for _ in range(NUM_PERM)]
+_B = [_rnd.getrandbits(64) for _ in range(NUM_PERM)]
+_VERSION = 2
+
+
+def _shingle_hashes(text: str) -> List[int]:
+    tokens = _WORD_RE.findall(text.lower())
+    shingles = {" ".join(tokens[i : i + 2]) for i in range(max(1, len(tokens) - 1))} if tokens else set()
+    return [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+        for s in shingles
+    ]
+
+
+def _signature(xs: List[int]) -> List[int]:
+    if np is not None:
+        # uint64 arithmetic wraps, matching the masked pure-Python version.
+        x = np.array(xs, dtype=np.uint64)
+        a = np.array(_A, dtype=np.uint64)[:, None]
+        b = np.array(_B, dtype=np.uint64)[:, None]
+        return ((a * x + b) >> np.uint64(32)).min(axis=1).tolist()
+    return [min(((a * x + b) & _MASK) >> 32 for x in xs) for a, b in zip(_A, _B)]
+
+
+class DupIndex:
+    """MinHash LSH index mapping item hashes to signatures.
+
+    Without a *path* the index lives in memory. With one, entries added
+    since it was opened are kept in memory (and answer queries) until
+    :meth:`save` appends them to the database.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self._pending: Dict[str, Tuple[str, List[int]]] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[str]] = defaultdict(list)
+        self._conn: Optional[sqlite3.Connection] = None
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path)
+            with self._conn:
+                (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+                if version != _VERSION:
+                    # Signatures from another hash family cannot be compared.
+                    self._conn.executescript(
+                        """
+                        DROP TABLE IF EXISTS signatures;
+                        DROP TABLE IF EXISTS buckets;
+                        """
+                    )
+                self._conn.executescript(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS signatures (
+                        key TEXT PRIMARY KEY,
+                        domain TEXT NOT NULL,
+                        sig BLOB NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS buckets (
+                        band INTEGER NOT NULL,
+                        bucket BLOB NOT NULL,
+                        key TEXT NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_buckets ON buckets(band, bucket);
+                    PRAGMA user_version = {_VERSION};
+                    """
+                )
+
+    @classmethod
+    def for_store(cls, store_path: Path) -> "DupIndex":
+        """Return the index stored alongside the item store at *store_path*."""
+        return cls(store_path.with_name(store_path.name + ".dupindex.sqlite"))
+
+    def __len__(self) -> int:
+        stored = 0
+        if self._conn is not None:
+            (stored,) = self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()
+        return stored + len(self._pending)
+
+    def __contains__(self, key: str) -> bool:
+        if key in self._pending:
+            return True
+        if self._conn is None:
+            return False
+        row = self._conn.execute("SELECT 1 FROM signatures WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    @staticmethod
+    def signature(text: str) -> Optional[List[int]]:
+        """Return the MinHash signature of *text*, or ``None`` if it has no words."""
+        xs = _shingle_hashes(text)
+        return _signature(xs) if xs else None
+
+    @staticmethod
+    def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+        """Jaccard similarity estimated from two signatures."""
+        return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+    @staticmethod
+    def _bands(sig: Sequence[int]) -> Iterable[Tuple[int, bytes]]:
+        for band in range(BANDS):
+            yield band, array("Q", sig[band * _ROWS : (band + 1) * _ROWS]).tobytes()
+
+    def add(self, key: str, sig: List[int], domain: str = "") -> None:
+        """Index *sig* under *key* for an item from *domain* (re-adding a key is a no-op)."""
+        if key in self:
+            return
+        self._pending[key] = (domain, list(sig))
+        for band_key in self._bands(sig):
+            self._buckets[band_key].append(key)
+
+    def _candidates(self, sig: Sequence[int]) -> Iterable[Tuple[str, str, Sequence[int]]]:
+        bands = list(self._bands(sig))
+        for band_key in bands:
+            for key in self._buckets.get(band_key, ()):
+                domain, other = self._pending[key]
+                yield key, domain, other
+        if self._conn is None:
+            return
+        where = " OR ".join(["(b.band = ? AND b.bucket = ?)"] * len(bands))
+        rows = self._conn.execute(
+            "SELECT DISTINCT s.key, s.domain, s.sig FROM buckets b "
+            f"JOIN signatures s ON s.key = b.key WHERE {where}",
+            [value for band_key in bands for value in band_key],
+        )
+        for key, domain, packed in rows:
+            yield key, domain, array("Q", packed)
+
+    def query(
+        self, sig: Sequence[int], threshold: float = THRESHOLD, exclude_domain: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """Return ``(key, similarity)`` for indexed items at or above *threshold*.
+
+        Results are ordered by decreasing similarity. Only items sharing an
+        LSH band with *sig* are compared; items from *exclude_domain* are
+        skipped.
+        """
+        scored = {
+            key: self.similarity(sig, other)
+            for key, domain, other in self._candidates(sig)
+            if exclude_domain is None or domain != exclude_domain
+        }
+        return sorted(
+            ((key, sim) for key, sim in scored.items() if sim >= threshold),
+            key=lambda x: (-x[1], x[0]),
+        )
+
+    def save(self) -> None:
+        """Append the entries added since the last save in one transaction.
+
+        A no-op for in-memory indexes.
+        """
+        if self._conn is None or not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO signatures (key, domain, sig) VALUES (?, ?, ?)",
+                [(key, domain, array("Q", sig).tobytes()) for key, (domain, sig) in self._pending.items()],
+            )
+            self._conn.executemany(
+                "INSERT INTO buckets (band, bucket, key) VALUES (?, ?, ?)",
+                [
+                    (band, bucket, key)
+                    for key, (_, sig) in self._pending.items()
+                    for band, bucket in self._bands(sig)
+                ],
+            )
+        self._pending.clear()
+        self._buckets.clear()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
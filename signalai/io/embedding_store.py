@@ -0,0 +1,165 @@
+"""Persistent embedding cache keyed by item hash.
+
+Embeddings are stored as a row-major ``float32`` matrix in ``vectors.f32``
+that is only ever appended to and read through a memory map, plus a JSON
+index mapping item hashes to rows. Each embedding model gets its own
+namespace directory, so changing the model (or bumping its version) starts
+a fresh cache instead of mixing incompatible vectors.
+
+Compaction writes the kept rows to a new vectors file and then swaps in an
+index naming that file, so an interrupted compaction leaves the previous
+file and index intact.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import shutil
+from array import array
+from pathlib import Path
+from typing import Container, Dict, Iterable, List, Optional, Sequence, Union
+
+__all__ = ["EmbeddingStore"]
+
+_ITEM_SIZE = array("f").itemsize
+
+
+class EmbeddingStore:
+    """Append-only, memory-mapped ``float32`` embeddings for one model."""
+
+    def __init__(self, root: Path, model_name: str) -> None:
+        self.root = root
+        self.model_name = model_name
+        self.dir = root / re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self._vectors_path = self.dir / "vectors.f32"
+        self._index_path = self.dir / "index.json"
+        self.dim: Optional[int] = None
+        self._rows: Dict[str, int] = {}
+        if self._index_path.exists():
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.dim = data["dim"]
+            self._rows = data["rows"]
+            self._vectors_path = self.dir / data.get("vectors", "vectors.f32")
+        self._mm: Optional[mmap.mmap] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_hash: str) -> bool:
+        return item_hash in self._rows
+
+    def _view(self) -> Optional[memoryview]:
+        if self._mm is None:
+            if not self._vectors_path.exists() or self._vectors_path.stat().st_size == 0:
+                return None
+            with open(self._vectors_path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mm).cast("f")
+
+    def _unmap(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def get(self, hashes: Sequence[Optional[str]]) -> List[Optional[List[float]]]:
+        """Return cached vectors for *hashes*, with ``None`` for unseen ones."""
+        view = self._view()
+        # Rows past the end of the file belong to a different vectors file.
+        n_rows = len(view) // self.dim if view is not None and self.dim else 0
+        out: List[Optional[List[float]]] = []
+        for h in hashes:
+            row = self._rows.get(h) if h else None
+            if row is None or row >= n_rows:
+                out.append(None)
+            else:
+                out.append(view[row * self.dim : (row + 1) * self.dim].tolist())
+        if view is not None:
+            view.release()
+        return out
+
+    def add(self, hashes: Sequence[str], vectors: Iterable[Sequence[float]]) -> None:
+        """Append *vectors* for *hashes* (already cached hashes are skipped)."""
+        new: Dict[str, int] = {}
+        buf = array("f")
+        self.dir.mkdir(parents=True, exist_ok=True)
+        # Row numbers come from the file size so orphaned rows left by an
+        # interrupted write are never referenced twice.
+        size = self._vectors_path.stat().st_size if self._vectors_path.exists() else 0
+        for h, vec in zip(hashes, vectors):
+            if not h or h in self._rows or h in new:
+                continue
+            vec = list(vec)
+            if self.dim is None:
+                self.dim = len(vec)
+            if len(vec) != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional vector, got {len(vec)}")
+            new[h] = size // (_ITEM_SIZE * self.dim) + len(new)
+            buf.extend(vec)
+        if not new:
+            return
+        self._unmap()
+        with open(self._vectors_path, "ab") as f:
+            f.write(buf.tobytes())
+        self._rows.update(new)
+        self._save_index()
+
+    def compact(self, keep: Union[Container[str], Iterable[str]]) -> int:
+        """Drop rows whose hash is not in *keep*; returns the number removed.
+
+        *keep* may be any container supporting ``in`` (such as a
+        :class:`~signalai.io.hashindex.HashIndex`) or an iterable of hashes.
+        """
+        if not isinstance(keep, Container):
+            keep = set(keep)
+        kept = [h for h in self._rows if h in keep]
+        removed = len(self._rows) - len(kept)
+        if not removed:
+            return 0
+        buf = array("f")
+        rows: Dict[str, int] = {}
+        for h, vec in zip(kept, self.get(kept)):
+            if vec is not None:
+                rows[h] = len(rows)
+                buf.extend(vec)
+        # Write the kept rows under a new name; the index swap below is the
+        # commit point, so a crash before it leaves the old file in use.
+        old = self._vectors_path
+        new = self.dir / ("vectors.1.f32" if old.name == "vectors.f32" else "vectors.f32")
+        tmp = new.with_name(new.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(buf.tobytes())
+        os.replace(tmp, new)
+        self._unmap()
+        self._vectors_path = new
+        self._rows = rows
+        self._save_index()
+        old.unlink(missing_ok=True)
+        return removed
+
+    def invalidate(self) -> None:
+        """Delete every cached vector for this model."""
+        self._unmap()
+        shutil.rmtree(self.dir, ignore_errors=True)
+        self._rows = {}
+        self.dim = None
+
+    def _save_index(self) -> None:
+        tmp = self._index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "model": self.model_name,
+                    "dim": self.dim,
+                    "vectors": self._vectors_path.name,
+                    "rows": self._rows,
+                },
+                f,
+            )
+        os.replace(tmp, self._index_path)
+
+    def close(self) -> None:
+        self._unmap()
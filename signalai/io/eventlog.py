@@ -0,0 +1,205 @@
+"""Buffered, append-only event logs.
+
+Rows are kept in memory and written in batches: a log is flushed once
+``max_rows`` rows are pending or the oldest pending row is ``max_delay_s``
+seconds old (checked on every append and by a background timer, so an idle
+process does not hold rows back), when it is used as a context manager and
+exits, and at interpreter exit. One :class:`EventLog` is shared per file path so every
+writer in the process appends through the same buffer; readers should call
+:func:`flush` on a path before reading it.
+
+The path selects the format: a ``.csv`` path is a single flat CSV file, a
+path without a suffix a day-partitioned :class:`~signalai.io.partlog.PartitionedLog`
+directory.
+"""
+
+from __future__ import annotations
+
+import atexit
+import csv
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from signalai.io.partlog import Day, PartitionedLog, read_csv_tail
+
+__all__ = ["EventLog", "get_log", "flush", "flush_all", "read_columns", "read_tail"]
+
+DEFAULT_MAX_ROWS = 256
+DEFAULT_MAX_DELAY_S = 5.0
+
+
+class EventLog:
+    """Event log that buffers appended rows and writes them in batches."""
+
+    def __init__(
+        self,
+        path: Path,
+        fieldnames: Sequence[str],
+        *,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        max_delay_s: float = DEFAULT_MAX_DELAY_S,
+        fsync: bool = False,
+        numeric: Sequence[str] = (),
+    ) -> None:
+        self.path = Path(path)
+        self.fieldnames = list(fieldnames)
+        self.max_rows = max_rows
+        self.max_delay_s = max_delay_s
+        self.fsync = fsync
+        self._pending: List[Mapping[str, Any]] = []
+        self._oldest: float | None = None
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        self._partitioned: Optional[PartitionedLog] = None
+        if not self.path.suffix:
+            self._partitioned = PartitionedLog(
+                self.path, self.fieldnames, numeric=numeric, fsync=fsync
+            )
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.flush()
+
+    def __len__(self) -> int:
+        """Number of rows buffered but not yet written."""
+        return len(self._pending)
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        self.extend([row])
+
+    def extend(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        with self._lock:
+            self._pending.extend(rows)
+            if not self._pending:
+                return
+            now = time.monotonic()
+            if self._oldest is None:
+                self._oldest = now
+            if len(self._pending) >= self.max_rows or now - self._oldest >= self.max_delay_s:
+                self._write()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.max_delay_s, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Write every buffered row to disk."""
+        with self._lock:
+            self._write()
+
+    def _write(self) -> None:
+        if self._timer is not None:
+            if self._timer is not threading.current_thread():
+                self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        if self._partitioned is not None:
+            self._partitioned.write_rows(self._pending)
+            self._pending = []
+            self._oldest = None
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        new_file = not self.path.exists() or self.path.stat().st_size == 0
+        with self.path.open("a", newline="") as fh:
+            writer = csv.DictWriter(fh, fieldnames=self.fieldnames)
+            if new_file:
+                writer.writeheader()
+            writer.writerows(self._pending)
+            if self.fsync:
+                fh.flush()
+                os.fsync(fh.fileno())
+        self._pending = []
+        self._oldest = None
+
+
+_logs: Dict[Path, EventLog] = {}
+_logs_lock = threading.Lock()
+
+
+def get_log(path: Path, fieldnames: Sequence[str], **kwargs: Any) -> EventLog:
+    """Return the shared :class:`EventLog` for *path*, creating it on first use.
+
+    Keyword arguments configure the flush policy and only apply when the log
+    is created.
+    """
+    key = Path(path).resolve()
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            log = _logs[key] = EventLog(path, fieldnames, **kwargs)
+    return log
+
+
+def flush(path: Path) -> None:
+    """Flush the shared log for *path*, if one exists."""
+    with _logs_lock:
+        log = _logs.get(Path(path).resolve())
+    if log is not None:
+        log.flush()
+
+
+def flush_all() -> None:
+    """Flush every shared log."""
+    with _logs_lock:
+        logs = list(_logs.values())
+    for log in logs:
+        log.flush()
+
+
+def read_columns(
+    path: Path,
+    columns: Sequence[str],
+    start: Optional[Day] = None,
+    end: Optional[Day] = None,
+    numeric: Sequence[str] = (),
+) -> Iterator[Dict[str, Sequence[Any]]]:
+    """Flush and read *columns* of the log at *path* in ``{column: values}`` blocks.
+
+    Partitioned logs only read the day partitions between *start* and *end*
+    (inclusive) and yield one block per segment; flat CSV logs are read whole
+    as a single block of strings, except for *numeric* columns, which are
+    parsed like partitioned ones (empty fields become NaN). Missing logs
+    yield nothing.
+    """
+    flush(path)
+    path = Path(path)
+    if not path.suffix:
+        yield from PartitionedLog(path).iter_columns(columns, start, end)
+        return
+    if not path.exists():
+        return
+    yield read_csv_tail(path, 0, columns, numeric)[0]
+
+
+def read_tail(
+    path: Path,
+    columns: Sequence[str],
+    cursor: Optional[Mapping[str, Any]] = None,
+    numeric: Sequence[str] = (),
+) -> Iterator[Tuple[Dict[str, Sequence[Any]], Dict[str, Any]]]:
+    """Flush and yield ``(block, cursor)`` pairs for rows logged after *cursor*.
+
+    Persist the last cursor yielded and pass it back to read only rows
+    appended since; ``None`` reads the whole log. Flat CSV cursors are byte
+    offsets, partitioned ones are described in
+    :meth:`~signalai.io.partlog.PartitionedLog.read_since`. *numeric* columns
+    of flat CSV logs are parsed as in :func:`read_columns`.
+    """
+    flush(path)
+    path = Path(path)
+    if not path.suffix:
+        yield from PartitionedLog(path).read_since(cursor, columns)
+        return
+    if not path.exists():
+        return
+    block, end = read_csv_tail(path, (cursor or {}).get("offset") or 0, columns, numeric)
+    yield block, {"offset": end}
+
+
+atexit.register(flush_all)
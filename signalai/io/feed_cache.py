@@ -0,0 +1,206 @@
+"""Per-feed HTTP validators for conditional GET requests.
+
+The cache remembers the ``ETag``, ``Last-Modified`` and a content hash of the
+last full download of every feed URL. Subsequent fetches send
+``If-None-Match``/``If-Modified-Since`` so unchanged feeds answer with
+``304 Not Modified``; servers that ignore validators are still detected as
+unchanged through the content hash. Either way the caller can skip parsing.
+Validators of a changed feed are only staged by :meth:`FeedCache.get`; the
+caller commits them with :meth:`FeedCache.commit` once the body was parsed,
+so a body that failed to parse is downloaded and parsed again next run.
+
+Entries also keep a per-feed watermark: the newest published timestamp and
+the URL hashes of the last :data:`WATERMARK_SEEN` items ingested from the
+feed. Sources consult :meth:`FeedCache.is_known` before building an item for
+an entry (see :meth:`~signalai.sources.base.Source.iter_new`), so entries
+that were ingested before are skipped without being materialized. Ordered
+feeds stop at the first entry :meth:`FeedCache.is_behind` places at or
+before the watermark.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AbstractSet, Any, Container, Dict, Iterable, Mapping, Optional, Tuple
+
+from requests import Response
+
+from signalai.io import http
+from signalai.models import Item
+
+__all__ = ["FeedCache", "WATERMARK_SEEN"]
+
+# Number of recent URL hashes remembered per feed.
+WATERMARK_SEEN = 200
+
+
+def _feed_key(feed_cfg: Mapping[str, Any]) -> str:
+    return feed_cfg.get("url") or feed_cfg.get("name") or ""
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class FeedCache:
+    """Validators for feed URLs, persisted as JSON next to the item store."""
+
+    def __init__(self, path: Optional[Path] = None, known: Container[str] = frozenset()) -> None:
+        self.path = path
+        #: Item hashes already in the store; checked alongside the watermarks.
+        self.known = known
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        if path is not None and path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        self._marks: Dict[str, Tuple[AbstractSet[str], Optional[datetime]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"not_modified": 0, "unchanged": 0, "full": 0, "bytes_saved": 0}
+        self.skip_stats = {"skipped": 0, "stopped_early": 0}
+
+    @classmethod
+    def for_store(cls, store_path: Path, known: Container[str] = frozenset()) -> "FeedCache":
+        """Return the cache stored alongside the item store at *store_path*."""
+        return cls(store_path.with_name(store_path.name + ".feedcache.json"), known)
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Return conditional request headers for *url*."""
+        entry = self._entries.get(url, {})
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get(self, url: str, **kwargs: Any) -> Optional[Response]:
+        """Perform a conditional ``GET`` for *url*.
+
+        Returns the response when the feed changed, or ``None`` when the server
+        answered ``304 Not Modified`` or the body is identical to the last
+        committed download. The validators of a changed response are staged
+        until :meth:`commit` is called for *url*.
+        """
+        headers = {**kwargs.pop("headers", {}), **self.request_headers(url)}
+        resp = http.get(url, headers=headers, **kwargs)
+
+        with self._lock:
+            entry = self._entries.get(url, {})
+            if resp.status_code == 304:
+                self.stats["not_modified"] += 1
+                self.stats["bytes_saved"] += entry.get("length", 0)
+                return None
+
+            content_hash = hashlib.sha256(resp.content).hexdigest()
+            self.stats["full"] += 1
+            self._pending[url] = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "content_hash": content_hash,
+                "length": len(resp.content),
+            }
+            if entry.get("content_hash") == content_hash:
+                # Same body as the last parsed download: safe to commit now.
+                self.stats["unchanged"] += 1
+                self._commit(url)
+                return None
+        return resp
+
+    def _commit(self, url: str) -> None:
+        pending = self._pending.pop(url, None)
+        if pending is not None:
+            self._entries[url] = {**self._entries.get(url, {}), **pending}
+
+    def commit(self, url: str) -> None:
+        """Keep the validators staged by :meth:`get` for *url*.
+
+        Call once the response body was parsed successfully; validators that
+        are never committed are not saved.
+        """
+        with self._lock:
+            self._commit(url)
+
+    def watermark(self, feed_cfg: Mapping[str, Any]) -> Dict[str, Any]:
+        """Return the feed's watermark: ``{"newest": iso timestamp | None, "seen": [hashes]}``."""
+        return self._entries.get(_feed_key(feed_cfg), {}).get("watermark") or {"newest": None, "seen": []}
+
+    def _mark(self, feed_cfg: Mapping[str, Any]) -> Tuple[AbstractSet[str], Optional[datetime]]:
+        """Return the feed's watermark as ``(seen hashes, newest timestamp)``."""
+        key = _feed_key(feed_cfg)
+        mark = self._marks.get(key)
+        if mark is None:
+            with self._lock:
+                wm = self.watermark(feed_cfg)
+                newest = _utc(datetime.fromisoformat(wm["newest"])) if wm["newest"] else None
+                mark = self._marks[key] = (frozenset(wm["seen"]), newest)
+        return mark
+
+    def is_known(self, feed_cfg: Mapping[str, Any], item_hash: str) -> bool:
+        """Return whether *item_hash* is in the store or the feed's watermark."""
+        return item_hash in self.known or item_hash in self._mark(feed_cfg)[0]
+
+    def is_behind(
+        self, feed_cfg: Mapping[str, Any], item_hash: str, published: Optional[datetime] = None
+    ) -> bool:
+        """Return whether an ordered feed can stop scanning at this entry.
+
+        That is the case when the feed itself delivered *item_hash* before
+        and *published*, if known, is not newer than the watermark's newest
+        timestamp. Entries only known from the store (e.g. ingested through
+        another feed) or re-published with a newer timestamp do not end the
+        scan.
+        """
+        seen, newest = self._mark(feed_cfg)
+        if item_hash not in seen:
+            return False
+        return published is None or newest is None or _utc(published) <= newest
+
+    def record_skipped(self, skipped: int, stopped_early: bool) -> None:
+        """Count entries a source skipped without building items for them."""
+        with self._lock:
+            self.skip_stats["skipped"] += skipped
+            self.skip_stats["stopped_early"] += int(stopped_early)
+
+    def advance(self, feed_cfg: Mapping[str, Any], items: Iterable[Item]) -> None:
+        """Move the feed's watermark past *items* (hashed items in feed order)."""
+        items = [it for it in items if it.hash]
+        if not items:
+            return
+        key = _feed_key(feed_cfg)
+        with self._lock:
+            mark = self.watermark(feed_cfg)
+            newest = max(_utc(it.published) for it in items)
+            if mark["newest"]:
+                newest = max(newest, _utc(datetime.fromisoformat(mark["newest"])))
+            seen = list(dict.fromkeys([*(it.hash for it in items), *mark["seen"]]))
+            self._entries.setdefault(key, {})["watermark"] = {
+                "newest": newest.isoformat(),
+                "seen": seen[:WATERMARK_SEEN],
+            }
+            self._marks.pop(key, None)
+
+    def save(self) -> None:
+        """Persist validators to :attr:`path` (no-op for in-memory caches)."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=2, sort_keys=True)
+        tmp.replace(self.path)
+
+    def report(self) -> str:
+        """Return a one-line summary of this run's cache effectiveness."""
+        s = self.stats
+        return (
+            f"Feed cache: {s['not_modified']} not modified (304), "
+            f"{s['full']} full fetches ({s['unchanged']} unchanged), "
+            f"{s['bytes_saved']} bytes saved, "
+            f"{self.skip_stats['skipped']} known entries skipped before parsing "
+            f"({self.skip_stats['stopped_early']} feeds stopped early)"
+        )
@@ -0,0 +1,193 @@
+"""Compact, persisted index of item hashes for deduplication.
+
+Item hashes are 40-character SHA-1 hex strings; a Python ``set`` of a million
+of them takes over 100 MB. :class:`HashIndex` keeps the first 64 bits of
+each hash as an integer in a sorted ``array('Q')`` (8 bytes per item) with a
+Bloom filter in front, so most lookups of unseen hashes never touch the
+array and the rest are a binary search.
+
+The index is stored next to the item store as ``<store>.hashidx``: a magic
+line, a JSON header line, the sorted keys and the Bloom filter bits. The
+header records the :func:`~signalai.io.storage.fingerprint` (sizes and
+mtimes of the store file and any cold partitions) of the store it was built
+from; :meth:`HashIndex.for_store` rebuilds the index from the store's hashes
+when they no longer match, e.g. after the store was edited by another tool.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Set
+
+from signalai.io.storage import fingerprint
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - pure-Python Bloom filter below
+    np = None  # type: ignore
+
+__all__ = ["HashIndex", "key_of"]
+
+_MAGIC = b"SIGNALAI-HASHIDX 1\n"
+BLOOM_BITS_PER_KEY = 10
+BLOOM_HASHES = 7
+_MIN_BLOOM_BITS = 1 << 16
+
+
+def key_of(item_hash: str) -> int:
+    """Return the 64-bit index key of an item hash.
+
+    SHA-1 hex hashes use their first 16 digits; anything else (hashes set by
+    hand or by plugins) is hashed down to 64 bits.
+    """
+    if len(item_hash) == 40:
+        try:
+            return int(item_hash[:16], 16)
+        except ValueError:
+            pass
+    return int.from_bytes(hashlib.blake2b(item_hash.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashIndex:
+    """Sorted 64-bit hash keys with a Bloom filter, persisted as one file."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.store_fingerprint: Optional[List[Any]] = None
+        self._keys = array("Q")
+        self._added: Set[int] = set()
+        self._bloom = bytearray(_MIN_BLOOM_BITS // 8)
+        if path is not None and path.exists():
+            self._read(path)
+
+    @classmethod
+    def for_store(
+        cls, store_path: Path, hashes: Optional[Callable[[], Iterable[str]]] = None
+    ) -> "HashIndex":
+        """Return the index stored alongside the item store at *store_path*.
+
+        When the index is missing or was built for a different version of the
+        store, it is rebuilt from ``hashes()`` (typically
+        :func:`signalai.io.storage.iter_hashes`) if given.
+        """
+        index = cls(store_path.with_name(store_path.name + ".hashidx"))
+        if hashes is not None and index.store_fingerprint != fingerprint(store_path):
+            index.rebuild(hashes())
+        return index
+
+    # -- lookups ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._added)
+
+    def __contains__(self, item_hash: object) -> bool:
+        if not isinstance(item_hash, str) or not item_hash:
+            return False
+        key = key_of(item_hash)
+        if not self._maybe(key):
+            return False
+        if key in self._added:
+            return True
+        i = bisect_left(self._keys, key)
+        return i < len(self._keys) and self._keys[i] == key
+
+    def _positions(self, key: int):
+        m = len(self._bloom) * 8
+        h1, h2 = key & 0xFFFFFFFF, (key >> 32) | 1
+        return [(h1 + i * h2) % m for i in range(BLOOM_HASHES)]
+
+    def _maybe(self, key: int) -> bool:
+        bloom = self._bloom
+        m = len(bloom) * 8
+        h1, h2 = key & 0xFFFFFFFF, (key >> 32) | 1
+        for i in range(BLOOM_HASHES):
+            p = (h1 + i * h2) % m
+            if not bloom[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+    # -- updates ------------------------------------------------------------
+
+    def add(self, item_hash: str) -> None:
+        """Add *item_hash*; it is merged into the sorted keys on :meth:`save`."""
+        if item_hash in self:
+            return
+        key = key_of(item_hash)
+        self._added.add(key)
+        for p in self._positions(key):
+            self._bloom[p >> 3] |= 1 << (p & 7)
+
+    def rebuild(self, hashes: Iterable[str]) -> None:
+        """Replace the contents with *hashes*."""
+        self._keys = array("Q", sorted({key_of(h) for h in hashes if h}))
+        self._added = set()
+        self._build_bloom()
+
+    def _build_bloom(self) -> None:
+        nbits = max(_MIN_BLOOM_BITS, len(self._keys) * BLOOM_BITS_PER_KEY)
+        nbits = (nbits + 7) // 8 * 8
+        if np is not None and len(self._keys):
+            keys = np.frombuffer(self._keys, dtype=np.uint64)
+            h1 = keys & np.uint64(0xFFFFFFFF)
+            h2 = (keys >> np.uint64(32)) | np.uint64(1)
+            bits = np.zeros(nbits, dtype=bool)
+            for i in range(BLOOM_HASHES):
+                bits[(h1 + np.uint64(i) * h2) % np.uint64(nbits)] = True
+            self._bloom = bytearray(np.packbits(bits, bitorder="little").tobytes())
+            return
+        self._bloom = bytearray(nbits // 8)
+        for key in self._keys:
+            for p in self._positions(key):
+                self._bloom[p >> 3] |= 1 << (p & 7)
+
+    # -- persistence ----------------------------------------------------------
+
+    def _read(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            if f.readline() != _MAGIC:
+                return
+            header = json.loads(f.readline())
+            keys = array("Q")
+            keys.frombytes(f.read(header["count"] * keys.itemsize))
+            bloom = bytearray(f.read(header["bloom_bytes"]))
+        if len(keys) != header["count"] or len(bloom) != header["bloom_bytes"]:
+            return  # truncated file: treat as missing so it gets rebuilt
+        self._keys, self._bloom = keys, bloom
+        self.store_fingerprint = header.get("store")
+
+    def save(self, store_path: Optional[Path] = None) -> None:
+        """Merge pending additions and write the index atomically.
+
+        Pass the item store's *store_path* after writing it so the index is
+        recorded as matching that version of the store.
+        """
+        if self._added:
+            self._keys = array("Q", sorted([*self._keys, *self._added]))
+            self._added = set()
+            if len(self._keys) * BLOOM_BITS_PER_KEY > len(self._bloom) * 8 * 2:
+                # Grown past twice the sized capacity: resize to keep false
+                # positives rare.
+                self._build_bloom()
+        if store_path is not None:
+            self.store_fingerprint = fingerprint(store_path)
+        if self.path is None:
+            return
+        header = {
+            "count": len(self._keys),
+            "bloom_bytes": len(self._bloom),
+            "bloom_hashes": BLOOM_HASHES,
+            "store": self.store_fingerprint,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(_MAGIC)
+            f.write(json.dumps(header).encode() + b"\n")
+            f.write(self._keys.tobytes())
+            f.write(bytes(self._bloom))
+        os.replace(tmp, self.path)
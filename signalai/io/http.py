@@ -1,14 +1,83 @@
-"""HTTP helper utilities for making requests with retries and timeouts."""
+"""Shared HTTP client layer with pooled sessions, retries and timeouts.
+
+Every request goes through one :class:`requests.Session` per host, so TCP and
+TLS connections are kept alive and reused across feeds and LLM calls.
+Failures are retried with jittered exponential backoff; ``429`` and ``503``
+responses honour the server's ``Retry-After`` header. :func:`stats` exposes
+request, retry and connection-reuse counters.
+"""
 
 from __future__ import annotations
 
+import datetime
+import random
+import threading
 import time
-from typing import Any
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
 
 import requests
 from requests import Response, RequestException
+from requests.adapters import HTTPAdapter
+
+__all__ = ["request", "get", "post", "get_json", "session_for", "stats", "reset_stats", "close"]
+
+POOL_MAXSIZE = 16
+RETRY_AFTER_STATUSES = {429, 503}
+# Client errors that may succeed when retried; other 4xx responses are final.
+RETRYABLE_CLIENT_ERRORS = {408, 429}
+MAX_RETRY_DELAY = 60.0
+
+_sessions: Dict[str, requests.Session] = {}
+_lock = threading.Lock()
+_counters = {"requests": 0, "retries": 0, "failures": 0}
+
+
+def session_for(url: str) -> requests.Session:
+    """Return the pooled keep-alive session for the host of *url*."""
+    host = urlparse(url).netloc.lower()
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=POOL_MAXSIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+            _sessions[host] = session
+    return session
+
+
+def _retry_after(resp: Optional[Response]) -> Optional[float]:
+    """Return the ``Retry-After`` delay in seconds for 429/503 responses."""
+    if resp is None or resp.status_code not in RETRY_AFTER_STATUSES:
+        return None
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+def _should_retry(exc: RequestException) -> bool:
+    resp = getattr(exc, "response", None)
+    if resp is None:
+        return True
+    return resp.status_code >= 500 or resp.status_code in RETRYABLE_CLIENT_ERRORS
 
-__all__ = ["request", "get", "get_json"]
+
+def _bump(counter: str) -> None:
+    with _lock:
+        _counters[counter] += 1
 
 
 def request(
@@ -20,38 +89,45 @@ def request(
     backoff_factor: float = 0.5,
     **kwargs: Any,
 ) -> Response:
-    """Perform an HTTP request with basic retry and timeout handling.
+    """Perform an HTTP request with retry and timeout handling.
 
     Args:
         method: HTTP method such as ``"GET"`` or ``"POST"``.
         url: The URL to request.
         retries: Number of attempts before giving up. Defaults to ``3``.
         timeout: Timeout for each request in seconds. Defaults to ``10``.
-        backoff_factor: Factor for exponential backoff between retries.
-        **kwargs: Additional arguments forwarded to :func:`requests.request`.
+        backoff_factor: Base delay for jittered exponential backoff between
+            retries. A ``Retry-After`` header on 429/503 takes precedence.
+        **kwargs: Additional arguments forwarded to
+            :meth:`requests.Session.request`.
 
     Returns:
         ``requests.Response`` object.
 
     Raises:
         :class:`requests.RequestException` if the request fails after the
-        given number of retries or returns an error status code.
+        given number of retries or returns an error status code. Client
+        errors other than 408 and 429 are not retried.
     """
-    last_exc: RequestException | None = None
+    session = session_for(url)
     for attempt in range(1, retries + 1):
+        _bump("requests")
         try:
-            resp = requests.request(method, url, timeout=timeout, **kwargs)
+            resp = session.request(method, url, timeout=timeout, **kwargs)
             resp.raise_for_status()
             return resp
         except RequestException as exc:
-            last_exc = exc
-            if attempt == retries:
+            if attempt == retries or not _should_retry(exc):
+                _bump("failures")
                 raise
-            sleep = backoff_factor * (2 ** (attempt - 1))
-            time.sleep(sleep)
-    # Should never reach here
-    assert last_exc is not None
-    raise last_exc
+            base = backoff_factor * (2 ** (attempt - 1))
+            delay = base / 2 + random.uniform(0, base / 2)
+            retry_after = _retry_after(getattr(exc, "response", None))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            _bump("retries")
+            time.sleep(min(delay, MAX_RETRY_DELAY))
+    raise AssertionError("unreachable")  # pragma: no cover
 
 
 def get(url: str, **kwargs: Any) -> Response:
@@ -59,7 +135,51 @@ def get(url: str, **kwargs: Any) -> Response:
     return request("GET", url, **kwargs)
 
 
+def post(url: str, **kwargs: Any) -> Response:
+    """Convenience wrapper for ``POST`` requests."""
+    return request("POST", url, **kwargs)
+
+
 def get_json(url: str, **kwargs: Any) -> Any:
     """Return JSON content of a ``GET`` request."""
     return get(url, **kwargs).json()
 
+
+def stats() -> Dict[str, int]:
+    """Return request, retry and connection-reuse counters for this process.
+
+    ``connections`` counts TCP connections opened by the pools and ``reused``
+    the requests served over an already open connection.
+    """
+    pool_requests = connections = 0
+    with _lock:
+        counters = dict(_counters)
+        sessions = list(_sessions.values())
+    for session in sessions:
+        for adapter in {id(a): a for a in session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                connections += pool.num_connections
+                pool_requests += pool.num_requests
+    counters["connections"] = connections
+    counters["reused"] = max(0, pool_requests - connections)
+    return counters
+
+
+def reset_stats() -> None:
+    """Reset the request counters (connection counters live in the pools)."""
+    with _lock:
+        for key in _counters:
+            _counters[key] = 0
+
+
+def close() -> None:
+    """Close every pooled session."""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
@@ -0,0 +1,349 @@
+"""Day-partitioned event logs with compressed columnar segments.
+
+A log is a directory with one sub-directory per UTC day::
+
+    ranker_log/
+        schema.json                 # field names and numeric columns
+        2025-09-10/seg-000000.col.gz
+        2025-09-11/seg-000000.col.gz
+        2025-09-11/seg-000001.csv   # active segment, still appended to
+
+Rows are appended to a plain CSV segment of the day given by their
+``timestamp``. A segment is closed once it reaches ``max_segment_bytes`` or
+its day is over: it is rewritten as a gzip-compressed columnar file in which
+numeric columns are packed as little-endian ``float64`` arrays and the
+remaining columns as JSON string lists. Readers select partitions by day and
+decode only the columns they ask for.
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime
+import gzip
+import io
+import json
+import math
+import os
+import re
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+__all__ = ["PartitionedLog", "migrate_csv", "read_csv_tail"]
+
+DEFAULT_SEGMENT_BYTES = 4 * 1024 * 1024
+FORMAT_VERSION = 1
+
+_DAY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_ACTIVE_SUFFIX = ".csv"
+_CLOSED_SUFFIX = ".col.gz"
+
+Day = datetime.date
+
+
+def _to_float(value: Any) -> float:
+    if value is None or value == "":
+        return math.nan
+    return float(value)
+
+
+def _day_of(row: Mapping[str, Any]) -> str:
+    ts = str(row.get("timestamp") or "")
+    if _DAY_RE.match(ts[:10]):
+        return ts[:10]
+    return datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+
+
+def _block_len(block: Mapping[str, Sequence[Any]]) -> int:
+    return len(next(iter(block.values()), ()))
+
+
+def read_csv_tail(
+    path: Path,
+    offset: int = 0,
+    columns: Optional[Sequence[str]] = None,
+    numeric: Sequence[str] = (),
+) -> Tuple[Dict[str, Sequence[Any]], int]:
+    """Read the complete rows of the CSV at *path* starting at byte *offset*.
+
+    Returns the requested *columns* (all by default) as a ``{column: values}``
+    block, with *numeric* columns as ``array('d')``, and the byte offset just
+    past the last complete row, from which the next call can resume.
+    """
+    with open(path, "rb") as fh:
+        header = fh.readline()
+        offset = max(offset, len(header))
+        fh.seek(offset)
+        data = fh.read()
+    end = data.rfind(b"\n") + 1
+    fieldnames = next(csv.reader([header.decode("utf-8")]), [])
+    names = list(fieldnames if columns is None else columns)
+    index = [fieldnames.index(n) if n in fieldnames else -1 for n in names]
+    block: Dict[str, Any] = {n: [] for n in names}
+    for record in csv.reader(io.StringIO(data[:end].decode("utf-8"), newline="")):
+        for n, i in zip(names, index):
+            block[n].append(record[i] if 0 <= i < len(record) else "")
+    for n in names:
+        if n in numeric:
+            block[n] = array("d", (_to_float(v) for v in block[n]))
+    return block, offset + end
+
+
+def _write_columnar(path: Path, columns: Dict[str, List[Any]], numeric: Sequence[str]) -> None:
+    """Write *columns* as one gzip columnar segment (atomically via a temp file)."""
+    header: Dict[str, Any] = {"version": FORMAT_VERSION, "rows": 0, "columns": []}
+    blocks: List[bytes] = []
+    for name, values in columns.items():
+        header["rows"] = len(values)
+        if name in numeric:
+            packed = array("d", (_to_float(v) for v in values))
+            if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+                packed.byteswap()
+            data, kind = packed.tobytes(), "f64"
+        else:
+            data, kind = json.dumps(["" if v is None else str(v) for v in values]).encode(), "str"
+        header["columns"].append({"name": name, "type": kind, "nbytes": len(data)})
+        blocks.append(data)
+    tmp = path.with_name(path.name + ".tmp")
+    with gzip.open(tmp, "wb") as fh:
+        fh.write(json.dumps(header).encode() + b"\n")
+        for data in blocks:
+            fh.write(data)
+    os.replace(tmp, path)
+
+
+def _read_columnar(path: Path, wanted: Optional[Iterable[str]] = None) -> Dict[str, Sequence[Any]]:
+    """Decode the requested columns (all by default) of a closed segment."""
+    wanted = None if wanted is None else set(wanted)
+    out: Dict[str, Sequence[Any]] = {}
+    with gzip.open(path, "rb") as fh:
+        header = json.loads(fh.readline())
+        for col in header["columns"]:
+            if wanted is not None and col["name"] not in wanted:
+                fh.seek(col["nbytes"], os.SEEK_CUR)
+                continue
+            data = fh.read(col["nbytes"])
+            if col["type"] == "f64":
+                values = array("d")
+                values.frombytes(data)
+                if sys.byteorder != "little":  # pragma: no cover
+                    values.byteswap()
+                out[col["name"]] = values
+            else:
+                out[col["name"]] = json.loads(data)
+    return out
+
+
+class PartitionedLog:
+    """Append-only event log partitioned by day into rotating segments."""
+
+    def __init__(
+        self,
+        root: Path,
+        fieldnames: Optional[Sequence[str]] = None,
+        *,
+        numeric: Sequence[str] = (),
+        max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        fsync: bool = False,
+    ) -> None:
+        self.root = Path(root)
+        self.max_segment_bytes = max_segment_bytes
+        self.fsync = fsync
+        schema_path = self.root / "schema.json"
+        if schema_path.exists():
+            with open(schema_path, "r", encoding="utf-8") as f:
+                schema = json.load(f)
+            self.fieldnames: List[str] = schema["fields"]
+            self.numeric: List[str] = schema["numeric"]
+        else:
+            self.fieldnames = list(fieldnames or [])
+            self.numeric = [c for c in numeric if c in self.fieldnames]
+
+    # -- writing -------------------------------------------------------------
+
+    def _save_schema(self) -> None:
+        path = self.root / "schema.json"
+        if path.exists():
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": FORMAT_VERSION, "fields": self.fieldnames, "numeric": self.numeric}, f)
+
+    @staticmethod
+    def _segments(day_dir: Path) -> List[Path]:
+        return sorted(p for p in day_dir.glob("seg-*") if not p.name.endswith(".tmp"))
+
+    def _active_segment(self, day_dir: Path) -> Path:
+        segments = self._segments(day_dir)
+        if segments and segments[-1].name.endswith(_ACTIVE_SUFFIX):
+            return segments[-1]
+        index = int(segments[-1].name[4:10]) + 1 if segments else 0
+        return day_dir / f"seg-{index:06d}{_ACTIVE_SUFFIX}"
+
+    def write_rows(self, rows: Iterable[Mapping[str, Any]]) -> int:
+        """Append *rows* to the active segment of their day; returns the row count."""
+        if not self.fieldnames:
+            raise ValueError(f"No field names known for event log {self.root}")
+        by_day: Dict[str, List[Mapping[str, Any]]] = {}
+        for row in rows:
+            by_day.setdefault(_day_of(row), []).append(row)
+        if not by_day:
+            return 0
+        self._save_schema()
+        for day, day_rows in sorted(by_day.items()):
+            day_dir = self.root / day
+            day_dir.mkdir(parents=True, exist_ok=True)
+            segment = self._active_segment(day_dir)
+            new_file = not segment.exists()
+            with segment.open("a", newline="") as fh:
+                writer = csv.DictWriter(fh, fieldnames=self.fieldnames, extrasaction="ignore")
+                if new_file:
+                    writer.writeheader()
+                writer.writerows(day_rows)
+                if self.fsync:
+                    fh.flush()
+                    os.fsync(fh.fileno())
+            if segment.stat().st_size >= self.max_segment_bytes:
+                self._close_segment(segment)
+        self.rotate()
+        return sum(len(r) for r in by_day.values())
+
+    def _close_segment(self, segment: Path) -> Path:
+        """Rewrite an active CSV segment as a closed columnar segment."""
+        closed = segment.with_name(segment.name[: -len(_ACTIVE_SUFFIX)] + _CLOSED_SUFFIX)
+        if not closed.exists():
+            columns = self._read_csv(segment)
+            _write_columnar(closed, columns, self.numeric)
+        segment.unlink()
+        return closed
+
+    def rotate(self, today: Optional[Day] = None) -> int:
+        """Close the active segments of days before *today* (UTC); returns how many."""
+        today_s = (today or datetime.datetime.now(datetime.timezone.utc).date()).isoformat()
+        closed = 0
+        for day_dir in self._day_dirs():
+            if day_dir.name >= today_s:
+                continue
+            for segment in self._segments(day_dir):
+                if segment.name.endswith(_ACTIVE_SUFFIX):
+                    self._close_segment(segment)
+                    closed += 1
+        return closed
+
+    def close_segments(self) -> int:
+        """Close every active segment, including today's."""
+        return self.rotate(datetime.date.max)
+
+    # -- reading -------------------------------------------------------------
+
+    def _day_dirs(self) -> List[Path]:
+        if not self.root.is_dir():
+            return []
+        return sorted(p for p in self.root.iterdir() if p.is_dir() and _DAY_RE.match(p.name))
+
+    def partitions(self, start: Optional[Day] = None, end: Optional[Day] = None) -> List[Path]:
+        """Return the day directories between *start* and *end* (inclusive)."""
+        lo = start.isoformat() if start else ""
+        hi = end.isoformat() if end else "9999-99-99"
+        return [p for p in self._day_dirs() if lo <= p.name <= hi]
+
+    def _read_csv(self, segment: Path, wanted: Optional[Iterable[str]] = None) -> Dict[str, Sequence[Any]]:
+        wanted = None if wanted is None else set(wanted)
+        names = [n for n in self.fieldnames if wanted is None or n in wanted]
+        return read_csv_tail(segment, 0, names, self.numeric)[0]
+
+    def iter_columns(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[Day] = None,
+        end: Optional[Day] = None,
+    ) -> Iterator[Dict[str, Sequence[Any]]]:
+        """Yield one ``{column: values}`` block per segment in the day range.
+
+        Numeric columns are ``array('d')`` and the rest lists of strings; only
+        *columns* (all by default) are decoded.
+        """
+        for day_dir in self.partitions(start, end):
+            segments = self._segments(day_dir)
+            names = {p.name for p in segments}
+            for segment in segments:
+                if segment.name.endswith(_CLOSED_SUFFIX):
+                    yield _read_columnar(segment, columns)
+                elif segment.name.endswith(_ACTIVE_SUFFIX):
+                    # A crash between writing the closed file and removing the
+                    # CSV leaves both; the closed one wins.
+                    if segment.name[: -len(_ACTIVE_SUFFIX)] + _CLOSED_SUFFIX not in names:
+                        yield self._read_csv(segment, columns)
+
+    def iter_rows(
+        self, start: Optional[Day] = None, end: Optional[Day] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield rows as dicts, oldest partition first."""
+        for block in self.iter_columns(None, start, end):
+            names = list(block)
+            for values in zip(*(block[n] for n in names)):
+                yield dict(zip(names, values))
+
+    def read_since(
+        self, cursor: Optional[Mapping[str, Any]] = None, columns: Optional[Sequence[str]] = None
+    ) -> Iterator[Tuple[Dict[str, Sequence[Any]], Dict[str, Any]]]:
+        """Yield ``(block, cursor)`` pairs for the rows written after *cursor*.
+
+        A cursor records the last segment read, how many of its rows were
+        consumed and, while the segment is still an active CSV, the byte
+        offset reached. Passing the last cursor yielded to the next call reads
+        only the tail of the log; ``None`` reads it from the start. Cursors
+        survive rotation: a segment closed since it was read is skipped up to
+        the recorded row count.
+        """
+        cursor = dict(cursor or {})
+        after = cursor.get("segment", "")
+        for day_dir in self._day_dirs():
+            if day_dir.name < after[:10]:
+                continue
+            segments = self._segments(day_dir)
+            names = {p.name for p in segments}
+            for segment in segments:
+                key = f"{day_dir.name}/{segment.name[:10]}"
+                if key < after:
+                    continue
+                seen = cursor.get("rows", 0) if key == after else 0
+                if segment.name.endswith(_CLOSED_SUFFIX):
+                    block = _read_columnar(segment, columns)
+                    total = _block_len(block)
+                    if seen:
+                        block = {n: v[seen:] for n, v in block.items()}
+                    yield block, {"segment": key, "rows": total, "offset": None}
+                elif segment.name[: -len(_ACTIVE_SUFFIX)] + _CLOSED_SUFFIX not in names:
+                    offset = cursor.get("offset") or 0 if key == after else 0
+                    block, end = read_csv_tail(segment, offset, columns or self.fieldnames, self.numeric)
+                    yield block, {"segment": key, "rows": seen + _block_len(block), "offset": end}
+
+
+def migrate_csv(
+    src: Path,
+    dst: Path,
+    *,
+    numeric: Sequence[str] = (),
+    chunk_rows: int = 10000,
+) -> int:
+    """Convert the flat CSV log at *src* into a partitioned log at *dst*.
+
+    Every migrated segment is closed (compressed) afterwards. *src* is left
+    untouched; returns the number of rows migrated.
+    """
+    with open(src, newline="") as fh:
+        reader = csv.DictReader(fh)
+        log = PartitionedLog(dst, reader.fieldnames or [], numeric=numeric)
+        count = 0
+        chunk: List[Dict[str, Any]] = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                count += log.write_rows(chunk)
+                chunk = []
+        count += log.write_rows(chunk)
+    log.close_segments()
+    return count
@@ -1,15 +1,34 @@
 """Storage helpers.
 
 This module provides a small abstraction around persistent storage so the
-underlying backend can be swapped (e.g. JSON files today, SQLite tomorrow).
-It also adds simple backup rotation when writing to disk to safeguard data.
+underlying backend can be swapped. JSON files are the default; paths ending
+in ``.db``/``.sqlite``/``.sqlite3`` use a SQLite backend that stores one row
+per item. Every JSON write is also recorded as an incremental, compressed
+backup version (see :mod:`signalai.io.backup`).
+
+JSON item stores are tiered: the store file itself is the hot tier holding
+items published in the last :data:`HOT_DAYS` days, and older items move to
+gzip-compressed monthly partitions in ``<stem>.cold/YYYY-MM.json.gz``.
+Reads with ``since`` only open the partitions that can contain matching
+items. Partitions are backed up like the store file, one backup set per
+month (see :func:`partition_backup`).
 """
 
+import gzip
 import json
+import sqlite3
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import closing
 from pathlib import Path
-from datetime import date, datetime
-from typing import Any
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import dateutil.parser
+
+from signalai.io import backup
+from signalai.io.backup import BackupSet
+from signalai.io.helpers import canonicalize_url, domain_of, sha1_of
 
 
 def json_serial(obj: Any):
@@ -19,8 +38,38 @@ def json_serial(obj: Any):
     raise TypeError(f"Type {type(obj)} not serializable")
 
 
+def _as_utc(value: Any) -> datetime:
+    """Return *value* (datetime or date string) as an aware UTC datetime."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            value = dateutil.parser.parse(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _item_hash(item: Dict[str, Any]) -> str:
+    return item.get("hash") or sha1_of(canonicalize_url(item.get("url", "")))
+
+
+def _stat(path: Path) -> Optional[List[int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
 class Storage(ABC):
-    """Abstract storage backend."""
+    """Abstract storage backend.
+
+    Besides whole-object ``load``/``save``, backends expose an item-level API
+    for the item store (a list of serialized :class:`~signalai.models.Item`
+    dicts keyed by ``hash``). The defaults below are built on ``load``/``save``;
+    backends that can do better override them.
+    """
 
     @abstractmethod
     def load(self, path: Path, default: Any):
@@ -30,28 +79,105 @@ class Storage(ABC):
     def save(self, path: Path, obj: Any):
         """Persist *obj* to *path*."""
 
+    def iter_items(self, path: Path, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Yield stored items, optionally only those published at or after *since*."""
+        cutoff = _as_utc(since) if since is not None else None
+        for item in self.load(path, []):
+            if cutoff is None or _as_utc(item["published"]) >= cutoff:
+                yield item
+
+    def iter_hashes(self, path: Path) -> Iterator[str]:
+        """Yield the hash of every stored item."""
+        for item in self.load(path, []):
+            yield _item_hash(item)
+
+    def has_hash(self, path: Path, item_hash: str) -> bool:
+        """Return whether an item with *item_hash* is stored."""
+        return any(item.get("hash") == item_hash for item in self.load(path, []))
+
+    def fingerprint(self, path: Path) -> Optional[List[Any]]:
+        """Return a JSON-serializable value that changes whenever the store at *path* does.
+
+        ``None`` means the store does not exist.
+        """
+        return _stat(path)
+
+    def get_items(self, path: Path, hashes: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Yield the stored items whose hash is in *hashes*."""
+        wanted = set(hashes)
+        if not wanted:
+            return
+        for item in self.iter_items(path):
+            if _item_hash(item) in wanted:
+                yield item
+
+    def upsert_items(self, path: Path, items: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace *items* by hash and return how many were written."""
+        items = list(items)
+        if not items:
+            return 0
+        data = self.load(path, [])
+        index = {item.get("hash"): i for i, item in enumerate(data)}
+        for item in items:
+            h = _item_hash(item)
+            if h in index:
+                data[index[h]] = item
+            else:
+                index[h] = len(data)
+                data.append(item)
+        self.save(path, data)
+        return len(items)
+
+
+# Items published within this many days stay in the hot JSON file.
+HOT_DAYS = 30
+
 
-def _rotate_backups(path: Path, keep: int = 5) -> None:
-    """Rotate backups for ``path`` keeping at most ``keep`` previous versions."""
-    if keep <= 0:
-        return
+def cold_dir(path: Path) -> Path:
+    """Directory holding the cold partitions of the JSON item store at *path*."""
+    return path.with_name(path.stem + ".cold")
 
-    for i in range(keep - 1, 0, -1):
-        src = path.with_suffix(path.suffix + f".bak{i - 1}")
-        dst = path.with_suffix(path.suffix + f".bak{i}")
-        if src.exists():
-            src.replace(dst)
 
-    bak0 = path.with_suffix(path.suffix + ".bak0")
-    if path.exists():
-        path.replace(bak0)
+def write_partition(part: Path, content: bytes) -> None:
+    """Atomically write the uncompressed JSON *content* to the cold partition *part*."""
+    part.parent.mkdir(parents=True, exist_ok=True)
+    tmp = part.with_name(part.name + ".tmp")
+    with gzip.open(tmp, "wb") as f:
+        f.write(content)
+    tmp.replace(part)
+
+
+def partition_backup(path: Path, month: str, keep: int = 5) -> BackupSet:
+    """Return the backups of the *month* (``YYYY-MM``) partition of the JSON store at *path*."""
+    root = BackupSet(path).dir
+    return BackupSet(cold_dir(path) / f"{month}.json.gz", keep=keep, directory=root / "cold" / month)
+
+
+def partition_backups(path: Path, keep: int = 5) -> Dict[str, BackupSet]:
+    """Return the backups of every cold partition of the JSON store at *path*, by month.
+
+    Months whose partition file is gone are included, so it can be restored.
+    """
+    root = BackupSet(path).dir / "cold"
+    months = sorted(d.name for d in root.iterdir() if d.is_dir()) if root.is_dir() else []
+    return {month: partition_backup(path, month, keep) for month in months}
+
+
+def _month(value: Any) -> str:
+    return _as_utc(value).strftime("%Y-%m")
 
 
 class JsonStorage(Storage):
-    """JSON-file based storage backend."""
+    """JSON-file based storage backend.
+
+    With *hot_days* set, the item-level API keeps only recent items in the
+    file and archives older ones in monthly cold partitions (see the module
+    docstring); ``hot_days=None`` keeps every item in the one file.
+    """
 
-    def __init__(self, backups: int = 5) -> None:
+    def __init__(self, backups: int = 5, hot_days: Optional[int] = HOT_DAYS) -> None:
         self.backups = backups
+        self.hot_days = hot_days
 
     def load(self, path: Path, default: Any):  # type: ignore[override]
         if path.exists():
@@ -60,28 +186,306 @@ class JsonStorage(Storage):
         return default
 
     def save(self, path: Path, obj: Any) -> None:  # type: ignore[override]
-        _rotate_backups(path, self.backups)
+        content = backup.dumps(obj, default=json_serial)
+        if self.backups > 0:
+            previous = path.read_bytes() if path.exists() else None
+            BackupSet(path, keep=self.backups).record(content, previous)
         tmp = path.with_suffix(".tmp")
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(obj, f, indent=2, ensure_ascii=False, default=json_serial)
+        with open(tmp, "wb") as f:
+            f.write(content)
         tmp.replace(path)
 
+    def _partitions(self, path: Path, since: Optional[datetime] = None) -> List[Path]:
+        """Cold partitions of *path*, oldest first, skipping months before *since*."""
+        root = cold_dir(path)
+        if not root.is_dir():
+            return []
+        first = _month(since) if since is not None else ""
+        return sorted(p for p in root.glob("*.json.gz") if p.name[:7] >= first)
+
+    def fingerprint(self, path: Path) -> Optional[List[Any]]:  # type: ignore[override]
+        """Fingerprint the hot file and every cold partition."""
+        parts = [[part.name, _stat(part)] for part in self._partitions(path)]
+        hot = _stat(path)
+        if hot is None and not parts:
+            return None
+        return [hot, *parts]
+
+    @staticmethod
+    def _read_partition(part: Path) -> List[Dict[str, Any]]:
+        with gzip.open(part, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _merge_partition(self, path: Path, month: str, items: List[Dict[str, Any]]) -> None:
+        part = cold_dir(path) / f"{month}.json.gz"
+        previous = gzip.decompress(part.read_bytes()) if part.exists() else None
+        data = json.loads(previous) if previous is not None else []
+        index = {_item_hash(item): i for i, item in enumerate(data)}
+        for item in items:
+            h = _item_hash(item)
+            if h in index:
+                data[index[h]] = item
+            else:
+                index[h] = len(data)
+                data.append(item)
+        content = backup.dumps(data, default=json_serial)
+        if self.backups > 0:
+            partition_backup(path, month, keep=self.backups).record(content, previous)
+        write_partition(part, content)
+
+    def iter_items(self, path: Path, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:  # type: ignore[override]
+        """Yield cold items (oldest partition first), then hot ones.
+
+        Partitions are read one at a time and only when their month is not
+        before *since*.
+        """
+        cutoff = _as_utc(since) if since is not None else None
+        for part in self._partitions(path, cutoff):
+            for item in self._read_partition(part):
+                if cutoff is None or _as_utc(item["published"]) >= cutoff:
+                    yield item
+        yield from super().iter_items(path, since)
+
+    def iter_hashes(self, path: Path) -> Iterator[str]:  # type: ignore[override]
+        for item in self.iter_items(path):
+            yield _item_hash(item)
+
+    def has_hash(self, path: Path, item_hash: str) -> bool:  # type: ignore[override]
+        return any(h == item_hash for h in self.iter_hashes(path))
+
+    def upsert_items(self, path: Path, items: Iterable[Dict[str, Any]]) -> int:  # type: ignore[override]
+        """Insert or replace *items*, then move items past the hot window to cold partitions."""
+        if self.hot_days is None:
+            return super().upsert_items(path, items)
+        incoming = {_item_hash(item): item for item in items}
+        if not incoming:
+            return 0
+        count = len(incoming)
+        boundary = datetime.now(timezone.utc) - timedelta(days=self.hot_days)
+        hot: List[Dict[str, Any]] = []
+        cold: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+        def route(item: Dict[str, Any]) -> None:
+            if _as_utc(item["published"]) >= boundary:
+                hot.append(item)
+            else:
+                cold[_month(item["published"])].append(item)
+
+        for item in self.load(path, []):
+            route(incoming.pop(_item_hash(item), item))
+        for item in incoming.values():
+            route(item)
+        # Archive first: if interrupted, items are duplicated across tiers
+        # rather than lost.
+        for month, group in cold.items():
+            self._merge_partition(path, month, group)
+        self.save(path, hot)
+        return count
+
+
+_ITEM_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    published TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    source TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    signal REAL,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_items_published ON items(published);
+CREATE INDEX IF NOT EXISTS idx_items_domain ON items(domain);
+"""
+
+# ``hash`` is the primary key and therefore already indexed.
+# Item fields stored in dedicated columns; anything else goes to ``extra``.
+_ITEM_COLUMNS = ("hash", "url", "title", "summary", "published", "tags", "source", "domain", "signal")
+
+
+class SqliteStorage(Storage):
+    """SQLite backend storing the item store as one row per item.
+
+    ``published`` is stored as a UTC ISO-8601 string so that range queries on
+    the ``published`` index compare correctly as text.
+    """
+
+    def _connect(self, path: Path) -> sqlite3.Connection:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(_ITEM_SCHEMA)
+        return conn
+
+    def load(self, path: Path, default: Any):  # type: ignore[override]
+        if not path.exists():
+            return default
+        return list(self.iter_items(path))
+
+    def save(self, path: Path, obj: Any) -> None:  # type: ignore[override]
+        self.upsert_items(path, obj)
+
+    def iter_items(self, path: Path, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        if not path.exists():
+            return
+        query = "SELECT * FROM items"
+        params: tuple = ()
+        if since is not None:
+            query += " WHERE published >= ?"
+            params = (_as_utc(since).isoformat(),)
+        query += " ORDER BY rowid"
+        with closing(self._connect(path)) as conn:
+            for row in conn.execute(query, params):
+                yield self._row_item(row)
+
+    @staticmethod
+    def _row_item(row: sqlite3.Row) -> Dict[str, Any]:
+        item = {col: row[col] for col in _ITEM_COLUMNS}
+        item["tags"] = json.loads(row["tags"])
+        item.update(json.loads(row["extra"]))
+        return item
+
+    def iter_hashes(self, path: Path) -> Iterator[str]:
+        if not path.exists():
+            return
+        with closing(self._connect(path)) as conn:
+            for (item_hash,) in conn.execute("SELECT hash FROM items"):
+                yield item_hash
+
+    def has_hash(self, path: Path, item_hash: str) -> bool:
+        if not path.exists():
+            return False
+        with closing(self._connect(path)) as conn:
+            row = conn.execute("SELECT 1 FROM items WHERE hash = ?", (item_hash,)).fetchone()
+        return row is not None
+
+    def get_items(self, path: Path, hashes: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        wanted = list(set(hashes))
+        if not wanted or not path.exists():
+            return
+        with closing(self._connect(path)) as conn:
+            # Stay under SQLite's bound-parameter limit.
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start : start + 500]
+                query = f"SELECT * FROM items WHERE hash IN ({', '.join('?' * len(chunk))})"
+                for row in conn.execute(query, chunk):
+                    yield self._row_item(row)
+
+    def upsert_items(self, path: Path, items: Iterable[Dict[str, Any]]) -> int:
+        rows = []
+        for item in items:
+            extra = {k: v for k, v in item.items() if k not in _ITEM_COLUMNS}
+            rows.append(
+                (
+                    _item_hash(item),
+                    item.get("url", ""),
+                    item.get("title", ""),
+                    item.get("summary", ""),
+                    _as_utc(item["published"]).isoformat(),
+                    json.dumps(item.get("tags") or []),
+                    item.get("source", ""),
+                    item.get("domain", ""),
+                    item.get("signal"),
+                    json.dumps(extra, default=json_serial),
+                )
+            )
+        if not rows:
+            return 0
+        with closing(self._connect(path)) as conn, conn:
+            conn.executemany(
+                """
+                INSERT INTO items (hash, url, title, summary, published, tags, source, domain, signal, extra)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(hash) DO UPDATE SET
+                    url = excluded.url,
+                    title = excluded.title,
+                    summary = excluded.summary,
+                    published = excluded.published,
+                    tags = excluded.tags,
+                    source = excluded.source,
+                    domain = excluded.domain,
+                    signal = excluded.signal,
+                    extra = excluded.extra
+                """,
+                rows,
+            )
+        return len(rows)
+
 
 # Default storage backend used by the application
 _storage: Storage = JsonStorage()
+_sqlite_storage: Storage = SqliteStorage()
+
+SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+
+
+def get_storage(path: Path) -> Storage:
+    """Return the storage backend responsible for *path*."""
+    if path.suffix in SQLITE_SUFFIXES:
+        return _sqlite_storage
+    return _storage
 
 
 def load(path: Path, default: Any):
     """Load data using the configured storage backend."""
-    return _storage.load(path, default)
+    return get_storage(path).load(path, default)
 
 
 def save(path: Path, obj: Any) -> None:
     """Save data using the configured storage backend."""
-    _storage.save(path, obj)
+    get_storage(path).save(path, obj)
+
+
+def iter_items(path: Path, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+    """Yield stored items from the item store at *path*."""
+    return get_storage(path).iter_items(path, since)
+
+
+def iter_hashes(path: Path) -> Iterator[str]:
+    """Yield the hash of every item in the item store at *path*."""
+    return get_storage(path).iter_hashes(path)
+
+
+def has_hash(path: Path, item_hash: str) -> bool:
+    """Return whether the item store at *path* contains *item_hash*."""
+    return get_storage(path).has_hash(path, item_hash)
+
+
+def fingerprint(path: Path) -> Optional[List[Any]]:
+    """Return a value that changes whenever the item store at *path* changes."""
+    return get_storage(path).fingerprint(path)
+
+
+def get_items(path: Path, hashes: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield the items in the item store at *path* whose hash is in *hashes*."""
+    return get_storage(path).get_items(path, hashes)
+
+
+def upsert_items(path: Path, items: Iterable[Dict[str, Any]]) -> int:
+    """Insert or replace *items* in the item store at *path*."""
+    return get_storage(path).upsert_items(path, items)
+
+
+def migrate_store(
+    src: Path, dst: Path, prepare: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+) -> int:
+    """Copy every item from the store at *src* into the store at *dst*.
+
+    Used to import an existing JSON store into a SQLite store, or with
+    ``dst == src`` to rewrite a store in place. *prepare*, if given, updates
+    each item before it is written. Returns the number of items written.
+    """
+    def _backfilled():
+        for item in iter_items(src):
+            if "domain" not in item and "url" in item:
+                item["domain"] = domain_of(item["url"])
+            yield prepare(item) if prepare else item
+
+    return upsert_items(dst, _backfilled())
 
 
 # Backwards compatibility for existing imports
 load_json = load
 save_json = save
-
@@ -1,5 +1,9 @@
 import hashlib
 import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
 from typing import Any, Dict, List
 
 
@@ -8,14 +12,99 @@ class LLMCache:
 
     def __init__(self):
         self._store: Dict[str, str] = {}
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
 
     def _key(self, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
         payload = {"messages": messages, "params": params}
         dumped = json.dumps(payload, sort_keys=True)
         return hashlib.sha256(dumped.encode("utf-8")).hexdigest()
 
+    def _count(self, value: str | None) -> str | None:
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
     def get(self, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str | None:
-        return self._store.get(self._key(messages, params))
+        return self._count(self._store.get(self._key(messages, params)))
 
     def set(self, messages: List[Dict[str, str]], params: Dict[str, Any], value: str) -> None:
         self._store[self._key(messages, params)] = value
+
+
+class DiskLLMCache(LLMCache):
+    """SQLite-backed cache that persists responses across runs.
+
+    Entries expire after ``ttl_s`` seconds (``None`` keeps them forever) and the
+    least recently used entries are evicted once more than ``max_entries`` are
+    stored.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 5000, ttl_s: float | None = 7 * 86400):
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at);
+                """
+            )
+
+    def get(self, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str | None:
+        key = self._key(messages, params)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return self._count(None)
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return self._count(None)
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return self._count(value)
+
+    def set(
+        self,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any],
+        value: str,
+        ttl_s: float | None = None,
+    ) -> None:
+        """Store *value*; *ttl_s* overrides the cache-wide TTL for this entry."""
+        ttl = self.ttl_s if ttl_s is None else ttl_s
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (self._key(messages, params), value, expires_at, now),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE key IN "
+                    "(SELECT key FROM entries ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -2,7 +2,9 @@ import os
 import requests
 from typing import List, Dict
 
+from signalai.io import http
 from signalai.logging import get_logger
+from .provider import TokenUsage
 
 
 logger = get_logger(__name__)
@@ -15,6 +17,7 @@ class LLMClient:
         self.temperature = temperature
         self.max_completion_tokens = max_completion_tokens
         self.timeout = timeout
+        self.usage = TokenUsage()
 
     def chat(self, messages: List[Dict[str, str]]) -> str:
         """
@@ -33,7 +36,7 @@ class LLMClient:
         }
 
         try:
-            resp = requests.post(
+            resp = http.post(
                 f"{self.base_url}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
@@ -42,13 +45,14 @@ class LLMClient:
                 json=payload,
                 timeout=self.timeout,
             )
-            resp.raise_for_status()
             data = resp.json()
+            self.usage.add(data.get("usage") or {})
             content = data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
             return content
         except requests.exceptions.HTTPError as http_err:
             logger.error("LLM request failed: %s", http_err)
-            logger.error("API Response Body: %s", resp.text)
+            if http_err.response is not None:
+                logger.error("API Response Body: %s", http_err.response.text)
             return ""
         except Exception as e:
             logger.error("LLM request failed with unexpected error: %s", e)
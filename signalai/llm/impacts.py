@@ -42,8 +42,8 @@ def generate_impacts_llm(
     ]
 
     if fallback:
-        provider = FallbackProvider([provider, fallback], cache=cache, retries=2)
+        provider = FallbackProvider([provider, fallback], cache=cache)
     elif cache:
-        provider = FallbackProvider([provider], cache=cache, retries=2)
+        provider = FallbackProvider([provider], cache=cache)
 
     return provider.chat(messages)
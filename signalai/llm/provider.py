@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 import os
-from typing import List, Dict, Protocol, Optional
+import threading
+from typing import Any, Callable, List, Dict, Protocol, Optional
 
 import requests
 
+from signalai.io import http
 from signalai.logging import get_logger
 from .cache import LLMCache
 
 logger = get_logger(__name__)
 
+# Provider attributes that change the response and therefore the cache key.
+SAMPLING_PARAMS = ("model", "temperature", "max_completion_tokens")
+
 
 class LLMProvider(Protocol):
     """Protocol for LLM backends."""
@@ -20,6 +25,30 @@ class LLMProvider(Protocol):
         ...
 
 
+class TokenUsage:
+    """Thread-safe running totals of the token usage reported by the API."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def add(self, usage: Dict[str, Any]) -> None:
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += int(usage.get("prompt_tokens") or 0)
+            self.completion_tokens += int(usage.get("completion_tokens") or 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+
+
 class OpenAIProvider:
     def __init__(
         self,
@@ -34,6 +63,7 @@ class OpenAIProvider:
         self.temperature = temperature
         self.max_completion_tokens = max_completion_tokens
         self.timeout = timeout
+        self.usage = TokenUsage()
 
     def chat(self, messages: List[Dict[str, str]]) -> str:
         if not self.api_key:
@@ -48,7 +78,7 @@ class OpenAIProvider:
         }
 
         try:
-            resp = requests.post(
+            resp = http.post(
                 f"{self.base_url}/chat/completions",
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
@@ -57,13 +87,14 @@ class OpenAIProvider:
                 json=payload,
                 timeout=self.timeout,
             )
-            resp.raise_for_status()
             data = resp.json()
+            self.usage.add(data.get("usage") or {})
             content = data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
             return content
         except requests.exceptions.HTTPError as http_err:
             logger.error("LLM request failed: %s", http_err)
-            logger.error("API Response Body: %s", resp.text)
+            if http_err.response is not None:
+                logger.error("API Response Body: %s", http_err.response.text)
         except Exception as e:
             logger.error("LLM request failed with unexpected error: %s", e)
         return ""
@@ -79,37 +110,62 @@ class LocalProvider:
 
 
 class FallbackProvider:
-    """Provider that tries multiple backends with optional caching and retries."""
+    """Provider that tries multiple backends with optional caching and retries.
+
+    Transient HTTP failures are already retried with backoff by
+    :mod:`signalai.io.http`, so *retries* defaults to one call per provider;
+    raising it re-asks a provider that answered with an empty response.
+
+    When *accept* is given, only responses it approves are cached or served
+    from the cache; a rejected response is still returned if no provider
+    gives an acceptable one.
+    """
 
     def __init__(
         self,
         providers: List[LLMProvider],
         cache: Optional[LLMCache] = None,
         retries: int = 1,
+        accept: Optional[Callable[[str], bool]] = None,
     ) -> None:
         self.providers = providers
         self.cache = cache
         self.retries = retries
+        self.accept = accept
 
     @property
     def model(self) -> str:
         return "+".join(getattr(p, "model", "") for p in self.providers)
 
+    def _cache_params(self) -> Dict[str, object]:
+        """Cache key params covering every provider's sampling settings."""
+        return {
+            "model": self.model,
+            "sampling": [
+                {name: getattr(p, name, None) for name in SAMPLING_PARAMS}
+                for p in self.providers
+            ],
+        }
+
     def chat(self, messages: List[Dict[str, str]]) -> str:
-        params = {"model": self.model}
+        params = self._cache_params()
+        accept = self.accept or bool
         if self.cache:
             cached = self.cache.get(messages, params)
-            if cached is not None:
+            if cached is not None and accept(cached):
                 return cached
 
+        rejected = ""
         for provider in self.providers:
             for _ in range(self.retries):
                 try:
                     resp = provider.chat(messages)
                 except Exception:
                     resp = ""
-                if resp:
+                if resp and not accept(resp):
+                    rejected = resp
+                elif resp:
                     if self.cache:
                         self.cache.set(messages, params, resp)
                     return resp
-        return ""
+        return rejected
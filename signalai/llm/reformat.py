@@ -52,9 +52,9 @@ def run(
     ]
 
     if fallback:
-        provider = FallbackProvider([provider, fallback], cache=cache, retries=2)
+        provider = FallbackProvider([provider, fallback], cache=cache)
     elif cache:
-        provider = FallbackProvider([provider], cache=cache, retries=2)
+        provider = FallbackProvider([provider], cache=cache)
 
     content = provider.chat(messages)
     return content if content else markdown_draft
@@ -1,10 +1,42 @@
-from typing import List, Tuple
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from signalai.logging import get_logger
 
 from ..models import Item
+from ..pipeline.normalize import ensure_norm
 from ..config import StyleConfig
-from .provider import LLMProvider, FallbackProvider
+from .provider import LLMProvider, FallbackProvider, TokenUsage
 from .cache import LLMCache
 
+
+logger = get_logger(__name__)
+
+
+def _prompt_summary(item: Item) -> str:
+    summ = (item.summary or "").strip().replace("\n", " ")
+    if len(summ) > 600:
+        summ = summ[:597].rstrip() + "…"
+    return summ
+
+
+def _usage(*providers: LLMProvider | None) -> Dict[str, int] | None:
+    """Sum the token usage reported by *providers*, or ``None`` if none reports it."""
+    total: Dict[str, int] | None = None
+    counted = set()
+    for provider in providers:
+        usage = getattr(provider, "usage", None)
+        if not isinstance(usage, TokenUsage) or id(usage) in counted:
+            continue
+        counted.add(id(usage))
+        snapshot = usage.snapshot()
+        total = snapshot if total is None else {k: total[k] + v for k, v in snapshot.items()}
+    return total
+
+
 def summarize_item_llm(
     item: Item,
     provider: LLMProvider,
@@ -16,9 +48,7 @@ def summarize_item_llm(
     title = (item.title or "").strip()
     src = item.source
     url = item.url
-    summ = (item.summary or "").strip().replace("\n", " ")
-    if len(summ) > 600:
-        summ = summ[:597].rstrip() + "…"
+    summ = _prompt_summary(item)
 
     system_msg = (
         "You are a copy editor. Write a single-line, neutral, journalistic synopsis under "
@@ -32,9 +62,9 @@ def summarize_item_llm(
     ]
     
     if fallback:
-        provider = FallbackProvider([provider, fallback], cache=cache, retries=2)
+        provider = FallbackProvider([provider, fallback], cache=cache)
     elif cache:
-        provider = FallbackProvider([provider], cache=cache, retries=2)
+        provider = FallbackProvider([provider], cache=cache)
 
     content = provider.chat(messages)
 
@@ -45,6 +75,81 @@ def summarize_item_llm(
         content = " ".join(words[:cfg.summary_max_words]) + "…"
     return content
 
+
+def _parse_batch(content: str) -> Dict[str, object] | None:
+    """Return a batch response's JSON object, or ``None`` if it is not one."""
+    # Tolerate a Markdown code fence around the JSON payload
+    content = re.sub(r"^```(?:json)?\s*|\s*```$", "", (content or "").strip())
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def summarize_batch_llm(
+    items: List[Item],
+    provider: LLMProvider,
+    cfg: StyleConfig,
+    *,
+    cache: LLMCache | None = None,
+    fallback: LLMProvider | None = None,
+) -> Dict[int, str]:
+    """Summarize *items* with a single request returning JSON keyed by item hash.
+
+    Returns the summaries that parsed and fall within the configured word
+    range, keyed by position in *items*; callers retry the rest per item.
+    """
+    ids = [it.hash or f"item-{idx}" for idx, it in enumerate(items)]
+    entries = [
+        {
+            "id": item_id,
+            "title": (it.title or "").strip(),
+            "source": it.source,
+            "url": it.url,
+            "summary": _prompt_summary(it),
+        }
+        for item_id, it in zip(ids, items)
+    ]
+
+    system_msg = (
+        "You are a copy editor. For each item, write a single-line, neutral, journalistic synopsis of "
+        f"{cfg.summary_min_words}-{cfg.summary_max_words} words. No fluff. Start directly with the "
+        "finding or action. Respond only with a JSON object mapping each item id to its synopsis."
+    )
+    user_msg = "Items (existing summaries may be poor):\n" + json.dumps(entries, ensure_ascii=False, indent=2)
+
+    messages = [
+        {"role": "system", "content": system_msg},
+        {"role": "user", "content": user_msg},
+    ]
+
+    def complete(content: str) -> bool:
+        # Only cache responses that parse and cover every item.
+        data = _parse_batch(content)
+        return data is not None and all(item_id in data for item_id in ids)
+
+    if fallback:
+        provider = FallbackProvider([provider, fallback], cache=cache, accept=complete)
+    elif cache:
+        provider = FallbackProvider([provider], cache=cache, accept=complete)
+
+    data = _parse_batch(provider.chat(messages))
+    if data is None:
+        logger.warning("Batch summary response was not a JSON object; falling back to per-item requests")
+        return {}
+
+    results: Dict[int, str] = {}
+    for idx, item_id in enumerate(ids):
+        text = data.get(item_id)
+        if not isinstance(text, str):
+            continue
+        text = " ".join(text.split())
+        if cfg.summary_min_words <= len(text.split()) <= cfg.summary_max_words:
+            results[idx] = text
+    return results
+
+
 def top_bullets(
     items: List[Item],
     use_llm: bool,
@@ -53,19 +158,68 @@ def top_bullets(
     *,
     cache: LLMCache | None = None,
     fallback: LLMProvider | None = None,
+    max_concurrency: int = 1,
+    batch: bool = False,
 ) -> List[Tuple[Item, str]]:
-    bullets = []
-    for it in items:
-        feed_sum = (it.summary or "").strip().replace("\n", " ")
-        feed_sum = " ".join(feed_sum.split())
-        wc = len(feed_sum.split())
-        summary_line = ""
-        if cfg.summary_min_words <= wc <= cfg.summary_max_words:
-            summary_line = feed_sum
+    """Return ``(item, summary line)`` pairs in the order of *items*.
+
+    Feed summaries within the configured word range are used as-is; other
+    items are rewritten by the LLM when *use_llm* is set, running up to
+    *max_concurrency* requests at once. With *batch*, all rewrites are first
+    requested in one call and only missing or out-of-range results are
+    retried per item.
+    """
+    start = time.perf_counter()
+    usage_before = _usage(client, fallback)
+    lines = [""] * len(items)
+    pending: List[int] = []
+    for idx, it in enumerate(items):
+        norm = ensure_norm(it)
+        if cfg.summary_min_words <= norm.word_count <= cfg.summary_max_words:
+            lines[idx] = norm.summary
         elif use_llm:
-            summary_line = summarize_item_llm(
-                it, client, cfg, cache=cache, fallback=fallback
+            pending.append(idx)
+
+    def _summarize(it: Item) -> str:
+        t0 = time.perf_counter()
+        line = summarize_item_llm(it, client, cfg, cache=cache, fallback=fallback)
+        logger.info("Summarized %s in %.2fs", it.url, time.perf_counter() - t0)
+        return line
+
+    requested = len(pending)
+    if pending and batch:
+        batched = summarize_batch_llm(
+            [items[idx] for idx in pending], client, cfg, cache=cache, fallback=fallback
+        )
+        for pos, line in batched.items():
+            lines[pending[pos]] = line
+        pending = [idx for pos, idx in enumerate(pending) if pos not in batched]
+        logger.info(
+            "Batch summary covered %d of %d items; %d retried per item",
+            len(batched), requested, len(pending),
+        )
+
+    workers = max(1, min(max_concurrency, len(pending)))
+    if pending:
+        todo = [items[idx] for idx in pending]
+        if workers == 1:
+            results = [_summarize(it) for it in todo]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_summarize, todo))
+        for idx, line in zip(pending, results):
+            lines[idx] = line
+
+    if requested:
+        logger.info(
+            "Summary stage: %d LLM summaries for %d items in %.2fs (mode=%s, max_concurrency=%d)",
+            requested, len(items), time.perf_counter() - start, "batch" if batch else "per-item", workers,
+        )
+        usage_after = _usage(client, fallback)
+        if usage_before is not None and usage_after is not None:
+            logger.info(
+                "Summary stage token usage: %d requests, %d prompt tokens, %d completion tokens",
+                *(usage_after[k] - usage_before[k] for k in ("requests", "prompt_tokens", "completion_tokens")),
             )
 
-        bullets.append((it, summary_line))
-    return bullets
+    return list(zip(items, lines))
@@ -1,10 +1,40 @@
 from datetime import date, datetime
-from typing import List, Optional, Tuple, Dict
+from typing import Any, List, Optional, Tuple, Dict
 import dateutil.parser
 
 from pydantic import BaseModel, field_validator
 
 
+def parse_stored_datetime(value: Any) -> datetime:
+    """Parse a timestamp as written by storage, falling back to ``dateutil``.
+
+    Stored items hold ``isoformat()`` output, which :meth:`datetime.fromisoformat`
+    reads an order of magnitude faster than :func:`dateutil.parser.parse`.
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return dateutil.parser.parse(value)
+
+
+class ItemNorm(BaseModel):
+    """Normalized text fields computed once per item at ingest.
+
+    See :mod:`signalai.pipeline.normalize`; ``version`` changes whenever the
+    normalization or the keyword lists do, so stale records are recomputed.
+    """
+
+    version: str
+    title: str
+    summary: str
+    search_text: str
+    word_count: int
+    site: str
+    keyword_hits: List[str]
+
+
 class Item(BaseModel):
     title: str
     url: str
@@ -15,6 +45,10 @@ class Item(BaseModel):
     hash: Optional[str] = None
     domain: str
     signal: Optional[float] = None
+    norm: Optional[ItemNorm] = None
+    # Near-duplicate clustering (see signalai.pipeline.neardup)
+    duplicate_of: Optional[str] = None
+    alternates: List[str] = []
 
     @field_validator("published", mode="before")
     def parse_published(cls, v):
@@ -22,6 +56,80 @@ class Item(BaseModel):
             return dateutil.parser.parse(v)
         return v
 
+    @classmethod
+    def from_stored(cls, data: Dict[str, Any]) -> "Item":
+        """Build an item from a dict we serialized ourselves, skipping validation.
+
+        Uses :meth:`model_construct`, so *data* must come from
+        :meth:`model_dump` (as written to the store); use
+        :meth:`model_validate` for anything else.
+        """
+        fields = dict(data)
+        fields["published"] = parse_stored_datetime(fields["published"])
+        if isinstance(fields.get("norm"), dict):
+            fields["norm"] = ItemNorm.model_construct(**fields["norm"])
+        return cls.model_construct(**fields)
+
+
+class ItemRecord:
+    """Compact stand-in for :class:`Item` on the bulk load -> rank -> select path.
+
+    A plain ``__slots__`` object with no validation, holding the fields
+    ranking and selection read. Of the normalized record only the keyword
+    hits are kept; :meth:`to_item` promotes the few selected records to full
+    items, whose ``norm`` is recomputed on first use.
+    """
+
+    __slots__ = (
+        "title",
+        "url",
+        "summary",
+        "published",
+        "tags",
+        "source",
+        "hash",
+        "domain",
+        "signal",
+        "duplicate_of",
+        "alternates",
+        "keyword_hits",
+    )
+
+    def __init__(self, data: Dict[str, Any], keyword_hits: Optional[List[str]] = None) -> None:
+        self.title = data["title"]
+        self.url = data["url"]
+        self.summary = data["summary"]
+        self.published = parse_stored_datetime(data["published"])
+        self.tags = data.get("tags") or []
+        self.source = data["source"]
+        self.hash = data.get("hash")
+        self.domain = data["domain"]
+        self.signal = data.get("signal")
+        self.duplicate_of = data.get("duplicate_of")
+        self.alternates = data.get("alternates") or []
+        if keyword_hits is None:
+            keyword_hits = (data.get("norm") or {}).get("keyword_hits", [])
+        self.keyword_hits = keyword_hits
+
+    def __repr__(self) -> str:
+        return f"ItemRecord(hash={self.hash!r}, url={self.url!r})"
+
+    def to_item(self) -> Item:
+        """Promote to a full :class:`Item` (without the normalized record)."""
+        return Item.model_construct(
+            title=self.title,
+            url=self.url,
+            summary=self.summary,
+            published=self.published,
+            tags=self.tags,
+            source=self.source,
+            hash=self.hash,
+            domain=self.domain,
+            signal=self.signal,
+            duplicate_of=self.duplicate_of,
+            alternates=self.alternates,
+        )
+
 
 class IssueDraft(BaseModel):
     date: date
@@ -1,8 +1,6 @@
 import textwrap
 from typing import Dict, List, Tuple
 from collections import defaultdict
-import html
-import re
 
 from signalai.logging import get_logger
 
@@ -10,8 +8,9 @@ from ..models import IssueDraft, IssueFinal, Item
 from ..config import StyleConfig, FormatterConfig
 from ..llm.provider import LLMProvider
 from ..llm import reformat as llm_reformat
+from ..llm.cache import LLMCache
 from . import validators
-from ..io.helpers import site_label
+from .normalize import clean_text, ensure_norm
 
 
 logger = get_logger(__name__)
@@ -47,8 +46,9 @@ def _pre_lint(draft: IssueDraft, cfg: StyleConfig) -> Tuple[str, List[Dict[str,s
         if group_name in grouped_items:
             lines.append(f"\n### {group_name}")
             for item in grouped_items[group_name]:
-                title = html.unescape(" ".join(item.title.split()))
-                site = site_label(item.url, item.source)
+                norm = ensure_norm(item)
+                title = norm.title
+                site = norm.site
                 
                 # Dynamically clamp title based on the full line length
                 suffix = f" [{site}]({item.url})"
@@ -58,10 +58,13 @@ def _pre_lint(draft: IssueDraft, cfg: StyleConfig) -> Tuple[str, List[Dict[str,s
                 lines.append(f"- {clamped_title}{suffix}")
 
                 summary = summary_map.get(item.hash, "")
-                # Clean and strip HTML tags
-                summary = re.sub('<[^<]+?>', '', summary)
-                summary = html.unescape(" ".join(summary.split()))
-                word_count = len(summary.split())
+                if summary == norm.summary:
+                    # Feed summary used as-is: already cleaned at ingest
+                    word_count = norm.word_count
+                else:
+                    # Clean and strip HTML tags
+                    summary = clean_text(summary)
+                    word_count = len(summary.split())
 
                 if cfg.summary_min_words <= word_count <= cfg.summary_max_words:
                     # Apply indentation directly within textwrap for accurate wrapping
@@ -88,6 +91,7 @@ def beautify(
     cfg: StyleConfig,
     formatter_cfg: FormatterConfig,
     client: LLMProvider | None,
+    cache: LLMCache | None = None,
 ) -> IssueFinal:
     """The main orchestration function for formatting the newsletter."""
     
@@ -99,6 +103,7 @@ def beautify(
             original_items=draft.top_signals,
             provider=client,
             cfg=cfg,
+            cache=cache,
         )
 
         is_valid, errors = validators.validate(polished_markdown, draft.top_signals, cfg)
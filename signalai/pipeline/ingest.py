@@ -1,71 +1,270 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
 from signalai.logging import get_logger
 
+from signalai.io.dupindex import DupIndex
+from signalai.io.feed_cache import FeedCache
+from signalai.io.hashindex import HashIndex
 from signalai.io.helpers import canonicalize_url, sha1_of, domain_of
-from signalai.io.storage import load, save
-from signalai.models import Item
-from signalai.sources import registry, load_plugins
+from signalai.io.storage import get_items, iter_hashes, iter_items, load, upsert_items
+from signalai.models import Item, ItemRecord
+from signalai.pipeline import neardup, theme
+from signalai.pipeline.normalize import NORM_VERSION, is_stale, normalize
+from signalai.sources import Source, registry, load_plugins
+from signalai.sources.base import NOT_MODIFIED
 
 
 logger = get_logger(__name__)
 
+INGEST_MODES = ("threads", "async")
 
-def _fetch_feed(feed):
-    """Helper to fetch a single feed with error handling."""
-    ftype = feed.get("type")
+_plugins_lock = threading.Lock()
+_plugins_loaded = False
+
+
+def _source_class(ftype):
+    """Look up a source class, scanning plugin entry points only on a miss.
+
+    Built-in sources register on import, so the entry point scan is skipped
+    entirely unless a feed uses a type they do not provide.
+    """
+    global _plugins_loaded
     cls = registry.get(ftype)
+    if cls is None:
+        with _plugins_lock:
+            if not _plugins_loaded:
+                load_plugins()
+                _plugins_loaded = True
+        cls = registry.get(ftype)
+    return cls
+
+
+def _make_source(feed, feed_cache: FeedCache | None) -> Optional[Source]:
+    ftype = feed.get("type")
+    cls = _source_class(ftype)
     if not cls:
         logger.warning("Unknown feed type: %s", ftype)
-        return []
+        return None
     source = cls()
+    source.feed_cache = feed_cache
+    return source
+
+
+def _parse_raw(source: Source, raw: Any, feed) -> List[Item]:
+    if raw is NOT_MODIFIED:
+        return []
+    items = source.parse(raw, feed)
+    source.commit_fetch()
+    return source.dedupe(items)
+
+
+def _fetch_feed(feed, feed_cache: FeedCache | None = None):
+    """Helper to fetch a single feed with error handling."""
+    source = _make_source(feed, feed_cache)
+    if source is None:
+        return []
     try:
-        raw = source.fetch(feed)
-        items = source.parse(raw, feed)
-        items = source.dedupe(items)
-        return items
+        return _parse_raw(source, source.fetch(feed), feed)
     except Exception as e:
-        logger.error("Fetch error for %s: %s", feed.get("name", ftype), e)
+        logger.error("Fetch error for %s: %s", feed.get("name", feed.get("type")), e)
         return []
 
 
-def run(feeds_path: Path, store_path: Path) -> Tuple[List[Item], List[Item]]:
-    """
-    Loads feeds, fetches new items, dedupes, and updates the store.
-    Returns the full store of items and the list of new items.
+async def _afetch_feed(
+    feed,
+    feed_cache: FeedCache | None,
+    limit: asyncio.Semaphore,
+    host_limits: Dict[str, asyncio.Semaphore],
+) -> List[Item]:
+    """Async counterpart of :func:`_fetch_feed` bounded by global and per-host limits."""
+    source = _make_source(feed, feed_cache)
+    if source is None:
+        return []
+    host = urlparse(feed.get("url", "")).netloc
+    try:
+        async with limit, host_limits[host]:
+            raw = await source.afetch(feed)
+        return _parse_raw(source, raw, feed)
+    except Exception as e:
+        logger.error("Fetch error for %s: %s", feed.get("name", feed.get("type")), e)
+        return []
+
+
+async def _fetch_all_async(
+    feeds, feed_cache: FeedCache | None, max_concurrency: int, per_host: int
+) -> List[List[Item]]:
+    limit = asyncio.Semaphore(max_concurrency)
+    host_limits: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(per_host))
+    return await asyncio.gather(
+        *(_afetch_feed(feed, feed_cache, limit, host_limits) for feed in feeds)
+    )
+
+
+def fetch_all(
+    feeds,
+    feed_cache: FeedCache | None = None,
+    *,
+    mode: str = "threads",
+    max_concurrency: int = 16,
+    per_host: int = 4,
+) -> List[List[Item]]:
+    """Fetch and parse every feed, returning one list of items per feed in feed order.
+
+    ``mode="threads"`` runs :meth:`Source.fetch` on a thread pool. ``mode="async"``
+    runs a single event loop for the whole run and awaits :meth:`Source.afetch`,
+    limited to *max_concurrency* feeds at once and *per_host* feeds per host.
+    Both modes return identical results.
     """
-    load_plugins()
+    if mode not in INGEST_MODES:
+        raise ValueError(f"Unknown ingest mode: {mode}")
+    start = time.perf_counter()
+    if mode == "async":
+        results = asyncio.run(_fetch_all_async(feeds, feed_cache, max_concurrency, per_host))
+    else:
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            results = list(executor.map(lambda feed: _fetch_feed(feed, feed_cache), feeds))
+    logger.info(
+        "Fetched %d feeds in %.2fs (mode=%s)", len(feeds), time.perf_counter() - start, mode
+    )
+    return results
 
-    feeds = load(feeds_path, [])
-    store_data = load(store_path, [])
 
-    # Backfill domain for old items
-    for d in store_data:
+def _backfill(items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    for d in items:
+        # Backfill domain for old items
         if "domain" not in d and "url" in d:
             d["domain"] = domain_of(d["url"])
+        yield d
+
+
+def _iter_stored(store_path: Path, since: Optional[datetime]) -> Iterator[Dict[str, Any]]:
+    return _backfill(iter_items(store_path, since))
+
+
+def _get_stored(store_path: Path, hashes: Iterable[str]) -> Iterator[Item]:
+    """Yield the stored items for *hashes*, e.g. near-duplicates outside the loaded window."""
+    for d in _backfill(get_items(store_path, hashes)):
+        yield Item.from_stored(d)
+
+
+def iter_store(store_path: Path, since: Optional[datetime] = None) -> Iterator[Item]:
+    """Lazily yield stored items published at or after *since* as :class:`Item` objects.
+
+    The store only holds items we serialized ourselves, so they are built
+    with :meth:`Item.from_stored` instead of being validated again.
+    """
+    for d in _iter_stored(store_path, since):
+        yield Item.from_stored(d)
+
 
-    store_items = [Item.parse_obj(d) for d in store_data]
-    seen_hashes = {item.hash for item in store_items if item.hash}
+def iter_records(store_path: Path, since: Optional[datetime] = None) -> Iterator[ItemRecord]:
+    """Like :func:`iter_store`, but yield compact :class:`ItemRecord` objects.
+
+    For ranking and selecting over the whole store; promote the selected
+    records with :meth:`ItemRecord.to_item`. Keyword hits of items whose
+    stored normalization is missing or stale are recomputed here, but not
+    written back; ``migrate-store`` back-fills them once.
+    """
+    stale = 0
+    for d in _iter_stored(store_path, since):
+        if is_stale(d):
+            stale += 1
+            yield ItemRecord(d, normalize(Item.from_stored(d)).keyword_hits)
+        else:
+            yield ItemRecord(d)
+    if stale:
+        logger.warning(
+            "%d stored items have a stale normalized record and were re-normalized; "
+            "back-fill them with `signalai.cli migrate-store --from %s`",
+            stale, store_path,
+        )
+
+
+def run(
+    feeds_path: Path,
+    store_path: Path,
+    *,
+    mode: str = "threads",
+    max_concurrency: int = 16,
+    per_host: int = 4,
+    since: Optional[datetime] = None,
+    load_store: bool = True,
+) -> Tuple[List[Item], List[Item]]:
+    """
+    Loads feeds, fetches new items, dedupes, and updates the store.
+    Returns the stored items and the list of new items.
+
+    Only stored items published at or after *since* are loaded (storage
+    backends skip partitions outside that range) and post-processed together
+    with the new items; the returned store list is those items plus the new
+    ones. With ``load_store=False`` no stored items are loaded and only the
+    new items are processed and returned; read the store lazily with
+    :func:`iter_store` instead.
+    """
+    feeds = load(feeds_path, [])
+    # Dedupe against the compact hash index, so historical items need not be
+    # loaded for it; the index also covers items added earlier in this run.
+    hash_index = HashIndex.for_store(store_path, lambda: iter_hashes(store_path))
+    # Sources skip entries already in the store (or in a feed's watermark)
+    # before building items for them.
+    feed_cache = FeedCache.for_store(store_path, hash_index)
 
     new_items: List[Item] = []
-    with ThreadPoolExecutor() as executor:
-        futures = [executor.submit(_fetch_feed, feed) for feed in feeds]
-        for future in as_completed(futures):
-            entries = future.result()
-            for item in entries:
-                url = canonicalize_url(item.url)
-                h = sha1_of(url)
-                item.hash = h
-                item.url = url
-                if h not in seen_hashes:
-                    new_items.append(item)
-                    seen_hashes.add(h)
+    results = fetch_all(
+        feeds, feed_cache, mode=mode, max_concurrency=max_concurrency, per_host=per_host
+    )
+    for feed, entries in zip(feeds, results):
+        for item in entries:
+            url = canonicalize_url(item.url)
+            h = sha1_of(url)
+            item.hash = h
+            item.url = url
+            if h not in hash_index:
+                item.norm = normalize(item)
+                new_items.append(item)
+                hash_index.add(h)
+        feed_cache.advance(feed, entries)
+
+    store_items = list(iter_store(store_path, since)) if load_store else []
+    # Items stored before normalization existed (or with an older version)
+    # are normalized once here and written back below.
+    stale = [item for item in store_items if item.norm is None or item.norm.version != NORM_VERSION]
+    for item in stale:
+        item.norm = normalize(item)
 
     store_items.extend(new_items)
 
-    save(store_path, [item.model_dump() for item in store_items])
+    # Items missing from the index (new ones, or a store predating it) are
+    # clustered with near-duplicates already seen; matches that were not
+    # loaded (outside the window, or with ``load_store=False``) are read
+    # back from the store by hash.
+    dup_index = DupIndex.for_store(store_path)
+    clustered = neardup.cluster(
+        {item.hash: item for item in store_items if item.hash},
+        [item for item in store_items if item.hash not in dup_index],
+        dup_index,
+        lambda hashes: _get_stored(store_path, hashes),
+    )
 
-    return store_items, new_items
+    # Only new, re-normalized and re-clustered rows are written; backends
+    # that store one row per item (SQLite) leave other items untouched.
+    dirty = {id(item): item for item in stale + new_items + clustered}
+    upsert_items(store_path, [item.model_dump() for item in dirty.values()])
+    # Persist validators and indexes only once the items they cover are stored.
+    hash_index.save(store_path)
+    # Embeddings of items that left the store are no longer needed.
+    theme.compact_embeddings(theme.embedding_root(store_path), hash_index)
+    dup_index.save()
+    dup_index.close()
+    feed_cache.save()
+    logger.info(feed_cache.report())
 
+    return store_items, new_items
@@ -0,0 +1,120 @@
+"""Cluster near-duplicate stories arriving from different sources.
+
+An announcement often shows up as a vendor blog post, a Hacker News link and
+a GitHub release under different URLs, so URL hashes do not catch it. Items
+are matched through :class:`~signalai.io.dupindex.DupIndex` on their
+normalized text. Only items from different domains are matched: one feed
+publishes many distinct stories in the same house style, while a copy of a
+story from that same feed is already caught by its URL. Each cluster keeps its highest-authority item (see
+:data:`~signalai.rules.authority.AUTHORITY`) as the representative, which
+lists the other members' URLs in ``alternates``; the others point to it
+through ``duplicate_of`` and are left out of ranking.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional
+
+from signalai.io.dupindex import DupIndex
+from signalai.io.helpers import sha1_of
+from signalai.logging import get_logger
+from signalai.models import Item
+from signalai.pipeline.normalize import ensure_norm
+from signalai.rules.authority import AUTHORITY
+
+logger = get_logger(__name__)
+
+__all__ = ["authority", "cluster"]
+
+
+def authority(item: Item) -> float:
+    """Authority of *item*'s domain, with the ranker's default for unknown ones."""
+    return AUTHORITY.get(item.domain, 0.6)
+
+
+def _load_missing(
+    store: Dict[str, Item], hashes: Iterable[str], fetch: Callable[[List[str]], Iterable[Item]]
+) -> List[Item]:
+    """Add the items for *hashes* that are not in *store* yet and return them."""
+    missing = [h for h in dict.fromkeys(hashes) if h and h not in store]
+    found = list(fetch(missing)) if missing else []
+    for it in found:
+        store[it.hash] = it
+    return found
+
+
+def cluster(
+    store: Dict[str, Item],
+    items: Iterable[Item],
+    index: DupIndex,
+    fetch: Optional[Callable[[List[str]], Iterable[Item]]] = None,
+) -> List[Item]:
+    """Index *items* and merge them into near-duplicate clusters.
+
+    *store* maps hashes to the loaded items (including *items*) and is used
+    to update existing clusters. When the index matches items that are not
+    loaded, *fetch* is called with their hashes to look them up; they are
+    added to *store* together with their representatives and the other
+    members of those clusters. Without *fetch* such matches are ignored.
+    Returns the items whose ``duplicate_of`` or ``alternates`` changed, in
+    the order they were first changed, so the caller can persist them.
+    """
+    items = [it for it in items if it.hash and it.hash not in index]
+    sigs = {it.hash: index.signature(ensure_norm(it).search_text) for it in items}
+    if fetch is not None:
+        # Items from earlier runs are in the index but may not be loaded;
+        # look up every cluster the new items can join before merging.
+        matched = [
+            key
+            for it in items
+            if sigs[it.hash] is not None
+            for key, _ in index.query(sigs[it.hash], exclude_domain=it.domain)
+        ]
+        _load_missing(store, matched, fetch)
+        reps = [store[h].duplicate_of or h for h in matched if h in store]
+        _load_missing(store, reps, fetch)
+        alternates = (sha1_of(url) for h in reps if h in store for url in store[h].alternates)
+        _load_missing(store, alternates, fetch)
+
+    members: Dict[str, List[str]] = {}
+    for h, it in store.items():
+        if it.duplicate_of:
+            members.setdefault(it.duplicate_of, []).append(h)
+
+    changed: Dict[str, Item] = {}
+    merged = 0
+    for item in items:
+        sig = sigs[item.hash]
+        if item.hash in index or sig is None:
+            continue
+        matches = [key for key, _ in index.query(sig, exclude_domain=item.domain) if key in store]
+        index.add(item.hash, sig, item.domain)
+        if not matches:
+            continue
+
+        match = store[matches[0]]
+        rep = store.get(match.duplicate_of, match) if match.duplicate_of else match
+        if rep.hash == item.hash:
+            continue
+        merged += 1
+        if authority(item) > authority(rep):
+            # The newcomer takes over the cluster.
+            item.alternates = [rep.url, *rep.alternates]
+            item.duplicate_of = None
+            group = members.pop(rep.hash, [])
+            for h in group:
+                store[h].duplicate_of = item.hash
+                changed.setdefault(h, store[h])
+            rep.duplicate_of = item.hash
+            rep.alternates = []
+            members[item.hash] = [*group, rep.hash]
+            changed.setdefault(rep.hash, rep)
+        else:
+            item.duplicate_of = rep.hash
+            if item.url not in rep.alternates:
+                rep.alternates = [*rep.alternates, item.url]
+            members.setdefault(rep.hash, []).append(item.hash)
+            changed.setdefault(rep.hash, rep)
+        changed.setdefault(item.hash, item)
+
+    if merged:
+        logger.info("Near-duplicates: merged %d items into existing stories", merged)
+    return list(changed.values())
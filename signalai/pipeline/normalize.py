@@ -0,0 +1,74 @@
+"""Normalized item text, computed once at ingest and stored with the item.
+
+Formatting, ranking, theme detection and summary selection all need the same
+cleaned title and summary, lowercase text, word count, site label and keyword
+hits. :func:`normalize` derives them in one pass and ingest persists the
+result as :attr:`Item.norm <signalai.models.Item.norm>`; downstream stages
+read it through :func:`ensure_norm`, which only recomputes records that are
+missing or were built by an older normalization. :func:`backfill_norm`
+refreshes such records in stored item dicts, e.g. when ``migrate-store``
+rewrites a store.
+"""
+
+import html
+import re
+from typing import Any, Dict
+
+from signalai.io.helpers import sha1_of, site_label
+from signalai.models import Item, ItemNorm
+from signalai.rules.matcher import KEYWORDS
+
+__all__ = ["NORM_VERSION", "clean_text", "normalize", "ensure_norm", "is_stale", "backfill_norm"]
+
+_TAG_RE = re.compile("<[^<]+?>")
+
+# Bump the leading number when normalize() changes; the suffix tracks the
+# keyword lists so editing them invalidates stored hits.
+NORM_VERSION = "2-" + sha1_of("\n".join(KEYWORDS.patterns))[:8]
+
+
+def clean_text(text: str) -> str:
+    """Strip HTML tags, unescape entities and collapse whitespace."""
+    return html.unescape(" ".join(_TAG_RE.sub("", text or "").split()))
+
+
+def normalize(item: Item) -> ItemNorm:
+    """Return the normalized fields of *item*.
+
+    Keyword hits are matched on the raw title and summary, as the ranker's
+    ``keyword_hits`` feature always was, so weights trained on logged
+    features stay valid. Titles keep their markup, as the formatter always
+    rendered them.
+    """
+    summary = clean_text(item.summary)
+    search_text = f"{clean_text(item.title)} {summary}".lower()
+    return ItemNorm(
+        version=NORM_VERSION,
+        title=html.unescape(" ".join(item.title.split())),
+        summary=summary,
+        search_text=search_text,
+        word_count=len(summary.split()),
+        site=site_label(item.url, item.source),
+        keyword_hits=sorted(KEYWORDS.find(f"{item.title} {item.summary}")),
+    )
+
+
+def ensure_norm(item: Item) -> ItemNorm:
+    """Return ``item.norm``, (re)computing and attaching it when out of date."""
+    norm = item.norm
+    if norm is None or norm.version != NORM_VERSION:
+        norm = item.norm = normalize(item)
+    return norm
+
+
+def is_stale(stored: Dict[str, Any]) -> bool:
+    """Return whether the stored item dict *stored* lacks a current ``norm`` record."""
+    norm = stored.get("norm")
+    return norm is None or norm.get("version") != NORM_VERSION
+
+
+def backfill_norm(stored: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the stored item dict *stored* with its ``norm`` record recomputed if stale."""
+    if is_stale(stored):
+        stored["norm"] = normalize(Item.from_stored(stored)).model_dump(mode="json")
+    return stored
@@ -1,22 +1,34 @@
-import csv
 import datetime
+import heapq
 import math
 import pickle
+from itertools import islice
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, Iterator, List, Tuple
 
+from signalai.io import eventlog
 from signalai.logging import get_logger
-from signalai.models import Item
+from signalai.models import Item, ItemRecord
+from signalai.pipeline.normalize import ensure_norm
 from signalai.rules.authority import AUTHORITY
 from signalai.rules.keywords import BOOST_TERMS
 from signalai import analytics
 
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover
+    np = None  # type: ignore
+
 logger = get_logger(__name__)
 
+_BOOST_SET = frozenset(kw.lower() for kw in BOOST_TERMS)
+
 # Paths for logging and model artifacts
-LOG_PATH = Path(__file__).resolve().parents[2] / "out" / "ranker_log.csv"
+LOG_PATH = Path(__file__).resolve().parents[2] / "out" / "ranker_log"
 MODEL_PATH = Path(__file__).resolve().parents[2] / "out" / "ranker_model.pkl"
-_MODEL_CACHE: tuple[float, list[float]] | None = None
+# Weight order expected from versioned model artifacts (see train_ranking).
+MODEL_FEATURES = ["bias", "novelty", "authority", "keyword_hits", "engagement"]
+_MODEL_CACHE: tuple[tuple[int, int], list[float]] | None = None
 
 
 def extract_features(item: Item) -> Dict[str, float]:
@@ -45,8 +57,8 @@ def extract_features(item: Item) -> Dict[str, float]:
     authority = AUTHORITY.get(item.domain, 0.6)
 
     # Keyword hits
-    text = (item.title + " " + item.summary).lower()
-    kw_hits = sum(1 for kw in BOOST_TERMS if kw in text)
+    hits = item.keyword_hits if isinstance(item, ItemRecord) else ensure_norm(item).keyword_hits
+    kw_hits = len(_BOOST_SET.intersection(hits))
 
     # Engagement proxy: small prior; bump for GitHub
     engagement = 0.3 + (0.15 if "github.com" in item.domain else 0.0)
@@ -59,48 +71,30 @@ def extract_features(item: Item) -> Dict[str, float]:
     }
 
 
-def _ensure_log_header() -> None:
-    if not LOG_PATH.exists():
-        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with LOG_PATH.open("w", newline="") as fh:
-            writer = csv.DictWriter(
-                fh,
-                fieldnames=[
-                    "timestamp",
-                    "item_url",
-                    "novelty",
-                    "authority",
-                    "keyword_hits",
-                    "engagement",
-                    "event",
-                ],
-            )
-            writer.writeheader()
+_LOG_FIELDS = [
+    "timestamp",
+    "item_url",
+    "novelty",
+    "authority",
+    "keyword_hits",
+    "engagement",
+    "event",
+]
+# Log columns holding feature values, stored as numbers.
+NUMERIC_FIELDS = ["novelty", "authority", "keyword_hits", "engagement"]
+
+
+def _log_events(rows: Iterable[Tuple[Item, Dict[str, float]]], event: str) -> None:
+    """Buffer one log row per ``(item, features)`` pair in the shared event log."""
+    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    eventlog.get_log(LOG_PATH, _LOG_FIELDS, numeric=NUMERIC_FIELDS).extend(
+        {"timestamp": timestamp, "item_url": item.url, **features, "event": event}
+        for item, features in rows
+    )
 
 
 def _log_event(item: Item, features: Dict[str, float], event: str) -> None:
-    _ensure_log_header()
-    with LOG_PATH.open("a", newline="") as fh:
-        writer = csv.DictWriter(
-            fh,
-            fieldnames=[
-                "timestamp",
-                "item_url",
-                "novelty",
-                "authority",
-                "keyword_hits",
-                "engagement",
-                "event",
-            ],
-        )
-        writer.writerow(
-            {
-                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-                "item_url": item.url,
-                **features,
-                "event": event,
-            }
-        )
+    _log_events([(item, features)], event)
 
 
 def record_interaction(item: Item, event: str) -> None:
@@ -110,41 +104,70 @@ def record_interaction(item: Item, event: str) -> None:
     analytics.log_event(item, event)
 
 
+def _model_weights(model) -> list[float] | None:
+    """Return weights from a bare weight list or a versioned artifact dict."""
+    if not isinstance(model, dict):
+        return model
+    if model.get("features") != MODEL_FEATURES:
+        logger.warning(
+            "Ignoring ranker model with feature schema %s (expected %s)",
+            model.get("features"),
+            MODEL_FEATURES,
+        )
+        return None
+    return model["weights"]
+
+
 def _load_model():
-    """Load ranking model if available, caching by mtime."""
+    """Load ranking model if available, caching by file identity.
+
+    The cache key is the nanosecond mtime plus the inode, so a model swapped
+    in with ``os.replace`` (as online updates do) is picked up by a running
+    process even when it lands within the same mtime tick.
+    """
     global _MODEL_CACHE
-    if not MODEL_PATH.exists():
+    try:
+        st = MODEL_PATH.stat()
+    except FileNotFoundError:
         return None
-    mtime = MODEL_PATH.stat().st_mtime
+    mtime = (st.st_mtime_ns, st.st_ino)
     if _MODEL_CACHE and _MODEL_CACHE[0] == mtime:
         return _MODEL_CACHE[1]
     try:
         with MODEL_PATH.open("rb") as fh:
-            weights = pickle.load(fh)
+            weights = _model_weights(pickle.load(fh))
     except Exception as exc:  # pragma: no cover - filesystem/format errors
         logger.warning("Failed to load ranker model from %s: %s", MODEL_PATH, exc)
         return None
     _MODEL_CACHE = (mtime, weights)
     return weights
 
-def score(item: Item, profile: dict[str, set[str]] | None = None) -> float:
-    """Score item using trained model if available."""
+
+def _boosted_features(
+    item: Item,
+    profile: dict[str, set[str]] | None,
+    summary: Dict[str, Dict[str, int]] | None = None,
+) -> Dict[str, float]:
     features = extract_features(item)
-    features["engagement"] += analytics.engagement_boost(item)
+    features["engagement"] += analytics.engagement_boost(item, summary)
     if profile:
         features["engagement"] += analytics.personalized_boost(item, profile)
-    _log_event(item, features, "impression")
+    return features
 
-    model = _load_model()
+
+def _model_vector(features: Dict[str, float]) -> List[float]:
+    return [
+        1.0,
+        features["novelty"],
+        features["authority"],
+        features["keyword_hits"],
+        features["engagement"],
+    ]
+
+
+def _score_features(features: Dict[str, float], model: list[float] | None) -> float:
     if model is not None:
-        vec = [
-            1.0,
-            features["novelty"],
-            features["authority"],
-            features["keyword_hits"],
-            features["engagement"],
-        ]
-        z = sum(w * x for w, x in zip(model, vec))
+        z = sum(w * x for w, x in zip(model, _model_vector(features)))
         return 1.0 / (1.0 + math.exp(-z))
 
     # Fallback to heuristic scoring
@@ -156,6 +179,71 @@ def score(item: Item, profile: dict[str, set[str]] | None = None) -> float:
         + 0.10 * features["engagement"]
     )
 
+
+def score(item: Item, profile: dict[str, set[str]] | None = None) -> float:
+    """Score item using trained model if available."""
+    features = _boosted_features(item, profile)
+    return _score_features(features, _load_model())
+
+
+def score_batch(
+    items: Iterable[Item], profile: dict[str, set[str]] | None = None
+) -> List[float]:
+    """Score many items at once, returning scores in input order.
+
+    Equivalent to calling :func:`score` for each item, but the engagement log
+    is summarised once for the whole batch and, when NumPy is installed, the
+    model is applied as one matrix product.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    summary = analytics.summarize()
+    rows = [_boosted_features(it, profile, summary) for it in items]
+
+    model = _load_model()
+    if np is None:
+        return [_score_features(f, model) for f in rows]
+
+    X = np.array([_model_vector(f) for f in rows], dtype=float)
+    if model is not None:
+        z = X @ np.asarray(model, dtype=float)
+        return (1.0 / (1.0 + np.exp(-z))).tolist()
+
+    keyword = np.minimum(1.0, X[:, 3] / 4.0)
+    scores = 0.35 * X[:, 1] + 0.30 * X[:, 2] + 0.25 * keyword + 0.10 * X[:, 4]
+    return scores.tolist()
+
+
+def score_stream(
+    items: Iterable[Item], profile: dict[str, set[str]] | None = None, chunk_size: int = 4096
+) -> Iterator[Item]:
+    """Lazily set ``signal`` on *items*, scoring them in chunks, and yield them.
+
+    Lets :func:`select_top_k` consume a store streamed from disk without
+    holding every item in memory.
+    """
+    it = iter(items)
+    while chunk := list(islice(it, chunk_size)):
+        for item, signal in zip(chunk, score_batch(chunk, profile)):
+            item.signal = signal
+        yield from chunk
+
+
+def log_impressions(items: Iterable[Item], profile: dict[str, set[str]] | None = None) -> None:
+    """Log an impression for each item actually shown to the reader.
+
+    Scoring does not log anything; call this with the selected items only so
+    the training log is not flooded with the rest of the store.
+    """
+    items = list(items)
+    if not items:
+        return
+    summary = analytics.summarize()
+    _log_events(((it, _boosted_features(it, profile, summary)) for it in items), "impression")
+
+
 def select(items: list[Item], k: int, per_domain_cap: int) -> list[Item]:
     picked, perdom = [], {}
     for it in items:
@@ -166,3 +254,109 @@ def select(items: list[Item], k: int, per_domain_cap: int) -> list[Item]:
         if len(picked) >= k:
             break
     return picked
+
+
+def published_utc(item: Item) -> datetime.datetime:
+    """Return *item*'s published time, treating naive timestamps as UTC."""
+    published = item.published
+    if published.tzinfo is None:
+        return published.replace(tzinfo=datetime.timezone.utc)
+    return published
+
+
+class _DomainHeaps:
+    """Top ``cap`` items per domain, kept as bounded min-heaps of rank keys."""
+
+    def __init__(self, cap: int) -> None:
+        self.cap = cap
+        self.count = 0
+        self.heaps: Dict[str, list] = {}
+
+    def push(self, key: tuple, item: Item) -> None:
+        self.count += 1
+        if self.cap <= 0:
+            return
+        heap = self.heaps.setdefault(item.domain, [])
+        if len(heap) < self.cap:
+            heapq.heappush(heap, (key, item))
+        elif key > heap[0][0]:
+            heapq.heapreplace(heap, (key, item))
+
+    def pick(self, k: int, used: Dict[str, int]) -> List[Item]:
+        """Greedy :func:`select` over this group given domain counts already *used*."""
+        if k <= 0:
+            return []
+        pool = []
+        for domain, heap in self.heaps.items():
+            room = self.cap - used.get(domain, 0)
+            if room > 0:
+                pool.extend(heapq.nlargest(room, heap))
+        picked = [item for _, item in heapq.nlargest(k, pool)]
+        for item in picked:
+            used[item.domain] = used.get(item.domain, 0) + 1
+        return picked
+
+
+def select_top_k(
+    items: Iterable[Item],
+    k: int,
+    per_domain_cap: int,
+    *,
+    new_hashes: set[str] | frozenset[str] = frozenset(),
+    window_days: int = 0,
+    prefer_new: bool = False,
+    only_new: bool = False,
+    now: datetime.datetime | None = None,
+) -> Tuple[List[Item], int]:
+    """Select the top *k* scored items in one pass, returning them and the candidate count.
+
+    Gives the same result as sorting by ``(signal, published)``, building the
+    candidate pool (recency window, ``only_new``/``prefer_new`` ordering and
+    their fallbacks) and running :func:`select`, but keeps only the best
+    *per_domain_cap* items of each domain per candidate group in bounded
+    heaps: ``O(n log k)`` time and ``O(k x domains)`` memory.
+    """
+    cutoff = None
+    if window_days and window_days > 0:
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        cutoff = now - datetime.timedelta(days=window_days)
+
+    groups = {name: _DomainHeaps(per_domain_cap) for name in ("new", "recent_new", "recent_rest", "all")}
+    for idx, it in enumerate(items):
+        # Stable descending sort order: ties keep input order.
+        key = (it.signal, it.published, -idx)
+        is_new = it.hash in new_hashes if it.hash else False
+        groups["all"].push(key, it)
+        if is_new:
+            groups["new"].push(key, it)
+        if cutoff is None or published_utc(it) >= cutoff:
+            groups["recent_new" if is_new else "recent_rest"].push(key, it)
+
+    k = max(k, 1)  # select() always takes the first eligible item
+    used: Dict[str, int] = {}
+    recent = [groups["recent_new"], groups["recent_rest"]]
+    if only_new:
+        order = [groups["new"]]
+        if not groups["new"].count:
+            logger.info("No new items found; falling back to recent window (%s days)", window_days)
+            order = [_merged(recent, per_domain_cap)]
+    else:
+        order = recent if prefer_new else [_merged(recent, per_domain_cap)]
+        if not sum(g.count for g in recent):
+            logger.info("No items in recent window; falling back to all ranked items")
+            order = [groups["all"]]
+
+    picked: List[Item] = []
+    for group in order:
+        picked.extend(group.pick(k - len(picked), used))
+    return picked, sum(g.count for g in order)
+
+
+def _merged(groups: List[_DomainHeaps], cap: int) -> _DomainHeaps:
+    merged = _DomainHeaps(cap)
+    for group in groups:
+        for heap in group.heaps.values():
+            for key, item in heap:
+                merged.push(key, item)
+        merged.count += group.count - sum(len(h) for h in group.heaps.values())
+    return merged
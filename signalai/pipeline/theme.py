@@ -2,58 +2,144 @@
 
 from __future__ import annotations
 
+import json
 import math
 import hashlib
 import random
 from datetime import datetime, timezone
-from typing import Dict, List
+from pathlib import Path
+from typing import Any, Container, Dict, List
 
+from signalai.io.embedding_store import EmbeddingStore
 from signalai.models import Item
+from signalai.pipeline.normalize import ensure_norm
+from signalai.rules.keywords import THEME_KEYWORDS
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - pure-Python fallback below
+    np = None  # type: ignore
 
 
 # ---------------------------------------------------------------------------
 # Embedding model
 # ---------------------------------------------------------------------------
 
-try:  # pragma: no cover - optional dependency
-    from sentence_transformers import SentenceTransformer as _STModel  # type: ignore
-except Exception:  # pragma: no cover - fallback used in tests
+EMBED_MODEL = "all-MiniLM-L6-v2"
+# Bump when the text fed to the model changes so cached vectors are not reused.
+EMBED_MODEL_VERSION = 1
+
+
+class _HashEmbeddingModel:
+    """Very small fallback embedding model.
+
+    Each sentence is tokenized by whitespace and hashed into a fixed size
+    vector. This keeps the code lightweight while presenting the same
+    interface as ``sentence-transformers``.
+    """
 
-    class _STModel:
-        """Very small fallback embedding model.
+    MODEL_ID = "hash-embedding-32"
 
-        Each sentence is tokenized by whitespace and hashed into a fixed size
-        vector. This keeps the code lightweight while presenting the same
-        interface as ``sentence-transformers``.
-        """
+    def encode(self, texts: List[str]) -> List[List[float]]:
+        dim = 32
+        vectors: List[List[float]] = []
+        for text in texts:
+            vec = [0.0] * dim
+            for token in text.lower().split():
+                idx = int(hashlib.sha1(token.encode("utf-8")).hexdigest(), 16) % dim
+                vec[idx] += 1.0
+            norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+            vectors.append([v / norm for v in vec])
+        return vectors
 
-        def encode(self, texts: List[str]) -> List[List[float]]:  # type: ignore
-            dim = 32
-            vectors: List[List[float]] = []
-            for text in texts:
-                vec = [0.0] * dim
-                for token in text.lower().split():
-                    idx = int(hashlib.sha1(token.encode("utf-8")).hexdigest(), 16) % dim
-                    vec[idx] += 1.0
-                norm = math.sqrt(sum(v * v for v in vec)) or 1.0
-                vectors.append([v / norm for v in vec])
-            return vectors
 
+_MODEL: Any = None
+_MODEL_ID: str | None = None
+_EMBED_ROOT: Path | None = None
+_EMBED_STORE: EmbeddingStore | None = None
 
-_MODEL: _STModel | None = None
 
+def _get_model() -> Any:
+    """Return the embedding model, importing sentence-transformers on first use.
 
-def _get_model() -> _STModel:
-    global _MODEL
+    The import pulls in torch, so it is deferred until clustering actually
+    needs embeddings rather than paid whenever this module is imported.
+    """
+    global _MODEL, _MODEL_ID
     if _MODEL is None:
-        _MODEL = _STModel()
+        try:  # pragma: no cover - optional dependency
+            from sentence_transformers import SentenceTransformer  # type: ignore
+        except Exception:  # pragma: no cover - fallback used in tests
+            _MODEL, _MODEL_ID = _HashEmbeddingModel(), _HashEmbeddingModel.MODEL_ID
+        else:  # pragma: no cover
+            _MODEL, _MODEL_ID = SentenceTransformer(EMBED_MODEL), EMBED_MODEL
     return _MODEL
 
 
+def embedding_namespace() -> str:
+    """Return the cache namespace for the active embedding model."""
+    _get_model()
+    return f"{_MODEL_ID}-v{EMBED_MODEL_VERSION}"
+
+
+def embedding_root(store_path: Path) -> Path:
+    """Return the embedding cache directory kept next to the item store."""
+    return store_path.with_name(store_path.name + ".embeddings")
+
+
+def set_embedding_store(root: Path | None) -> None:
+    """Cache embeddings under *root* (``None`` disables the cache).
+
+    The store is opened on the first embedding request, so enabling it does
+    not load the embedding model.
+    """
+    global _EMBED_ROOT, _EMBED_STORE
+    if _EMBED_STORE is not None:
+        _EMBED_STORE.close()
+    _EMBED_ROOT, _EMBED_STORE = root, None
+
+
+def _embedding_store() -> EmbeddingStore | None:
+    global _EMBED_STORE
+    if _EMBED_STORE is None and _EMBED_ROOT is not None:
+        _EMBED_STORE = EmbeddingStore(_EMBED_ROOT, embedding_namespace())
+    return _EMBED_STORE
+
+
+def compact_embeddings(root: Path, keep: Container[str]) -> int:
+    """Drop cached vectors of items not in *keep* from every model under *root*.
+
+    Returns the number of rows removed. *keep* only needs membership tests,
+    e.g. a :class:`~signalai.io.hashindex.HashIndex` of the store.
+    """
+    removed = 0
+    for index in sorted(root.glob("*/index.json")):
+        with open(index, "r", encoding="utf-8") as f:
+            model_name = json.load(f)["model"]
+        store = EmbeddingStore(root, model_name)
+        removed += store.compact(keep)
+        store.close()
+    return removed
+
+
 def _embed_items(items: List[Item]) -> List[List[float]]:
-    model = _get_model()
     texts = [f"{it.title} {it.summary}" for it in items]
-    return model.encode(texts)
+    store = _embedding_store()
+    if store is None:
+        return _get_model().encode(texts)
+
+    # Only encode items without a cached vector; fresh vectors are read back
+    # from the store so cached and uncached runs see identical float32 values.
+    hashes = [it.hash for it in items]
+    vectors = store.get(hashes)
+    missing = [i for i, vec in enumerate(vectors) if vec is None]
+    if missing:
+        fresh = _get_model().encode([texts[i] for i in missing])
+        store.add([hashes[i] for i in missing], fresh)
+        stored = store.get([hashes[i] for i in missing])
+        for i, vec, cached in zip(missing, fresh, stored):
+            vectors[i] = cached if cached is not None else list(vec)
+    return vectors
 
 
 # ---------------------------------------------------------------------------
@@ -127,17 +213,111 @@ def _silhouette(vecs: List[List[float]], labels: List[int], k: int) -> float:
     return sum(scores) / len(scores)
 
 
+# ---------------------------------------------------------------------------
+# Vectorized variants (used when NumPy is installed)
+# ---------------------------------------------------------------------------
+
+# Above this many points the silhouette is estimated on a random sample.
+SILHOUETTE_SAMPLE_SIZE = 1000
+
+
+def _center_distances(X, centers):
+    """Return the ``(n, k)`` Euclidean distances from each row of *X* to each center."""
+    D = np.empty((X.shape[0], centers.shape[0]))
+    for j, center in enumerate(centers):
+        D[:, j] = np.sqrt(((X - center) ** 2).sum(axis=1))
+    return D
+
+
+def _kmeans_np(X, k: int, max_iter: int = 10) -> List[int]:
+    """Vectorized :func:`_kmeans`; consumes the same random stream so labels match."""
+    random.seed(0)
+    n = X.shape[0]
+    chosen = [0]
+    min_d2 = _center_distances(X, X[:1])[:, 0] ** 2
+    while len(chosen) < k:
+        cumulative = np.cumsum(min_d2)
+        r = random.random() * cumulative[-1]
+        pick = int(np.searchsorted(cumulative, r, side="left"))
+        if pick >= n:
+            continue
+        chosen.append(pick)
+        min_d2 = np.minimum(min_d2, _center_distances(X, X[pick : pick + 1])[:, 0] ** 2)
+
+    centers = X[chosen].copy()
+    labels = np.zeros(n, dtype=int)
+    for _ in range(max_iter):
+        new_labels = _center_distances(X, centers).argmin(axis=1)
+        changed = bool((new_labels != labels).any())
+        labels = new_labels
+        for j in range(k):
+            members = labels == j
+            if members.any():
+                centers[j] = X[members].mean(axis=0)
+        if not changed:
+            break
+    return labels.tolist()
+
+
+def _silhouette_np(
+    X, labels: List[int], k: int, sample_size: int = SILHOUETTE_SAMPLE_SIZE
+) -> float:
+    """Vectorized :func:`_silhouette`, sampled when there are more than *sample_size* points."""
+    n = X.shape[0]
+    if k <= 1 or n <= 1:
+        return 0.0
+    lbl = np.asarray(labels)
+    rows = np.arange(n)
+    if n > sample_size:
+        rows = np.sort(np.random.default_rng(0).choice(n, sample_size, replace=False))
+
+    onehot = np.zeros((n, k))
+    onehot[np.arange(n), lbl] = 1.0
+    counts = onehot.sum(axis=0)
+
+    # Distances from the sampled rows to every point, in chunks to bound memory.
+    chunk = max(1, 2**22 // max(1, n * X.shape[1]))
+    sums = np.empty((len(rows), k))
+    for start in range(0, len(rows), chunk):
+        block = X[rows[start : start + chunk]]
+        D = np.sqrt(((block[:, None, :] - X[None, :, :]) ** 2).sum(axis=2))
+        sums[start : start + chunk] = D @ onehot
+
+    own = lbl[rows]
+    own_count = counts[own] - 1
+    a = np.where(own_count > 0, sums[np.arange(len(rows)), own] / np.maximum(own_count, 1), 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = sums / counts
+    means[:, counts == 0] = np.inf
+    means[np.arange(len(rows)), own] = np.inf
+    b = means.min(axis=1)
+    b[np.isinf(b)] = 0.0
+    max_ab = np.maximum(a, b)
+    scores = np.where(max_ab > 0, (b - a) / np.where(max_ab > 0, max_ab, 1.0), 0.0)
+    return float(scores.mean())
+
+
 def cluster(items: List[Item], k_min: int = 2, k_max: int = 5) -> Dict[str, List[Item]]:
-    """Group items by semantic similarity and return labelled clusters."""
+    """Group items by semantic similarity and return labelled clusters.
+
+    Uses the vectorized k-means and silhouette when NumPy is available and the
+    pure-Python versions otherwise; both give the same labels for a given input.
+    """
 
     vecs = _embed_items(items)
-    if not vecs:
+    if len(vecs) == 0:
         return {}
 
+    if np is not None:
+        vecs = np.asarray(vecs, dtype=float)
+        kmeans, silhouette = _kmeans_np, _silhouette_np
+    else:
+        kmeans, silhouette = _kmeans, _silhouette
+
     best_k, best_score, best_labels = 1, -1.0, [0] * len(vecs)
     for k in range(k_min, min(k_max, len(vecs)) + 1):
-        labels = _kmeans(vecs, k)
-        score = _silhouette(vecs, labels, k)
+        labels = kmeans(vecs, k)
+        score = silhouette(vecs, labels, k)
         if score > best_score:
             best_k, best_score, best_labels = k, score, labels
 
@@ -178,24 +358,10 @@ def refresh_themes(items: List[Item], interval_hours: int = 24) -> Dict[str, Lis
 # ---------------------------------------------------------------------------
 
 
-THEME_KEYWORDS = {
-    "Agents & Orchestration": ["agent", "orchestr"],
-    "Model Efficiency (Pruning/Distill/Latency)": [
-        "pruning",
-        "distill",
-        "latency",
-        "throughput",
-    ],
-    "Evaluation & QA": ["evaluation", "eval", "benchmark"],
-    "Multimodal & VLM": ["multimodal", "vision", "vlm", "image"],
-    "Safety & Alignment": ["safety", "alignment", "rlhf", "dpo"],
-}
-
-
 def detect(items: List[Item]) -> Dict[str, bool]:
-    text_join = lambda it: (it.title + " " + it.summary).lower()
-    cat = lambda keys: any(any(k in text_join(it) for k in keys) for it in items)
-
-    themes = {name: cat(keywords) for name, keywords in THEME_KEYWORDS.items()}
-    return themes
+    """Return, for each theme, whether any item mentions one of its keywords."""
+    hits = set()
+    for it in items:
+        hits.update(ensure_norm(it).keyword_hits)
+    return {name: any(k in hits for k in keywords) for name, keywords in THEME_KEYWORDS.items()}
 
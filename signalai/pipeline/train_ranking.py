@@ -1,40 +1,118 @@
+"""Train the logistic ranking model from the ranker event log.
+
+``python -m signalai.pipeline.train_ranking`` streams the log in chunks and
+fits the weights with mini-batch SGD (NumPy), falling back to the original
+full-batch pure-Python trainer when NumPy is not installed. Either way the
+model is written as a versioned artifact recording its feature schema.
+
+``--online`` instead updates the current weights from only the events logged
+since the previous update; the log cursor is stored in the artifact itself so
+the weights and the cursor are swapped in together.
+"""
+
 from __future__ import annotations
 
-import csv
+import argparse
+import datetime
 import math
+import os
 import pickle
+import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from signalai.io import eventlog
+from signalai.logging import get_logger
+from signalai.pipeline.ranker import MODEL_FEATURES
 
-LOG_PATH = Path(__file__).resolve().parents[2] / "out" / "ranker_log.csv"
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover
+    np = None  # type: ignore
+
+try:  # pragma: no cover - not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore
+
+logger = get_logger(__name__)
+
+LOG_PATH = Path(__file__).resolve().parents[2] / "out" / "ranker_log"
 MODEL_PATH = Path(__file__).resolve().parents[2] / "out" / "ranker_model.pkl"
 
+# Logged feature columns, in weight order after the leading intercept.
+FEATURES = MODEL_FEATURES[1:]
+MODEL_VERSION = 1
+POSITIVE_EVENTS = {"open", "click"}
+
 
-def load_training_data() -> Tuple[List[List[float]], List[float]]:
+def _rows(block: Dict[str, Any]) -> Iterator[Tuple[List[float], float]]:
+    """Yield ``(features, label)`` per row of *block*; missing features count as 0."""
+    columns = [block[name] for name in FEATURES]
+    for *values, event in zip(*columns, block["event"]):
+        x = [1.0] + [0.0 if math.isnan(v) else v for v in map(float, values)]  # 1.0: intercept
+        yield x, 1.0 if event in POSITIVE_EVENTS else 0.0
+
+
+def _load_rows(
+    start: Optional[datetime.date] = None, end: Optional[datetime.date] = None
+) -> Tuple[List[List[float]], List[float], Optional[Dict[str, Any]]]:
     X: List[List[float]] = []
     y: List[float] = []
+    eventlog.flush(LOG_PATH)
     if not LOG_PATH.exists():
         raise FileNotFoundError(f"No log file found at {LOG_PATH}")
-    with LOG_PATH.open() as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            features = [
-                1.0,  # intercept
-                float(row["novelty"]),
-                float(row["authority"]),
-                float(row["keyword_hits"]),
-                float(row["engagement"]),
-            ]
-            label = 1.0 if row.get("event") in {"open", "click"} else 0.0
-            X.append(features)
+    cursor = None
+    for block, cursor in _blocks(start, end):
+        for x, label in _rows(block):
+            X.append(x)
             y.append(label)
     if not X:
         raise ValueError("No data available for training")
+    return X, y, cursor
+
+
+def load_training_data(
+    start: Optional[datetime.date] = None, end: Optional[datetime.date] = None
+) -> Tuple[List[List[float]], List[float]]:
+    """Load feature rows and click labels, limited to days *start*..*end* when given."""
+    X, y, _ = _load_rows(start, end)
     return X, y
 
 
+def save_model(weights: List[float], path: Optional[Path] = None, **metadata: Any) -> Path:
+    """Atomically write a versioned model artifact for *weights*."""
+    path = path or MODEL_PATH
+    artifact = {
+        "version": MODEL_VERSION,
+        "features": MODEL_FEATURES,
+        "weights": [float(w) for w in weights],
+        "trained_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        **metadata,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as fh:
+        pickle.dump(artifact, fh)
+    os.replace(tmp, path)
+    return path
+
+
+def load_model(path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Return the model artifact at *path*, upgrading bare weight lists."""
+    path = path or MODEL_PATH
+    if not path.exists():
+        return None
+    with path.open("rb") as fh:
+        model = pickle.load(fh)
+    if not isinstance(model, dict):
+        model = {"version": 0, "features": MODEL_FEATURES, "weights": list(model)}
+    return model
+
+
 def train_model(epochs: int = 500, lr: float = 0.1) -> Path:
-    X, y = load_training_data()
+    """Full-batch gradient descent over the whole log in pure Python."""
+    X, y, cursor = _load_rows()
     n_features = len(X[0])
     weights = [0.0] * n_features
     m = len(X)
@@ -47,11 +125,304 @@ def train_model(epochs: int = 500, lr: float = 0.1) -> Path:
                 grads[j] += (pred - yi) * xi[j]
         for j in range(n_features):
             weights[j] -= lr * grads[j] / m
-    MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with MODEL_PATH.open("wb") as fh:
-        pickle.dump(weights, fh)
-    return MODEL_PATH
+    return save_model(weights, rows=m, trainer="batch", class_weights=[1.0, 1.0], cursor=cursor)
+
+
+# ---------------------------------------------------------------------------
+# Streaming mini-batch trainer (NumPy)
+# ---------------------------------------------------------------------------
+
+
+def _blocks(
+    start: Optional[datetime.date] = None, end: Optional[datetime.date] = None
+) -> Iterator[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+    """Yield ``(block, cursor)`` pairs; the cursor is ``None`` for a day range."""
+    columns = FEATURES + ["event"]
+    if start is None and end is None:
+        yield from eventlog.read_tail(LOG_PATH, columns, numeric=FEATURES)
+        return
+    for block in eventlog.read_columns(LOG_PATH, columns, start, end, numeric=FEATURES):
+        yield block, None
+
+
+def _arrays(block: Dict[str, Any]) -> Tuple["np.ndarray", "np.ndarray"]:
+    n = len(block["event"])
+    X = np.ones((n, len(MODEL_FEATURES)))
+    for j, name in enumerate(FEATURES, start=1):
+        X[:, j] = np.asarray(block[name], dtype=float)
+    y = np.fromiter((e in POSITIVE_EVENTS for e in block["event"]), dtype=float, count=n)
+    return np.nan_to_num(X), y
+
+
+def iter_chunks(
+    chunk_rows: int = 65536,
+    start: Optional[datetime.date] = None,
+    end: Optional[datetime.date] = None,
+) -> Iterator[Tuple["np.ndarray", "np.ndarray"]]:
+    """Yield ``(X, y)`` arrays of at most *chunk_rows* rows streamed from the log.
+
+    ``X`` has the intercept column first, matching :data:`MODEL_FEATURES`.
+    """
+    for block, _ in _blocks(start, end):
+        X, y = _arrays(block)
+        for lo in range(0, len(y), chunk_rows):
+            yield X[lo : lo + chunk_rows], y[lo : lo + chunk_rows]
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30.0, 30.0)))
+
+
+def _log_loss(w, X, y, sw) -> float:
+    p = np.clip(_sigmoid(X @ w), 1e-12, 1 - 1e-12)
+    return float(-(sw * (y * np.log(p) + (1 - y) * np.log(1 - p))).sum() / sw.sum())
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:  # pragma: no cover
+        return None
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def train_sgd(
+    epochs: int = 20,
+    lr: float = 0.1,
+    batch_size: int = 1024,
+    holdout: float = 0.1,
+    patience: int = 3,
+    class_weight: Optional[str] = "balanced",
+    chunk_rows: int = 65536,
+    seed: int = 0,
+    start: Optional[datetime.date] = None,
+    end: Optional[datetime.date] = None,
+) -> Dict[str, Any]:
+    """Fit the weights with mini-batch SGD while streaming the log.
+
+    Every ``round(1 / holdout)``-th row is held out for validation; training
+    stops after *patience* epochs without a lower validation loss and keeps
+    the best weights. With ``class_weight="balanced"`` clicks and impressions
+    contribute equally to the loss however rare clicks are. Only the held-out
+    rows and one chunk are kept in memory.
+
+    Returns a report with the artifact path, rows seen, validation loss,
+    training throughput (rows/s) and peak resident memory (MB).
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required for train_sgd; use train_model instead")
+    eventlog.flush(LOG_PATH)
+    if not LOG_PATH.exists():
+        raise FileNotFoundError(f"No log file found at {LOG_PATH}")
+
+    stride = max(2, round(1 / holdout)) if holdout else 0
+
+    def split(X, y, offset):
+        mask = (np.arange(offset, offset + len(y)) % stride == 0) if stride else np.zeros(len(y), bool)
+        return (X[~mask], y[~mask]), (X[mask], y[mask])
+
+    # First pass: class counts, the held-out split and, for the whole log, the
+    # cursor that online updates resume from.
+    counts = np.zeros(2)
+    val_X, val_y = [], []
+    rows = 0
+    cursor = None
+    for block, cursor in _blocks(start, end):
+        X, y = _arrays(block)
+        (tr_X, tr_y), (va_X, va_y) = split(X, y, rows)
+        rows += len(y)
+        counts += [len(tr_y) - tr_y.sum(), tr_y.sum()]
+        val_X.append(va_X)
+        val_y.append(va_y)
+    if not rows:
+        raise ValueError("No data available for training")
+
+    if class_weight == "balanced" and counts.all():
+        cw = counts.sum() / (2.0 * counts)
+    else:
+        cw = np.ones(2)
+    val_X = np.concatenate(val_X) if val_X else np.empty((0, len(MODEL_FEATURES)))
+    val_y = np.concatenate(val_y) if val_y else np.empty(0)
+    val_sw = cw[val_y.astype(int)]
+
+    rng = np.random.default_rng(seed)
+    w = np.zeros(len(MODEL_FEATURES))
+    best_w, best_loss, stale = w.copy(), math.inf, 0
+    trained_rows = 0
+    began = time.perf_counter()
+    epoch = 0
+    for epoch in range(1, epochs + 1):
+        offset = 0
+        for X, y in iter_chunks(chunk_rows, start, end):
+            # Rows logged after the first pass lie beyond the saved cursor
+            # and are left to the next online update.
+            if offset >= rows:
+                break
+            X, y = X[: rows - offset], y[: rows - offset]
+            (tr_X, tr_y), _ = split(X, y, offset)
+            offset += len(y)
+            order = rng.permutation(len(tr_y))
+            for lo in range(0, len(order), batch_size):
+                idx = order[lo : lo + batch_size]
+                Xb, yb = tr_X[idx], tr_y[idx]
+                sw = cw[yb.astype(int)]
+                grad = Xb.T @ (sw * (_sigmoid(Xb @ w) - yb)) / sw.sum()
+                w -= lr * grad
+            trained_rows += len(tr_y)
+        if not len(val_y):
+            best_w = w.copy()
+            continue
+        loss = _log_loss(w, val_X, val_y, val_sw)
+        if loss < best_loss - 1e-6:
+            best_w, best_loss, stale = w.copy(), loss, 0
+        else:
+            stale += 1
+            if stale >= patience:
+                break
+    elapsed = time.perf_counter() - began
+
+    report: Dict[str, Any] = {
+        "rows": rows,
+        "epochs": epoch,
+        "val_loss": None if math.isinf(best_loss) else best_loss,
+        "rows_per_s": trained_rows / elapsed if elapsed > 0 else float("inf"),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    report["path"] = save_model(
+        best_w.tolist(),
+        trainer="sgd",
+        class_weights=cw.tolist(),
+        cursor=cursor,
+        **{k: v for k, v in report.items() if k not in ("rows_per_s", "peak_rss_mb")},
+    )
+    logger.info(
+        "Trained ranker on %d rows in %d epochs: val_loss=%s, %.0f rows/s, peak RSS %s MB",
+        rows,
+        epoch,
+        "n/a" if report["val_loss"] is None else f"{report['val_loss']:.4f}",
+        report["rows_per_s"],
+        "n/a" if report["peak_rss_mb"] is None else f"{report['peak_rss_mb']:.0f}",
+    )
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Online updates
+# ---------------------------------------------------------------------------
+
+
+def update_online(lr: float = 0.05, batch_size: int = 256, replay: bool = False) -> Dict[str, Any]:
+    """Apply SGD steps to the current weights for events logged since the last update.
+
+    Events are read from the cursor stored in the model artifact, in log
+    order, with the class weights the model was trained with. The new weights
+    and cursor replace the artifact atomically, so a running ranker picks them
+    up on its next :func:`~signalai.pipeline.ranker._load_model` call. Nothing
+    is written when no new events were logged. Without a model the update
+    starts from zero weights at the beginning of the log.
+
+    A model without a cursor (legacy weight lists, or one trained on a date
+    range) was fit on an unknown part of the log, so replaying it from the
+    start would count those events twice; that raises ``ValueError`` unless
+    *replay* is set.
+    """
+    model = load_model()
+    if model is None:
+        model = {"weights": [0.0] * len(MODEL_FEATURES)}
+    elif model.get("cursor") is None and not replay:
+        raise ValueError(
+            "The ranker model has no log cursor; retrain it on the whole log, "
+            "or pass replay=True (--replay) to apply the whole log on top of it"
+        )
+    if model.get("features", MODEL_FEATURES) != MODEL_FEATURES:
+        raise ValueError(f"Cannot update model with feature schema {model['features']}")
+    weights = [float(w) for w in model["weights"]]
+    cw = model.get("class_weights") or [1.0, 1.0]
+    cursor = model.get("cursor")
+
+    rows = 0
+    for block, cursor in eventlog.read_tail(LOG_PATH, FEATURES + ["event"], cursor, numeric=FEATURES):
+        batch: List[Tuple[List[float], float]] = []
+        for row in _rows(block):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                _sgd_step(weights, batch, cw, lr)
+                batch = []
+        if batch:
+            _sgd_step(weights, batch, cw, lr)
+        rows += len(block["event"])
+
+    report: Dict[str, Any] = {"rows": rows, "path": None}
+    if rows:
+        report["path"] = save_model(
+            weights,
+            trainer="online",
+            class_weights=cw,
+            cursor=cursor,
+            rows=model.get("rows", 0) + rows,
+        )
+        logger.info("Updated ranker weights from %d new events", rows)
+    return report
+
+
+def _sgd_step(
+    weights: List[float], batch: List[Tuple[List[float], float]], cw: List[float], lr: float
+) -> None:
+    grads = [0.0] * len(weights)
+    total = 0.0
+    for x, y in batch:
+        z = max(-30.0, min(30.0, sum(w * v for w, v in zip(weights, x))))
+        sw = cw[int(y)]
+        err = sw * (1.0 / (1.0 + math.exp(-z)) - y)
+        for j, v in enumerate(x):
+            grads[j] += err * v
+        total += sw
+    for j in range(len(weights)):
+        weights[j] -= lr * grads[j] / total
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Train the ranking model from the ranker log")
+    ap.add_argument("--epochs", type=int, default=None)
+    ap.add_argument("--lr", type=float, default=None)
+    ap.add_argument("--batch-size", type=int, default=None)
+    ap.add_argument("--holdout", type=float, default=0.1, help="Fraction of rows held out for early stopping")
+    ap.add_argument("--patience", type=int, default=3)
+    ap.add_argument("--no-class-weight", action="store_true", help="Do not reweight rare clicks")
+    ap.add_argument("--full-batch", action="store_true", help="Use the pure-Python full-batch trainer")
+    ap.add_argument("--online", action="store_true", help="Update the current weights from new events only")
+    ap.add_argument("--interval", type=float, default=None, help="With --online, keep updating every N seconds")
+    ap.add_argument("--replay", action="store_true", help="With --online, apply the whole log to a model without a log cursor")
+    args = ap.parse_args(argv)
+
+    if args.online:
+        while True:
+            try:
+                report = update_online(lr=args.lr or 0.05, batch_size=args.batch_size or 256, replay=args.replay)
+            except ValueError as e:
+                raise SystemExit(str(e))
+            print(f"Applied {report['rows']} new events" + (f" to {report['path']}" if report["path"] else ""))
+            if args.interval is None:
+                return
+            time.sleep(args.interval)
+
+    if args.full_batch or np is None:
+        print(f"Wrote {train_model(epochs=args.epochs or 500, lr=args.lr or 0.1)}")
+        return
+    report = train_sgd(
+        epochs=args.epochs or 20,
+        lr=args.lr or 0.1,
+        batch_size=args.batch_size or 1024,
+        holdout=args.holdout,
+        patience=args.patience,
+        class_weight=None if args.no_class_weight else "balanced",
+    )
+    peak = report["peak_rss_mb"]
+    print(
+        f"Wrote {report['path']}: {report['rows']} rows, {report['epochs']} epochs, "
+        f"{report['rows_per_s']:.0f} rows/s, peak memory "
+        + ("n/a" if peak is None else f"{peak:.0f} MB")
+    )
 
 
 if __name__ == "__main__":
-    train_model()
+    main()
@@ -3,3 +3,16 @@ BOOST_TERMS = [
     "safety", "inference", "latency", "throughput", "tokenization",
     "memory", "orchestration", "pruning", "distillation", "long context"
 ]
+
+THEME_KEYWORDS = {
+    "Agents & Orchestration": ["agent", "orchestr"],
+    "Model Efficiency (Pruning/Distill/Latency)": [
+        "pruning",
+        "distill",
+        "latency",
+        "throughput",
+    ],
+    "Evaluation & QA": ["evaluation", "eval", "benchmark"],
+    "Multimodal & VLM": ["multimodal", "vision", "vlm", "image"],
+    "Safety & Alignment": ["safety", "alignment", "rlhf", "dpo"],
+}
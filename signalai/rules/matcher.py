@@ -0,0 +1,74 @@
+"""Multi-pattern keyword matching shared by ranking and theme detection.
+
+:data:`KEYWORDS` is compiled once from ``BOOST_TERMS`` and every
+``THEME_KEYWORDS`` entry; each text is lowercased and scanned a single time
+and the hit set answers both the ranking and the theme questions.
+"""
+
+from __future__ import annotations
+
+from typing import FrozenSet, Iterable
+
+from signalai.rules.keywords import BOOST_TERMS, THEME_KEYWORDS
+
+try:  # pragma: no cover - optional dependency
+    import ahocorasick  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover - substring fallback below
+    ahocorasick = None  # type: ignore
+
+__all__ = ["KeywordMatcher", "KEYWORDS", "keyword_hits"]
+
+
+class KeywordMatcher:
+    """Find every pattern that occurs (as a substring) in a text.
+
+    Patterns are lowercased and deduplicated when the matcher is built. With
+    ``pyahocorasick`` installed (it is in ``requirements.txt``) they are
+    compiled into an Aho-Corasick automaton that scans the text once
+    regardless of the number of patterns. Without it, patterns are tested
+    with ``str``'s substring search, and a pattern containing another one
+    (``agents`` contains ``agent``) is only tested when the shorter one
+    matched.
+    """
+
+    def __init__(self, patterns: Iterable[str], *, automaton: bool | None = None) -> None:
+        self.patterns = tuple(dict.fromkeys(p.lower() for p in patterns if p))
+        # Substring fallback: test the patterns that contain no other pattern,
+        # then the longer patterns built on the ones that matched.
+        contains = {p: [q for q in self.patterns if q != p and q in p] for p in self.patterns}
+        self._roots = tuple(p for p in self.patterns if not contains[p])
+        self._extensions = {
+            p: tuple(q for q in self.patterns if p in contains[q]) for p in self.patterns
+        }
+        if automaton is None:
+            automaton = ahocorasick is not None
+        self._automaton = None
+        if automaton:
+            if ahocorasick is None:
+                raise RuntimeError("pyahocorasick is required for automaton matching")
+            self._automaton = ahocorasick.Automaton()
+            for pattern in self.patterns:
+                self._automaton.add_word(pattern, pattern)
+            self._automaton.make_automaton()
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Return the patterns occurring in *text* (matched case-insensitively)."""
+        text = text.lower()
+        if self._automaton is not None:
+            return frozenset(pattern for _, pattern in self._automaton.iter(text))
+        hits = list(filter(text.__contains__, self._roots))
+        for pattern in hits:
+            for longer in self._extensions[pattern]:
+                if longer not in hits and longer in text:
+                    hits.append(longer)
+        return frozenset(hits)
+
+
+KEYWORDS = KeywordMatcher(
+    [*BOOST_TERMS, *(kw for keywords in THEME_KEYWORDS.values() for kw in keywords)]
+)
+
+
+def keyword_hits(text: str) -> FrozenSet[str]:
+    """Return the :data:`KEYWORDS` patterns occurring in *text*."""
+    return KEYWORDS.find(text)
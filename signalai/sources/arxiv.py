@@ -1,15 +1,7 @@
 import asyncio
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 from urllib.parse import parse_qs, urlparse, quote_plus
 
-import requests
-
-# feedparser is optional; import lazily so tests can run without it
-try:  # pragma: no cover - dependency may be missing in tests
-    import feedparser
-except ModuleNotFoundError:  # pragma: no cover
-    feedparser = None  # type: ignore
-
 try:  # pragma: no cover
     from modelcontextprotocol import call_tool  # type: ignore
 except Exception:  # pragma: no cover
@@ -18,15 +10,16 @@ except Exception:  # pragma: no cover
 from signalai.models import Item
 
 from . import register
-from .base import Source
-from .utils import create_item
+from .base import NOT_MODIFIED, Source
+from .utils import create_item, load_feedparser
 
 
 @register
 class ArxivSource(Source):
     NAME = "arxiv"
 
-    def fetch(self, feed_cfg: Dict[str, Any]) -> Any:
+    @staticmethod
+    def _query(feed_cfg: Dict[str, Any]) -> Tuple[str, int]:
         raw_url = feed_cfg.get("url", "")
         parsed_url = urlparse(raw_url)
         query = raw_url
@@ -35,22 +28,33 @@ class ArxivSource(Source):
             params = parse_qs(parsed_url.query)
             query = params.get("search_query", [query])[0]
             max_results = int(params.get("max_results", [max_results])[0])
+        return query, max_results
+
+    async def _call_mcp(self, feed_cfg: Dict[str, Any]) -> Any:
+        query, max_results = self._query(feed_cfg)
+        return await call_tool(
+            "search_papers",
+            {"query": query, "max_results": max_results},
+        )
 
+    async def afetch(self, feed_cfg: Dict[str, Any]) -> Any:
         if call_tool:
-            async def _fetch() -> Any:
-                return await call_tool(
-                    "search_papers",
-                    {"query": query, "max_results": max_results},
-                )
+            return await self._call_mcp(feed_cfg)
+        return await super().afetch(feed_cfg)
 
-            return asyncio.run(_fetch())
+    def fetch(self, feed_cfg: Dict[str, Any]) -> Any:
+        if call_tool:
+            return asyncio.run(self._call_mcp(feed_cfg))
 
+        query, max_results = self._query(feed_cfg)
         api_url = (
             "http://export.arxiv.org/api/query?search_query="
             f"{quote_plus(query)}&max_results={max_results}"
         )
-        response = requests.get(api_url, timeout=10)
-        response.raise_for_status()
+        response = self.http_get(api_url, timeout=10)
+        if response is None:
+            return NOT_MODIFIED
+        feedparser = load_feedparser()
         if feedparser is None:
             raise RuntimeError(
                 "feedparser is required to fetch arXiv feeds."
@@ -73,7 +77,10 @@ class ArxivSource(Source):
                 )
 
         items: List[Item] = []
-        for paper in papers:
+        new_papers = self.iter_new(
+            papers, feed_cfg, lambda p: p.get("link", ""), lambda p: p.get("published")
+        )
+        for paper in new_papers:
             items.append(
                 create_item(
                     title=paper.get("title", ""),
@@ -1,26 +1,131 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
 
+from requests import Response
+
+from signalai.io import http
+from signalai.io.feed_cache import FeedCache
+from signalai.io.helpers import canonicalize_url, sha1_of
 from signalai.models import Item
 
+from .utils import parse_published
+
+
+class _NotModified:
+    """Sentinel returned by :meth:`Source.fetch` when a feed is unchanged."""
+
+    def __repr__(self) -> str:
+        return "NOT_MODIFIED"
+
+
+NOT_MODIFIED = _NotModified()
+
+
+def _published_at(value: Optional[str]) -> Optional[datetime]:
+    """Parse an entry's published date, or return ``None`` if it has none."""
+    if not value:
+        return None
+    try:
+        return parse_published(value)
+    except (ValueError, OverflowError):
+        return None
+
 
 class Source(ABC):
     """Interface for feed sources."""
 
     NAME: str = ""
 
+    #: Whether entries arrive newest first, so parsing can stop at the first
+    #: one behind the feed's watermark. Feeds override it with an ``ordered``
+    #: config key.
+    ORDERED: bool = False
+
+    #: Conditional GET cache attached by the ingest pipeline for the run.
+    feed_cache: Optional[FeedCache] = None
+
     @abstractmethod
     def fetch(self, feed_cfg: Dict[str, Any]) -> Any:
-        """Fetch raw data for a feed."""
+        """Fetch raw data for a feed.
+
+        Implementations may return :data:`NOT_MODIFIED` when the feed has not
+        changed since the last run; parsing and deduplication are then skipped.
+        """
         raise NotImplementedError
 
+    async def afetch(self, feed_cfg: Dict[str, Any]) -> Any:
+        """Fetch raw data for a feed from within an event loop.
+
+        The default adapter runs the blocking :meth:`fetch` in a worker thread.
+        Sources with a native async transport override it.
+        """
+        return await asyncio.to_thread(self.fetch, feed_cfg)
+
     @abstractmethod
     def parse(self, raw: Any, feed_cfg: Dict[str, Any]) -> List[Item]:
         """Parse raw data into a list of :class:`Item`."""
         raise NotImplementedError
 
+    def iter_new(
+        self,
+        entries: Sequence[Any],
+        feed_cfg: Dict[str, Any],
+        url_of: Callable[[Any], str],
+        published_of: Optional[Callable[[Any], Optional[str]]] = None,
+    ) -> Iterator[Any]:
+        """Yield the *entries* that have not been ingested before.
+
+        An entry is known when the hash of its canonical URL (``url_of(entry)``)
+        is in the store or the feed's watermark, so :meth:`parse` never builds
+        an :class:`Item` for it. In ordered feeds the scan ends at the first
+        entry from the feed's own watermark whose timestamp
+        (``published_of(entry)``, when given) is not newer than the
+        watermark's, as everything after it is older. Without a
+        :class:`FeedCache` every entry is yielded.
+        """
+        cache = self.feed_cache
+        if cache is None:
+            yield from entries
+            return
+        ordered = feed_cfg.get("ordered", self.ORDERED)
+        skipped, stopped = 0, False
+        for pos, entry in enumerate(entries):
+            item_hash = sha1_of(canonicalize_url(url_of(entry) or ""))
+            if cache.is_known(feed_cfg, item_hash):
+                published = _published_at(published_of(entry)) if published_of else None
+                if ordered and cache.is_behind(feed_cfg, item_hash, published):
+                    skipped, stopped = skipped + len(entries) - pos, True
+                    break
+                skipped += 1
+                continue
+            yield entry
+        cache.record_skipped(skipped, stopped)
+
+    def commit_fetch(self) -> None:
+        """Commit the cache validators of every URL fetched by :meth:`http_get`.
+
+        Called by the ingest pipeline once :meth:`parse` succeeded, so a body
+        that failed to parse is fetched in full again next run.
+        """
+        if self.feed_cache is None:
+            return
+        for url in self.__dict__.pop("_fetched_urls", ()):
+            self.feed_cache.commit(url)
+
     def dedupe(self, items: List[Item]) -> List[Item]:
         """Optionally deduplicate items."""
         return items
+
+    def http_get(self, url: str, **kwargs: Any) -> Optional[Response]:
+        """``GET`` *url*, conditionally when a :class:`FeedCache` is attached.
+
+        Returns ``None`` when the cache reports the feed as unchanged.
+        """
+        if self.feed_cache is None:
+            return http.get(url, **kwargs)
+        self.__dict__.setdefault("_fetched_urls", []).append(url)
+        return self.feed_cache.get(url, **kwargs)
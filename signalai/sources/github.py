@@ -1,9 +1,7 @@
 import asyncio
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 from urllib.parse import urlparse
 
-import requests
-
 try:  # pragma: no cover
     from modelcontextprotocol import call_tool  # type: ignore
 except Exception:  # pragma: no cover
@@ -12,35 +10,49 @@ except Exception:  # pragma: no cover
 from signalai.models import Item
 
 from . import register
-from .base import Source
+from .base import NOT_MODIFIED, Source
 from .utils import create_item
 
 
 @register
 class GitHubSource(Source):
     NAME = "github_releases"
+    # The releases API lists the newest release first.
+    ORDERED = True
 
-    def fetch(self, feed_cfg: Dict[str, Any]) -> Any:
+    @staticmethod
+    def _owner_repo(feed_cfg: Dict[str, Any]) -> Tuple[str, str]:
         url = feed_cfg["url"]
         if "://" in url:
             path = urlparse(url).path.strip("/")
         else:
             path = url.strip("/")
         owner, repo, *_ = path.split("/")
+        return owner, repo
+
+    async def _call_mcp(self, feed_cfg: Dict[str, Any]) -> Any:
+        owner, repo = self._owner_repo(feed_cfg)
+        return await call_tool(
+            "list_releases", {"owner": owner, "repo": repo, "limit": 10}
+        )
+
+    async def afetch(self, feed_cfg: Dict[str, Any]) -> Any:
         if call_tool:
-            async def _fetch() -> Any:
-                return await call_tool(
-                    "list_releases", {"owner": owner, "repo": repo, "limit": 10}
-                )
+            return await self._call_mcp(feed_cfg)
+        return await super().afetch(feed_cfg)
 
-            return asyncio.run(_fetch())
+    def fetch(self, feed_cfg: Dict[str, Any]) -> Any:
+        if call_tool:
+            return asyncio.run(self._call_mcp(feed_cfg))
 
-        response = requests.get(
+        owner, repo = self._owner_repo(feed_cfg)
+        response = self.http_get(
             f"https://api.github.com/repos/{owner}/{repo}/releases?per_page=10",
             timeout=10,
             headers={"Accept": "application/vnd.github+json"},
         )
-        response.raise_for_status()
+        if response is None:
+            return NOT_MODIFIED
         return response.json()
 
     def parse(self, releases: Any, feed_cfg: Dict[str, Any]) -> List[Item]:
@@ -49,7 +61,10 @@ class GitHubSource(Source):
         else:
             rels = releases
         items: List[Item] = []
-        for rel in rels[:10]:
+        new_rels = self.iter_new(
+            rels[:10], feed_cfg, lambda r: r.get("html_url", ""), lambda r: r.get("published_at")
+        )
+        for rel in new_rels:
             items.append(
                 create_item(
                     title=rel.get("name") or rel.get("tag_name", ""),
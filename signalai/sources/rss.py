@@ -1,16 +1,6 @@
 import asyncio
 from typing import Any, Dict, List
 
-import requests
-
-# feedparser is an optional dependency that may be missing in some
-# environments (e.g. during tests). Import it lazily inside fetch() so
-# that the module can be imported without the package installed.
-try:  # pragma: no cover - dependency may be missing in tests
-    import feedparser
-except ModuleNotFoundError:  # pragma: no cover
-    feedparser = None  # type: ignore
-
 try:  # pragma: no cover - dependency may be missing in tests
     from modelcontextprotocol import call_tool  # type: ignore
 except Exception:  # pragma: no cover
@@ -19,25 +9,30 @@ except Exception:  # pragma: no cover
 from signalai.models import Item
 
 from . import register
-from .base import Source
-from .utils import create_item
+from .base import NOT_MODIFIED, Source
+from .utils import create_item, load_feedparser
 
 
 @register
 class RSSSource(Source):
     NAME = "rss"
 
-    def fetch(self, feed_cfg: Dict[str, Any]) -> Any:
+    async def _call_mcp(self, feed_cfg: Dict[str, Any]) -> Any:
+        return await call_tool("get_feed", {"url": feed_cfg["url"], "num_items": 10})
+
+    async def afetch(self, feed_cfg: Dict[str, Any]) -> Any:
         if call_tool:
-            async def _fetch() -> Any:
-                return await call_tool(
-                    "get_feed", {"url": feed_cfg["url"], "num_items": 10}
-                )
+            return await self._call_mcp(feed_cfg)
+        return await super().afetch(feed_cfg)
 
-            return asyncio.run(_fetch())
+    def fetch(self, feed_cfg: Dict[str, Any]) -> Any:
+        if call_tool:
+            return asyncio.run(self._call_mcp(feed_cfg))
 
-        response = requests.get(feed_cfg["url"], timeout=10)
-        response.raise_for_status()
+        response = self.http_get(feed_cfg["url"], timeout=10)
+        if response is None:
+            return NOT_MODIFIED
+        feedparser = load_feedparser()
         if feedparser is None:
             raise RuntimeError(
                 "feedparser is required to fetch RSS feeds."
@@ -50,7 +45,10 @@ class RSSSource(Source):
         else:
             entries = getattr(parsed, "entries", [])
         items: List[Item] = []
-        for entry in entries:
+        new_entries = self.iter_new(
+            entries, feed_cfg, lambda e: e.get("link", ""), lambda e: e.get("published")
+        )
+        for entry in new_entries:
             items.append(
                 create_item(
                     title=entry.get("title", ""),
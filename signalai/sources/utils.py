@@ -1,10 +1,24 @@
 import datetime
+from types import ModuleType
 from typing import List, Optional
 import dateutil.parser
 from signalai.models import Item
 from signalai.io.helpers import domain_of
 
 
+def load_feedparser() -> Optional[ModuleType]:
+    """Import feedparser on first use, or return ``None`` if it is missing.
+
+    feedparser is only needed when a feed is fetched over plain HTTP, so it is
+    not imported with the sources (the MCP path and tests never need it).
+    """
+    try:
+        import feedparser
+    except ModuleNotFoundError:  # pragma: no cover - optional dependency
+        return None
+    return feedparser
+
+
 def parse_published(published: Optional[str]) -> datetime.datetime:
     """Parse a published date string into a timezone-aware datetime.
 
@@ -0,0 +1,118 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from signalai.io import dupindex
+from signalai.io.dupindex import DupIndex
+from signalai.models import Item
+from signalai.pipeline import neardup
+from signalai.pipeline.normalize import ensure_norm
+
+ANNOUNCEMENT = (
+    "Acme releases Falcon 3 open weights model with long context and tool use "
+    "support, available today on the hub under an Apache license"
+)
+
+
+def make_item(h: str, domain: str, text: str) -> Item:
+    return Item(
+        title=text[:40],
+        url=f"https://{domain}/{h}",
+        summary=text[40:],
+        published=datetime.now(timezone.utc),
+        tags=[],
+        source="rss",
+        hash=h,
+        domain=domain,
+    )
+
+
+def test_query_finds_near_duplicates_only():
+    index = DupIndex()
+    index.add("orig", DupIndex.signature(ANNOUNCEMENT))
+    index.add("other", DupIndex.signature("Survey of retrieval augmented generation for code search"))
+
+    reworded = ANNOUNCEMENT.replace("available today", "out now")
+    matches = index.query(DupIndex.signature(reworded))
+    assert [key for key, _ in matches] == ["orig"]
+    assert 0.5 <= matches[0][1] < 1.0
+    assert index.query(DupIndex.signature("Weekly roundup of robotics papers")) == []
+    assert DupIndex.signature("  ...  ") is None
+
+
+def test_pure_python_signatures_match_numpy(monkeypatch):
+    if dupindex.np is None:
+        pytest.skip("numpy not installed")
+    expected = DupIndex.signature(ANNOUNCEMENT)
+    monkeypatch.setattr(dupindex, "np", None)
+    assert DupIndex.signature(ANNOUNCEMENT) == expected
+
+
+def test_index_round_trips(tmp_path):
+    store = tmp_path / "store.json"
+    index = DupIndex.for_store(store)
+    sig = DupIndex.signature(ANNOUNCEMENT)
+    index.add("orig", sig)
+    index.save()
+
+    loaded = DupIndex.for_store(store)
+    assert len(loaded) == 1 and "orig" in loaded
+    assert loaded.query(sig) == [("orig", 1.0)]
+
+
+def test_cluster_keeps_highest_authority_representative():
+    blog = make_item("blog", "example.com", ANNOUNCEMENT)
+    hn = make_item("hn", "news.ycombinator.com", ANNOUNCEMENT + " (discussion)")
+    unrelated = make_item("x", "example.com", "Benchmarking small vision language models on charts")
+    store = {it.hash: it for it in (blog, hn, unrelated)}
+    index = DupIndex()
+    changed = neardup.cluster(store, [blog, hn, unrelated], index)
+    assert hn.duplicate_of == "blog" and blog.alternates == [hn.url]
+    assert {it.hash for it in changed} == {"blog", "hn"}
+
+    # A higher-authority copy takes over the cluster on a later run.
+    gh = make_item("gh", "github.com", ANNOUNCEMENT)
+    store["gh"] = gh
+    changed = neardup.cluster(store, [gh], index)
+    assert gh.duplicate_of is None
+    assert gh.alternates == [blog.url, hn.url]
+    assert blog.duplicate_of == hn.duplicate_of == "gh"
+    assert blog.alternates == []
+    assert {it.hash for it in changed} == {"gh", "blog", "hn"}
+    assert unrelated.duplicate_of is None
+
+
+def test_save_appends_only_new_signatures(tmp_path):
+    store = tmp_path / "store.json"
+    index = DupIndex.for_store(store)
+    index.add("orig", DupIndex.signature(ANNOUNCEMENT), "example.com")
+    index.save()
+    index.close()
+
+    index = DupIndex.for_store(store)
+    other = DupIndex.signature("Survey of retrieval augmented generation for code search")
+    index.add("orig", other, "example.com")  # already stored: ignored
+    index.add("other", other, "arxiv.org")
+    assert index.query(other) == [("other", 1.0)]
+    index.save()
+    index.close()
+
+    loaded = DupIndex.for_store(store)
+    assert len(loaded) == 2
+    assert loaded.query(DupIndex.signature(ANNOUNCEMENT)) == [("orig", 1.0)]
+    assert loaded.query(DupIndex.signature(ANNOUNCEMENT), exclude_domain="example.com") == []
+
+
+def test_cluster_keeps_distinct_stories_from_one_feed_apart():
+    models = ["Falcon 3", "Eagle 2", "Heron 4", "Osprey 1", "Condor 5", "Kestrel 2", "Swift 7", "Raven 9"]
+    stories = [make_item(f"s{i}", "example.com", ANNOUNCEMENT.replace("Falcon 3", m)) for i, m in enumerate(models)]
+    index = DupIndex()
+    # The feed's house style alone is enough for the stories to match.
+    index.add("s0", DupIndex.signature(ensure_norm(stories[0]).search_text))
+    assert [key for key, _ in index.query(DupIndex.signature(ensure_norm(stories[1]).search_text))] == ["s0"]
+
+    index = DupIndex()
+    changed = neardup.cluster({it.hash: it for it in stories}, stories, index)
+    assert changed == []
+    assert all(it.duplicate_of is None and it.alternates == [] for it in stories)
+    assert len(index) == len(stories)
@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from signalai.io.embedding_store import EmbeddingStore
+from signalai.models import Item
+from signalai.pipeline import theme
+
+
+def test_add_get_round_trip_and_persistence(tmp_path):
+    store = EmbeddingStore(tmp_path, "model-a")
+    store.add(["h1", "h2"], [[1.0, 2.0], [3.0, 4.5]])
+    assert store.get(["h2", "missing", None, "h1"]) == [[3.0, 4.5], None, None, [1.0, 2.0]]
+    store.close()
+
+    reopened = EmbeddingStore(tmp_path, "model-a")
+    assert len(reopened) == 2
+    reopened.add(["h2", "h3"], [[9.0, 9.0], [5.0, 6.0]])  # h2 is already cached
+    assert reopened.get(["h2", "h3"]) == [[3.0, 4.5], [5.0, 6.0]]
+
+    with pytest.raises(ValueError):
+        reopened.add(["h4"], [[1.0, 2.0, 3.0]])
+
+
+def test_model_namespaces_are_isolated(tmp_path):
+    EmbeddingStore(tmp_path, "model-a").add(["h1"], [[1.0]])
+    other = EmbeddingStore(tmp_path, "model-b")
+    assert other.get(["h1"]) == [None]
+
+
+def test_compact_drops_rows(tmp_path):
+    store = EmbeddingStore(tmp_path, "m")
+    store.add(["h1", "h2", "h3"], [[1.0], [2.0], [3.0]])
+    assert store.compact(["h1", "h3"]) == 1
+    assert store.get(["h1", "h2", "h3"]) == [[1.0], None, [3.0]]
+    assert [p.stat().st_size for p in store.dir.glob("vectors*")] == [2 * 4]
+    assert EmbeddingStore(tmp_path, "m").get(["h3"]) == [[3.0]]
+    store.add(["h4"], [[4.0]])
+    assert store.compact(["h1", "h4"]) == 1
+    assert EmbeddingStore(tmp_path, "m").get(["h1", "h3", "h4"]) == [[1.0], None, [4.0]]
+
+
+def test_interrupted_compaction_keeps_the_old_vectors(tmp_path, monkeypatch):
+    store = EmbeddingStore(tmp_path, "m")
+    store.add(["h1", "h2", "h3"], [[1.0], [2.0], [3.0]])
+
+    def crash():
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "_save_index", crash)
+    with pytest.raises(OSError):
+        store.compact(["h3"])
+    assert EmbeddingStore(tmp_path, "m").get(["h1", "h2", "h3"]) == [[1.0], [2.0], [3.0]]
+
+
+def test_get_ignores_rows_outside_the_vectors_file(tmp_path):
+    store = EmbeddingStore(tmp_path, "m")
+    store.add(["h1", "h2"], [[1.0], [2.0]])
+    store.close()
+    (store.dir / "vectors.f32").write_bytes(b"\0\0\x80\x3f")  # truncated to one row
+    assert EmbeddingStore(tmp_path, "m").get(["h1", "h2"]) == [[1.0], None]
+
+
+def test_theme_encodes_only_unseen_items(tmp_path, monkeypatch):
+    def make(n):
+        return Item(
+            title=f"title {n}", url=f"https://e.com/{n}", summary="s",
+            published=datetime.now(timezone.utc), tags=[], source="s",
+            domain="e.com", hash=f"h{n}",
+        )
+
+    encoded = []
+    model = theme._get_model()
+    original = model.encode
+    monkeypatch.setattr(model, "encode", lambda texts: encoded.extend(texts) or original(texts))
+    theme.set_embedding_store(tmp_path)
+    try:
+        first = theme._embed_items([make(1), make(2)])
+        second = theme._embed_items([make(1), make(2), make(3)])
+    finally:
+        theme.set_embedding_store(None)
+
+    assert encoded == ["title 1 s", "title 2 s", "title 3 s"]
+    assert second[:2] == first
+
+
+def test_compact_embeddings_covers_every_model(tmp_path):
+    root = theme.embedding_root(tmp_path / "store.json")
+    EmbeddingStore(root, "model-a").add(["h1", "h2"], [[1.0], [2.0]])
+    EmbeddingStore(root, "model-b").add(["h2", "h3"], [[2.0], [3.0]])
+
+    # Any container works, e.g. the store's HashIndex.
+    assert theme.compact_embeddings(root, frozenset({"h2"})) == 2
+    assert len(EmbeddingStore(root, "model-a")) == 1
+    assert EmbeddingStore(root, "model-b").get(["h2", "h3"]) == [[2.0], None]
+    assert theme.compact_embeddings(tmp_path / "missing", frozenset()) == 0
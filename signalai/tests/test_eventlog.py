@@ -0,0 +1,64 @@
+import csv
+import time
+
+from signalai.io import eventlog
+from signalai.io.eventlog import EventLog
+
+FIELDS = ["a", "b"]
+
+
+def _rows(path):
+    with path.open() as fh:
+        return list(csv.DictReader(fh))
+
+
+def test_rows_are_buffered_until_max_rows(tmp_path):
+    path = tmp_path / "log.csv"
+    log = EventLog(path, FIELDS, max_rows=3, max_delay_s=3600)
+    log.append({"a": 1, "b": 2})
+    log.append({"a": 3, "b": 4})
+    assert not path.exists()
+    assert len(log) == 2
+
+    log.append({"a": 5, "b": 6})
+    assert len(log) == 0
+    assert _rows(path) == [{"a": "1", "b": "2"}, {"a": "3", "b": "4"}, {"a": "5", "b": "6"}]
+
+
+def test_time_policy_and_context_manager(tmp_path, monkeypatch):
+    path = tmp_path / "log.csv"
+    now = [0.0]
+    monkeypatch.setattr(eventlog.time, "monotonic", lambda: now[0])
+    log = EventLog(path, FIELDS, max_rows=100, max_delay_s=5.0)
+    log.append({"a": 1, "b": 1})
+    assert not path.exists()
+    now[0] = 10.0
+    log.append({"a": 2, "b": 2})
+    assert len(_rows(path)) == 2
+
+    with EventLog(path, FIELDS, max_rows=100, max_delay_s=3600, fsync=True) as log:
+        log.append({"a": 3, "b": 3})
+    # The header is only written once.
+    assert [r["a"] for r in _rows(path)] == ["1", "2", "3"]
+
+
+def test_shared_log_per_path(tmp_path):
+    path = tmp_path / "shared.csv"
+    log = eventlog.get_log(path, FIELDS)
+    assert eventlog.get_log(tmp_path / "." / "shared.csv", FIELDS) is log
+    log.append({"a": 1, "b": 2})
+    eventlog.flush(path)
+    assert _rows(path) == [{"a": "1", "b": "2"}]
+    eventlog.flush(tmp_path / "unknown.csv")
+
+
+def test_idle_log_is_flushed_by_timer(tmp_path):
+    path = tmp_path / "log.csv"
+    log = EventLog(path, FIELDS, max_rows=100, max_delay_s=0.05)
+    log.append({"a": 1, "b": 2})
+    assert not path.exists()
+    deadline = time.monotonic() + 5
+    while len(log) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _rows(path) == [{"a": "1", "b": "2"}]
+    assert log._timer is None
@@ -0,0 +1,176 @@
+import requests
+
+from signalai.io import feed_cache as feed_cache_mod
+from signalai.io.feed_cache import FeedCache
+from signalai.io.helpers import canonicalize_url, sha1_of
+from signalai.pipeline import ingest
+from signalai.sources import rss as rss_mod
+from signalai.sources.base import NOT_MODIFIED
+from signalai.sources.rss import RSSSource
+
+RSS = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>
+<item><title>T</title><link>https://example.com/a</link>
+<description>S</description><pubDate>Mon, 01 Jan 2024 00:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+def _response(status=200, content=b"", headers=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = content
+    resp.headers.update(headers or {})
+    return resp
+
+
+def _fake_server(calls):
+    def fake_get(url, headers=None, **kwargs):
+        calls.append(dict(headers or {}))
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            return _response(304)
+        return _response(200, RSS, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+    return fake_get
+
+
+def test_conditional_get_round_trip(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(feed_cache_mod.http, "get", _fake_server(calls))
+    path = tmp_path / "store.json.feedcache.json"
+
+    cache = FeedCache(path)
+    assert cache.get("https://example.com/rss") is not None
+    cache.commit("https://example.com/rss")
+    cache.save()
+    assert "If-None-Match" not in calls[0]
+
+    cache = FeedCache(path)
+    assert cache.get("https://example.com/rss") is None
+    assert calls[1]["If-None-Match"] == '"v1"'
+    assert calls[1]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert cache.stats == {"not_modified": 1, "unchanged": 0, "full": 0, "bytes_saved": len(RSS)}
+
+
+def test_unchanged_body_without_validators(monkeypatch):
+    monkeypatch.setattr(feed_cache_mod.http, "get", lambda url, **kw: _response(200, RSS))
+    cache = FeedCache()
+    assert cache.get("https://example.com/rss") is not None
+    cache.commit("https://example.com/rss")
+    assert cache.get("https://example.com/rss") is None
+    assert cache.stats["full"] == 2
+    assert cache.stats["unchanged"] == 1
+
+
+def test_rss_source_returns_not_modified(monkeypatch):
+    calls = []
+    monkeypatch.setattr(feed_cache_mod.http, "get", _fake_server(calls))
+    monkeypatch.setattr("signalai.sources.rss.call_tool", None)
+    feed = {"url": "https://example.com/rss", "name": "Example"}
+
+    src = RSSSource()
+    src.feed_cache = FeedCache()
+    items = src.parse(src.fetch(feed), feed)
+    assert [it.url for it in items] == ["https://example.com/a"]
+    src.commit_fetch()
+    assert src.fetch(feed) is NOT_MODIFIED
+
+
+def test_validators_only_committed_after_parse(monkeypatch):
+    calls = []
+    monkeypatch.setattr(feed_cache_mod.http, "get", _fake_server(calls))
+    monkeypatch.setattr("signalai.sources.rss.call_tool", None)
+    feed = {"type": "rss", "url": "https://example.com/rss", "name": "Example"}
+    real_parse = RSSSource.parse
+    failures = [RuntimeError("bad body")]
+
+    def flaky_parse(self, raw, feed_cfg):
+        if failures:
+            raise failures.pop()
+        return real_parse(self, raw, feed_cfg)
+
+    monkeypatch.setattr(RSSSource, "parse", flaky_parse)
+    cache = FeedCache()
+    assert ingest._fetch_feed(feed, cache) == []
+    assert cache.request_headers(feed["url"]) == {}
+
+    # The failed body was not recorded, so it is fetched and parsed again.
+    items = ingest._fetch_feed(feed, cache)
+    assert [it.url for it in items] == ["https://example.com/a"]
+    assert "If-None-Match" not in calls[1]
+    assert ingest._fetch_feed(feed, cache) == []
+    assert calls[2]["If-None-Match"] == '"v1"'
+
+
+def _entries(*urls):
+    return {"items": [{"title": u, "link": u, "summary": "", "published": None} for u in urls]}
+
+
+def test_watermark_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(feed_cache_mod.http, "get", _fake_server([]))
+    path = tmp_path / "store.json.feedcache.json"
+    feed = {"url": "https://example.com/rss", "name": "Example"}
+
+    cache = FeedCache(path)
+    src = RSSSource()
+    items = src.parse(_entries("https://example.com/a?utm=x"), feed)
+    items[0].hash = sha1_of(canonicalize_url(items[0].url))
+    cache.advance(feed, items)
+    cache.get(feed["url"])
+    cache.commit(feed["url"])
+    cache.save()
+
+    cache = FeedCache(path)
+    mark = cache.watermark(feed)
+    assert mark["seen"] == [items[0].hash]
+    assert mark["newest"] == items[0].published.isoformat()
+    assert cache.request_headers(feed["url"])["If-None-Match"] == '"v1"'
+    assert cache.is_known(feed, items[0].hash)
+    assert not cache.is_known({"url": "https://other.com/rss"}, items[0].hash)
+
+
+def test_sources_skip_known_entries_before_building_items(monkeypatch):
+    feed = {"url": "https://example.com/rss", "name": "Example"}
+    known = {sha1_of("https://example.com/b"), sha1_of("https://example.com/d")}
+    created = []
+    real_create = rss_mod.create_item
+    monkeypatch.setattr(rss_mod, "create_item", lambda **kw: created.append(kw["url"]) or real_create(**kw))
+
+    src = RSSSource()
+    src.feed_cache = FeedCache(known=known)
+    raw = _entries(*(f"https://example.com/{c}" for c in "abcde"))
+    assert [it.url for it in src.parse(raw, feed)] == [f"https://example.com/{c}" for c in "ace"]
+    assert created == [f"https://example.com/{c}" for c in "ace"]
+    assert src.feed_cache.skip_stats == {"skipped": 2, "stopped_early": 0}
+
+    # Entries only known from the store do not stop an ordered feed.
+    items = src.parse(raw, {**feed, "ordered": True})
+    assert [it.url for it in items] == [f"https://example.com/{c}" for c in "ace"]
+    assert src.feed_cache.skip_stats == {"skipped": 4, "stopped_early": 0}
+
+
+def test_ordered_feeds_stop_at_their_watermark():
+    feed = {"url": "https://example.com/rss", "name": "Example", "ordered": True}
+    src = RSSSource()
+    # "x" reached the store through another feed.
+    src.feed_cache = FeedCache(known={sha1_of("https://example.com/x")})
+
+    def entry(c, published):
+        return {"title": c, "link": f"https://example.com/{c}", "summary": "", "published": published}
+
+    old = src.parse({"items": [entry(c, "2025-01-01T00:00:00Z") for c in "bc"]}, feed)
+    for it in old:
+        it.hash = sha1_of(it.url)
+    src.feed_cache.advance(feed, old)
+
+    raw = {
+        "items": [
+            entry("n", "2025-01-03T00:00:00Z"),
+            entry("x", "2024-12-01T00:00:00Z"),  # resurfaced, known from the store only
+            entry("b", "2025-01-02T00:00:00Z"),  # re-published after the watermark
+            entry("m", "2025-01-02T00:00:00Z"),
+            entry("c", "2025-01-01T00:00:00Z"),
+            entry("z", "2024-12-31T00:00:00Z"),
+        ]
+    }
+    items = src.parse(raw, feed)
+    assert [it.url for it in items] == ["https://example.com/n", "https://example.com/m"]
+    assert src.feed_cache.skip_stats == {"skipped": 4, "stopped_early": 1}
@@ -0,0 +1,73 @@
+import gzip
+import hashlib
+
+import pytest
+
+from signalai.io import hashindex
+from signalai.io.hashindex import HashIndex
+from signalai.io.storage import cold_dir
+
+
+def _hashes(n, salt="a"):
+    return [hashlib.sha1(f"{salt}{i}".encode()).hexdigest() for i in range(n)]
+
+
+def test_contains_add_and_round_trip(tmp_path):
+    stored, unseen = _hashes(500), _hashes(500, salt="b")
+    index = HashIndex(tmp_path / "store.json.hashidx")
+    index.rebuild(stored[:400])
+    for h in stored[400:] + ["plain-hash"]:
+        index.add(h)
+    assert len(index) == 501
+    assert all(h in index for h in stored) and "plain-hash" in index
+    assert not any(h in index for h in unseen)
+    index.save()
+
+    loaded = HashIndex(tmp_path / "store.json.hashidx")
+    assert len(loaded) == 501
+    assert all(h in loaded for h in stored) and "plain-hash" in loaded
+    assert not any(h in loaded for h in unseen)
+
+
+def test_for_store_rebuilds_when_store_changes(tmp_path):
+    store = tmp_path / "store.json"
+    store.write_text("[]")
+    calls = []
+
+    def hashes():
+        calls.append(1)
+        return _hashes(3)
+
+    index = HashIndex.for_store(store, hashes)
+    assert len(calls) == 1 and len(index) == 3
+    index.save(store)
+
+    assert len(HashIndex.for_store(store, hashes)) == 3
+    assert len(calls) == 1
+
+    store.write_text("[ ]")
+    index = HashIndex.for_store(store, hashes)
+    assert len(calls) == 2
+
+    # Cold partitions are part of the store too.
+    index.save(store)
+    part = cold_dir(store) / "2024-01.json.gz"
+    part.parent.mkdir()
+    part.write_bytes(gzip.compress(b"[]"))
+    index = HashIndex.for_store(store, hashes)
+    assert len(calls) == 3
+    index.save(store)
+    part.write_bytes(gzip.compress(b"[ ]"))
+    HashIndex.for_store(store, hashes)
+    assert len(calls) == 4
+
+
+def test_pure_python_bloom_matches_numpy(monkeypatch):
+    if hashindex.np is None:
+        pytest.skip("numpy not installed")
+    index = HashIndex()
+    index.rebuild(_hashes(10000))
+    expected = bytes(index._bloom)
+    monkeypatch.setattr(hashindex, "np", None)
+    index.rebuild(_hashes(10000))
+    assert bytes(index._bloom) == expected
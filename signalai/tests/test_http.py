@@ -1,13 +1,17 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 import requests
 
 from signalai.io import http
 
 
-def _response(status=200, json_data=None):
+def _response(status=200, json_data=None, headers=None):
     resp = requests.Response()
     resp.status_code = status
     resp.url = "https://example.com"
+    resp.headers.update(headers or {})
     if json_data is not None:
         import json
         resp._content = json.dumps(json_data).encode("utf-8")
@@ -15,6 +19,10 @@ def _response(status=200, json_data=None):
     return resp
 
 
+def _patch_session(monkeypatch, fake):
+    monkeypatch.setattr(requests.Session, "request", lambda self, *a, **k: fake(*a, **k))
+
+
 def test_request_retries(monkeypatch):
     calls = {"count": 0}
 
@@ -24,7 +32,7 @@ def test_request_retries(monkeypatch):
             raise requests.exceptions.Timeout()
         return _response()
 
-    monkeypatch.setattr(requests, "request", fake_request)
+    _patch_session(monkeypatch, fake_request)
     monkeypatch.setattr(http.time, "sleep", lambda *_: None)
 
     resp = http.request("GET", "https://example.com", retries=3, timeout=1)
@@ -33,12 +41,65 @@ def test_request_retries(monkeypatch):
 
 
 def test_request_raises(monkeypatch):
-    monkeypatch.setattr(requests, "request", lambda *a, **k: _response(status=500))
+    _patch_session(monkeypatch, lambda *a, **k: _response(status=500))
+    monkeypatch.setattr(http.time, "sleep", lambda *_: None)
     with pytest.raises(requests.exceptions.HTTPError):
         http.request("GET", "https://example.com")
 
 
+def test_request_does_not_retry_client_errors(monkeypatch):
+    calls = []
+    _patch_session(monkeypatch, lambda *a, **k: calls.append(1) or _response(status=404))
+    with pytest.raises(requests.exceptions.HTTPError):
+        http.request("GET", "https://example.com", retries=3)
+    assert len(calls) == 1
+
+
+def test_request_honours_retry_after(monkeypatch):
+    responses = [_response(status=429, headers={"Retry-After": "7"}), _response()]
+    sleeps = []
+    _patch_session(monkeypatch, lambda *a, **k: responses.pop(0))
+    monkeypatch.setattr(http.time, "sleep", sleeps.append)
+
+    http.reset_stats()
+    assert http.request("GET", "https://example.com").status_code == 200
+    assert sleeps == [7.0]
+    assert http.stats()["retries"] == 1
+
+
 def test_get_json(monkeypatch):
-    monkeypatch.setattr(requests, "request", lambda *a, **k: _response(json_data={"a": 1}))
+    _patch_session(monkeypatch, lambda *a, **k: _response(json_data={"a": 1}))
     assert http.get_json("https://example.com") == {"a": 1}
 
+
+def test_session_reuses_connections():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = b"ok"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+    try:
+        before = http.stats()
+        for _ in range(3):
+            assert http.get(url).text == "ok"
+        after = http.stats()
+    finally:
+        http.close()
+        server.shutdown()
+        server.server_close()
+
+    assert http.session_for(url) is http.session_for(url)
+    assert after["connections"] - before["connections"] == 1
+    assert after["reused"] - before["reused"] == 2
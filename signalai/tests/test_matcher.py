@@ -0,0 +1,51 @@
+import pytest
+
+from signalai.pipeline import theme
+from signalai.rules import matcher
+from signalai.rules.keywords import BOOST_TERMS, THEME_KEYWORDS
+
+BACKENDS = [
+    False,
+    pytest.param(
+        True,
+        marks=pytest.mark.skipif(matcher.ahocorasick is None, reason="pyahocorasick not installed"),
+    ),
+]
+
+
+@pytest.mark.parametrize("automaton", BACKENDS)
+def test_find_overlapping_and_case_insensitive(automaton):
+    m = matcher.KeywordMatcher(["Agent", "agents", "eval", "evaluation", "agent"], automaton=automaton)
+    assert m.patterns == ("agent", "agents", "eval", "evaluation")
+    assert m.find("Multi-AGENTS Evaluation") == {"agent", "agents", "eval", "evaluation"}
+    assert m.find("retrieval") == {"eval"}
+    assert m.find("orchestration") == set()
+
+
+@pytest.mark.parametrize("automaton", BACKENDS)
+def test_find_nested_patterns(automaton):
+    m = matcher.KeywordMatcher(["vllm", "ll", "llm", "lm"], automaton=automaton)
+    assert m.find("vLLM serving") == {"vllm", "ll", "llm", "lm"}
+    assert m.find("llama") == {"ll"}
+    assert m.find("elm llama") == {"ll", "lm"}
+
+
+@pytest.mark.parametrize("automaton", BACKENDS)
+def test_backends_agree_with_substring_scan(automaton):
+    m = matcher.KeywordMatcher(matcher.KEYWORDS.patterns, automaton=automaton)
+    texts = [
+        "LLM agent orchestration cuts latency",
+        "A benchmark for VLM safety and RLHF alignment",
+        "nothing relevant",
+        "",
+    ]
+    for text in texts:
+        expected = {p for p in m.patterns if p in text.lower()}
+        assert m.find(text) == expected
+
+
+def test_keywords_cover_boost_and_theme_terms():
+    patterns = set(matcher.KEYWORDS.patterns)
+    assert {kw.lower() for kw in BOOST_TERMS} <= patterns
+    assert all(set(kws) <= patterns for kws in THEME_KEYWORDS.values())
+    assert theme.THEME_KEYWORDS is THEME_KEYWORDS
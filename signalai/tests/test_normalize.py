@@ -0,0 +1,94 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from signalai.io.storage import SqliteStorage
+from signalai.models import Item
+from signalai.pipeline import ingest, normalize
+from signalai.sources import Source, registry
+
+
+def make_item(title: str, summary: str, url: str = "https://arxiv.org/abs/1") -> Item:
+    return Item(
+        title=title,
+        url=url,
+        summary=summary,
+        published=datetime.now(timezone.utc),
+        tags=[],
+        source="arxiv",
+        domain="arxiv.org",
+    )
+
+
+def test_clean_text_strips_tags_entities_and_whitespace():
+    assert normalize.clean_text("  <p>Fast &amp; small\n models</p> ") == "Fast & small models"
+    assert normalize.clean_text("") == ""
+
+
+def test_normalize_fields():
+    item = make_item("An  <b>Agent</b> Benchmark", "Cuts <i>latency</i> &amp; cost")
+    norm = normalize.normalize(item)
+    assert norm.version == normalize.NORM_VERSION
+    assert norm.title == "An <b>Agent</b> Benchmark"
+    assert norm.summary == "Cuts latency & cost"
+    assert norm.search_text == "an agent benchmark cuts latency & cost"
+    assert norm.word_count == 4
+    assert norm.site == "arXiv"
+    assert norm.keyword_hits == sorted({"agent", "benchmark", "latency"})
+
+
+def test_keyword_hits_match_the_raw_text_the_ranker_was_trained_on():
+    from signalai.pipeline import ranker
+    from signalai.rules.matcher import keyword_hits
+
+    item = make_item("Long\ncontext <b>lat</b>ency", "Agent &amp; <i>eval</i>")
+    raw = keyword_hits(item.title + " " + item.summary)
+    assert normalize.normalize(item).keyword_hits == sorted(raw)
+    assert ranker.extract_features(item)["keyword_hits"] == len(raw & ranker._BOOST_SET) == 2
+
+
+def test_ensure_norm_recomputes_stale_records():
+    item = make_item("Agent", "")
+    norm = normalize.ensure_norm(item)
+    assert item.norm is norm
+    assert normalize.ensure_norm(item) is norm
+
+    item.norm = norm.model_copy(update={"version": "0-old", "keyword_hits": []})
+    assert normalize.ensure_norm(item).keyword_hits == ["agent"]
+
+
+def test_norm_round_trips_through_sqlite(tmp_path):
+    item = make_item("Agent", "Summary")
+    item.hash = "h1"
+    normalize.ensure_norm(item)
+    path = tmp_path / "store.db"
+    SqliteStorage().upsert_items(path, [item.model_dump()])
+    (stored,) = SqliteStorage().iter_items(path)
+    assert Item.model_validate(stored).norm == item.norm
+
+
+def test_ingest_normalizes_new_and_legacy_items(tmp_path, monkeypatch, sample_feed_config):
+    feeds_path = tmp_path / "feeds.json"
+    store_path = tmp_path / "store.json"
+    feeds_path.write_text(json.dumps(sample_feed_config))
+    legacy = make_item("Old agent post", "Summary", url="https://example.com/old")
+    legacy.hash = "old"
+    store_path.write_text(json.dumps([json.loads(legacy.model_dump_json(exclude={"norm"}))]))
+
+    class DummySource(Source):
+        NAME = "rss"
+
+        def fetch(self, feed):
+            return None
+
+        def parse(self, raw, feed):
+            return [make_item("New &amp; <b>notable</b>", "Summary", url="https://example.com/new")]
+
+    monkeypatch.setitem(registry, "rss", DummySource)
+
+    store_items, new_items = ingest.run(Path(feeds_path), Path(store_path))
+    assert new_items[0].norm.title == "New & <b>notable</b>"
+    assert all(it.norm is not None for it in store_items)
+    saved = {d["hash"]: d for d in json.loads(store_path.read_text())}
+    assert saved["old"]["norm"]["keyword_hits"] == ["agent"]
+    assert saved[new_items[0].hash]["norm"]["site"] == "arxiv"
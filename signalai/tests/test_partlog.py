@@ -0,0 +1,107 @@
+import csv
+import datetime
+
+import pytest
+
+from signalai import analytics
+from signalai.io import eventlog
+from signalai.io.partlog import PartitionedLog, migrate_csv
+from signalai.models import Item
+from signalai.pipeline import train_ranking
+
+FIELDS = ["timestamp", "item_url", "score", "event"]
+
+
+def _row(day, i, event="impression"):
+    return {"timestamp": f"{day}T12:00:00+00:00", "item_url": f"u{i}", "score": i / 2, "event": event}
+
+
+def test_rows_partitioned_by_day_and_closed(tmp_path):
+    log = PartitionedLog(tmp_path / "log", FIELDS, numeric=["score"])
+    log.write_rows([_row("2025-01-01", 1), _row("2025-01-02", 2), _row("2025-01-02", 3)])
+    # Past days are closed (compressed) as soon as they are written.
+    assert [p.name for p in (tmp_path / "log" / "2025-01-01").iterdir()] == ["seg-000000.col.gz"]
+
+    rows = list(log.iter_rows())
+    assert [r["item_url"] for r in rows] == ["u1", "u2", "u3"]
+    assert rows[1]["score"] == pytest.approx(1.0)
+
+    day = datetime.date(2025, 1, 2)
+    assert [r["item_url"] for r in log.iter_rows(start=day)] == ["u2", "u3"]
+    blocks = list(log.iter_columns(["score"], end=datetime.date(2025, 1, 1)))
+    assert [list(b["score"]) for b in blocks] == [[0.5]]
+
+    # The schema is persisted, so readers need no field names.
+    assert len(list(PartitionedLog(tmp_path / "log").iter_rows())) == 3
+
+
+def test_active_segment_rotates_by_size(tmp_path):
+    today = datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+    log = PartitionedLog(tmp_path / "log", FIELDS, numeric=["score"], max_segment_bytes=200)
+    for i in range(10):
+        log.write_rows([_row(today, i)])
+    names = sorted(p.name for p in (tmp_path / "log" / today).iterdir())
+    assert any(n.endswith(".col.gz") for n in names)
+    assert [r["item_url"] for r in log.iter_rows()] == [f"u{i}" for i in range(10)]
+
+    log.close_segments()
+    assert all(p.name.endswith(".col.gz") for p in (tmp_path / "log" / today).iterdir())
+    assert len(list(log.iter_rows())) == 10
+
+
+def test_migrate_csv_and_train(tmp_path, monkeypatch):
+    src = tmp_path / "ranker_log.csv"
+    fields = ["timestamp", "item_url", "novelty", "authority", "keyword_hits", "engagement", "event"]
+    with src.open("w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=fields)
+        writer.writeheader()
+        for i, event in enumerate(["impression", "click", "impression"]):
+            writer.writerow(
+                {"timestamp": f"2025-01-0{i + 1}T00:00:00+00:00", "item_url": f"u{i}",
+                 "novelty": 1, "authority": 0.5, "keyword_hits": i, "engagement": 0.3, "event": event}
+            )
+
+    dst = tmp_path / "ranker_log"
+    assert migrate_csv(src, dst, numeric=fields[2:6]) == 3
+    monkeypatch.setattr(train_ranking, "LOG_PATH", dst)
+    X, y = train_ranking.load_training_data()
+    assert y == [0.0, 1.0, 0.0]
+    assert X[2] == [1.0, 1.0, 0.5, 2.0, 0.3]
+    X, y = train_ranking.load_training_data(start=datetime.date(2025, 1, 2))
+    assert y == [1.0, 0.0]
+
+
+def test_analytics_reads_partitioned_log(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics, "LOG_PATH", tmp_path / "engagement_log")
+    item = Item(
+        title="T",
+        url="http://example.com/a",
+        summary="S",
+        published=datetime.datetime.now(datetime.timezone.utc),
+        tags=["security"],
+        source="Example",
+        domain="example.com",
+    )
+    analytics.log_event(item, "click")
+    analytics.log_event(item, "view")
+    assert analytics.summarize() == {"source": {"Example": 2}, "theme": {"security": 2}}
+    assert list(eventlog.read_columns(tmp_path / "missing", ["source"])) == []
+
+
+def test_read_since_resumes_across_rotation(tmp_path):
+    today = datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+    log = PartitionedLog(tmp_path / "log", FIELDS, numeric=["score"])
+    log.write_rows([_row("2025-01-01", 1), _row(today, 2)])
+    cursor = None
+    for block, cursor in log.read_since(cursor, ["item_url"]):
+        pass
+    assert cursor["segment"] == f"{today}/seg-000000" and cursor["rows"] == 1
+
+    log.write_rows([_row(today, 3)])
+    log.close_segments()
+    log.write_rows([_row(today, 4)])
+    urls = []
+    for block, cursor in log.read_since(cursor, ["item_url"]):
+        urls.extend(block["item_url"])
+    assert urls == ["u3", "u4"]
+    assert list(log.read_since(cursor, ["item_url"]))[-1][0] == {"item_url": []}
@@ -2,6 +2,8 @@ import json
 from pathlib import Path
 from datetime import datetime, timezone
 
+import pytest
+
 from signalai.pipeline import ingest, ranker, formatter
 from signalai.config import StyleConfig, FormatterConfig
 from signalai.models import Item, IssueFinal
@@ -43,6 +45,101 @@ def test_ingest_run_adds_new_items(tmp_path, monkeypatch, sample_feed_config):
     assert len(saved) == 1
 
 
+def test_ingest_run_sqlite_store_writes_only_new_items(tmp_path, monkeypatch, sample_feed_config):
+    feeds_path = tmp_path / "feeds.json"
+    store_path = tmp_path / "store.db"
+    feeds_path.write_text(json.dumps(sample_feed_config))
+
+    urls = ["https://example.com/a"]
+
+    class DummySource(Source):
+        NAME = "rss"
+
+        def fetch(self, feed):
+            return None
+
+        def parse(self, raw, feed):
+            return [
+                Item(
+                    # Distinct titles: identical stories would be clustered
+                    # as near-duplicates and rewritten together.
+                    title=f"Test {url.rsplit('/', 1)[-1]}",
+                    url=url,
+                    summary="Summary",
+                    published=datetime.now(timezone.utc),
+                    tags=[],
+                    source="rss",
+                    domain="example.com",
+                )
+                for url in urls
+            ]
+
+    monkeypatch.setitem(registry, "rss", DummySource)
+
+    _, new_items = ingest.run(Path(feeds_path), Path(store_path))
+    assert len(new_items) == 1
+
+    written = []
+    monkeypatch.setattr(ingest, "upsert_items", lambda path, items: written.extend(items))
+    urls.append("https://example.com/b")
+    store_items, new_items = ingest.run(Path(feeds_path), Path(store_path))
+    assert [it.url for it in new_items] == ["https://example.com/b"]
+    assert len(store_items) == 2
+    assert [d["url"] for d in written] == ["https://example.com/b"]
+
+
+@pytest.mark.parametrize("store_name", ["store.json", "store.db"])
+def test_ingest_run_clusters_with_unloaded_stored_items(tmp_path, monkeypatch, sample_feed_config, store_name):
+    feeds_path = tmp_path / "feeds.json"
+    store_path = tmp_path / store_name
+    feeds_path.write_text(json.dumps(sample_feed_config))
+    text = (
+        "Acme releases Falcon 3 open weights model with long context and tool use "
+        "support, available today on the hub under an Apache license"
+    )
+    urls = ["https://example.com/falcon-3"]
+
+    class DummySource(Source):
+        NAME = "rss"
+
+        def fetch(self, feed):
+            return None
+
+        def parse(self, raw, feed):
+            return [
+                Item(
+                    title=text[:40],
+                    url=urls[-1],
+                    summary=text[40:],
+                    published=datetime.now(timezone.utc),
+                    tags=[],
+                    source="rss",
+                    domain=urls[-1].split("/")[2],
+                )
+            ]
+
+    monkeypatch.setitem(registry, "rss", DummySource)
+
+    def stored():
+        return {it.url: it for it in ingest.iter_store(store_path)}
+
+    # The original is stored by an earlier run and never loaded again.
+    ingest.run(feeds_path, store_path, load_store=False)
+    urls.append("https://news.ycombinator.com/falcon-3")
+    _, new_items = ingest.run(feeds_path, store_path, load_store=False)
+    blog, hn = (stored()[url] for url in urls)
+    assert new_items[0].duplicate_of == hn.duplicate_of == blog.hash
+    assert blog.alternates == [hn.url]
+
+    # A higher-authority copy takes over, re-pointing the unloaded members.
+    urls.append("https://github.com/acme/falcon-3")
+    ingest.run(feeds_path, store_path, load_store=False)
+    blog, hn, gh = (stored()[url] for url in urls)
+    assert gh.duplicate_of is None and gh.alternates == [blog.url, hn.url]
+    assert blog.duplicate_of == hn.duplicate_of == gh.hash
+    assert blog.alternates == []
+
+
 def test_ranker_score_expected(sample_item, expected_score):
     score = ranker.score(sample_item)
     assert abs(score - expected_score) < 1e-6
@@ -70,3 +167,57 @@ def test_formatter_respects_domain_mapping(sample_draft, expected_markdown):
     assert expected_markdown in result.markdown
     assert "### Research" in result.markdown
     assert "### Industry" not in result.markdown
+
+
+def _async_sources(monkeypatch, active):
+    class SyncSource(Source):
+        NAME = "rss"
+
+        def fetch(self, feed):
+            return feed["name"]
+
+        def parse(self, raw, feed):
+            return [
+                Item(
+                    title=raw,
+                    url=f"https://{raw}.com/{i}",
+                    summary="",
+                    published=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                    tags=[],
+                    source=raw,
+                    domain=f"{raw}.com",
+                )
+                for i in range(2)
+            ]
+
+    class AsyncSource(SyncSource):
+        NAME = "async"
+
+        async def afetch(self, feed):
+            import asyncio
+
+            host = feed["url"]
+            active[host] = active.get(host, 0) + 1
+            active["max"] = max(active.get("max", 0), active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+            return feed["name"]
+
+    monkeypatch.setitem(registry, "rss", SyncSource)
+    monkeypatch.setitem(registry, "async", AsyncSource)
+
+
+def test_fetch_all_async_matches_threads(monkeypatch):
+    active = {}
+    _async_sources(monkeypatch, active)
+    feeds = [
+        {"type": "async" if i % 2 else "rss", "name": f"f{i}", "url": "https://same.host/feed"}
+        for i in range(6)
+    ]
+
+    threaded = ingest.fetch_all(feeds, mode="threads")
+    asynced = ingest.fetch_all(feeds, mode="async", per_host=2)
+
+    assert asynced == threaded
+    assert [items[0].source for items in asynced] == [f"f{i}" for i in range(6)]
+    assert active["max"] <= 2
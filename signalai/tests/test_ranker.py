@@ -1,4 +1,5 @@
-from datetime import datetime, timezone
+import random
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
@@ -45,3 +46,72 @@ def test_select_respects_per_domain_cap(cap, expected):
         for domain in ["a.com", "b.com"]
     )
 
+
+def _random_store(rnd, n):
+    now = datetime.now(timezone.utc)
+    items = []
+    for i in range(n):
+        items.append(
+            Item(
+                title=f"T{i}",
+                url=f"https://d{rnd.randint(0, 5)}.com/{i}",
+                summary="",
+                # Few distinct values so ties on (signal, published) are common.
+                published=now - timedelta(days=rnd.choice([0, 1, 2, 5, 10])),
+                tags=[],
+                source="rss",
+                domain=f"d{rnd.randint(0, 5)}.com",
+                hash=f"h{i}",
+                signal=rnd.choice([0.1, 0.5, 0.5, 0.9]),
+            )
+        )
+    return items
+
+
+def _filter_and_order_candidates(ranked_items, new_items, window_days, prefer_new, only_new):
+    """Materialized candidate pool that :func:`ranker.select_top_k` streams.
+
+    - If only_new: take ranked new items only (falling back to the window).
+    - Else, start from items within the window (if window_days>0) else all.
+      If prefer_new, place new items first (preserving rank), then fill with recent non-new.
+    - If the window is too restrictive and yields nothing, fall back to all ranked items.
+    """
+    new_hashes = {it.hash for it in new_items if it.hash}
+    if window_days and window_days > 0:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=window_days)
+        recent = [it for it in ranked_items if ranker.published_utc(it) >= cutoff]
+    else:
+        recent = list(ranked_items)
+
+    if only_new:
+        return [it for it in ranked_items if it.hash in new_hashes] or recent
+
+    if prefer_new:
+        pool = [it for it in recent if it.hash in new_hashes] + [it for it in recent if it.hash not in new_hashes]
+    else:
+        pool = recent
+    return pool or ranked_items
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_select_top_k_matches_sort_filter_select(seed):
+    rnd = random.Random(seed)
+    items = _random_store(rnd, rnd.randint(0, 60))
+    new_items = rnd.sample(items, rnd.randint(0, len(items)))
+    new_hashes = {it.hash for it in new_items}
+    k = rnd.choice([0, 1, 5, 12, 100])
+    cap = rnd.choice([0, 1, 2, 3])
+    window = rnd.choice([0, 1, 3, 30])
+    prefer_new = rnd.random() < 0.5
+    only_new = rnd.random() < 0.3
+
+    ranked = sorted(items, key=lambda x: (x.signal, x.published), reverse=True)
+    candidates = _filter_and_order_candidates(ranked, new_items, window, prefer_new, only_new)
+    expected = ranker.select(candidates, k, cap)
+
+    picked, n_candidates = ranker.select_top_k(
+        items, k, cap,
+        new_hashes=new_hashes, window_days=window, prefer_new=prefer_new, only_new=only_new,
+    )
+    assert [it.hash for it in picked] == [it.hash for it in expected]
+    assert n_candidates == len(candidates)
@@ -1,3 +1,4 @@
+import csv
 import datetime
 import math
 import pickle
@@ -46,3 +47,66 @@ def test_score_uses_model(tmp_path, monkeypatch):
     vec = [1.0, feats["novelty"], feats["authority"], feats["keyword_hits"], feats["engagement"]]
     expected = 1.0 / (1.0 + math.exp(-sum(w * x for w, x in zip(weights, vec))))
     assert score == expected
+
+
+@pytest.mark.parametrize("weights", [None, [0.1, 0.2, 0.3, 0.4, 0.5]])
+def test_score_batch_matches_score(tmp_path, monkeypatch, weights):
+    model_path = tmp_path / "ranker_model.pkl"
+    if weights is not None:
+        with model_path.open("wb") as fh:
+            pickle.dump(weights, fh)
+    monkeypatch.setattr(ranker, "MODEL_PATH", model_path)
+    monkeypatch.setattr(ranker, "LOG_PATH", tmp_path / "log.csv")
+    monkeypatch.setattr(ranker, "_MODEL_CACHE", None, raising=False)
+
+    items = [_make_item(), _make_item().model_copy(update={"domain": "openai.com"})]
+    expected = [ranker.score(it) for it in items]
+    assert ranker.score_batch(items) == pytest.approx(expected)
+    assert ranker.score_batch([]) == []
+
+
+def test_score_batch_reads_engagement_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(ranker, "MODEL_PATH", tmp_path / "missing.pkl")
+    monkeypatch.setattr(ranker, "LOG_PATH", tmp_path / "log.csv")
+    calls = {"count": 0}
+
+    def fake_summarize():
+        calls["count"] += 1
+        return {"source": {}, "theme": {}}
+
+    monkeypatch.setattr(ranker.analytics, "summarize", fake_summarize)
+    ranker.score_batch([_make_item() for _ in range(5)])
+    assert calls["count"] == 1
+
+
+def test_score_stream_scores_lazily_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(ranker, "MODEL_PATH", tmp_path / "missing.pkl")
+    items = [_make_item().model_copy(update={"domain": d}) for d in ("a.com", "openai.com", "github.com")]
+    expected = ranker.score_batch(items)
+    pulled = []
+
+    def source():
+        for it in items:
+            pulled.append(it)
+            yield it
+
+    stream = ranker.score_stream(source(), chunk_size=2)
+    first = next(stream)
+    assert len(pulled) == 2 and first.signal == pytest.approx(expected[0])
+    assert [it.signal for it in [first, *stream]] == pytest.approx(expected)
+
+
+def test_only_shown_items_log_impressions(tmp_path, monkeypatch):
+    log_path = tmp_path / "log.csv"
+    monkeypatch.setattr(ranker, "MODEL_PATH", tmp_path / "missing.pkl")
+    monkeypatch.setattr(ranker, "LOG_PATH", log_path)
+
+    items = [_make_item() for _ in range(5)]
+    ranker.score(items[0])
+    ranker.score_batch(items)
+    ranker.log_impressions(items[:2])
+    ranker.eventlog.flush(log_path)
+
+    with log_path.open() as fh:
+        rows = list(csv.DictReader(fh))
+    assert [r["event"] for r in rows] == ["impression", "impression"]
@@ -0,0 +1,71 @@
+import datetime
+
+import pytest
+
+from signalai.io.storage import iter_items, migrate_store, save
+from signalai.models import Item, ItemRecord
+from signalai.pipeline import ingest, normalize, ranker
+
+
+def _stored(n: int, **overrides) -> dict:
+    item = Item(
+        title=f"Agent eval {n}",
+        url=f"https://github.com/example/{n}",
+        summary="<p>Discussion about agents &amp; evals</p>",
+        published=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=n),
+        tags=["agents"],
+        source="rss",
+        hash=f"h{n}",
+        domain="github.com" if n % 2 else "example.com",
+    )
+    item.norm = normalize.normalize(item)
+    return {**item.model_dump(mode="json"), **overrides}
+
+
+def test_from_stored_matches_validation():
+    data = _stored(1, duplicate_of="h0")
+    assert Item.from_stored(data) == Item.model_validate(data)
+    # Non-ISO timestamps still parse.
+    old = Item.from_stored(_stored(2, published="Tue, 02 Jan 2024 10:00:00 GMT"))
+    assert old.published == datetime.datetime(2024, 1, 2, 10, tzinfo=datetime.timezone.utc)
+
+
+def test_records_rank_like_items(tmp_path, monkeypatch):
+    monkeypatch.setattr(ranker, "MODEL_PATH", tmp_path / "missing.pkl")
+    stored = [_stored(n) for n in range(6)]
+    items = [Item.from_stored(d) for d in stored]
+    records = [ItemRecord(d) for d in stored]
+    assert ranker.score_batch(records) == pytest.approx(ranker.score_batch(items))
+
+    top_items, _ = ranker.select_top_k(ranker.score_stream(items), 3, 2)
+    top_records, _ = ranker.select_top_k(ranker.score_stream(records), 3, 2)
+    assert [r.hash for r in top_records] == [it.hash for it in top_items]
+
+    promoted = top_records[0].to_item()
+    assert promoted.norm is None
+    assert promoted.model_dump(exclude={"norm"}) == top_items[0].model_dump(exclude={"norm"})
+    assert normalize.ensure_norm(promoted) == top_items[0].norm
+
+
+def test_iter_records_recomputes_stale_keyword_hits(tmp_path):
+    store = tmp_path / "store.json"
+    current = _stored(1)
+    stale = _stored(2, norm=None)
+    save(store, [current, stale])
+    records = {r.hash: r for r in ingest.iter_records(store)}
+    assert records["h1"].keyword_hits == current["norm"]["keyword_hits"]
+    assert records["h2"].keyword_hits == current["norm"]["keyword_hits"]
+    assert not hasattr(records["h1"], "__dict__")
+
+
+@pytest.mark.parametrize("name", ["store.json", "store.db"])
+def test_migrate_store_backfills_stale_norms_in_place(tmp_path, name):
+    store = tmp_path / name
+    current = _stored(1)
+    save(store, [current, _stored(2, norm=None), _stored(3, norm={**current["norm"], "version": "0-old"})])
+    assert migrate_store(store, store, normalize.backfill_norm) == 3
+
+    stored = {d["hash"]: d for d in iter_items(store)}
+    assert not any(normalize.is_stale(d) for d in stored.values())
+    assert stored["h1"]["norm"] == current["norm"]
+    assert Item.from_stored(stored["h2"]).norm == normalize.normalize(Item.from_stored(_stored(2)))
@@ -123,3 +123,24 @@ def test_load_plugins_entry_points(monkeypatch):
     load_plugins()
     assert "dummy" in registry
 
+
+
+def test_rss_afetch_awaits_mcp_tool(monkeypatch):
+    import asyncio
+
+    feed = {"url": "http://example.com/rss", "name": "Example"}
+
+    async def fake_call(tool, params):
+        return {"items": [{"title": "T", "link": "https://example.com/a"}]}
+
+    registry.clear()
+    load_plugins(["signalai.sources.rss:RSSSource"])
+    src = registry["rss"]()
+    monkeypatch.setattr("signalai.sources.rss.call_tool", fake_call)
+    loop = asyncio.new_event_loop()
+    monkeypatch.setattr(asyncio, "run", None)  # a nested event loop would fail here
+    try:
+        raw = loop.run_until_complete(src.afetch(feed))
+    finally:
+        loop.close()
+    assert raw == {"items": [{"title": "T", "link": "https://example.com/a"}]}
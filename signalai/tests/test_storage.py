@@ -1,8 +1,23 @@
-from datetime import datetime, date
+from datetime import datetime, date, timezone
+import gzip
 import json
 import pytest
 
-from signalai.io.storage import json_serial, load, save
+from signalai.io import backup
+from signalai.io.backup import BackupSet
+from signalai.io.storage import (
+    JsonStorage,
+    cold_dir,
+    has_hash,
+    iter_items,
+    json_serial,
+    load,
+    migrate_store,
+    partition_backup,
+    partition_backups,
+    save,
+    upsert_items,
+)
 
 
 def test_json_serial_handles_supported_types():
@@ -30,19 +45,160 @@ def test_save_and_load_round_trip(tmp_path):
     assert load(path, None) == raw
 
 
-def test_backup_rotation(tmp_path):
+def test_backups_restore_every_version(tmp_path):
     path = tmp_path / "data.json"
-    save(path, {"val": 1})
-    save(path, {"val": 2})
-    bak0 = path.with_suffix(".json.bak0")
-    assert bak0.exists()
-    with open(bak0, "r", encoding="utf-8") as f:
-        assert json.load(f)["val"] == 1
+    for val in (1, 2, 3):
+        save(path, {"val": val})
+    backups = BackupSet(path)
+    assert [v["version"] for v in backups.versions()] == [1, 2, 3]
+    assert {v["kind"] for v in backups.versions()} == {"snapshot"}
+    assert json.loads(backups.restore(1)) == {"val": 1}
+    assert backups.restore() == path.read_bytes()
 
     save(path, {"val": 3})
-    bak1 = path.with_suffix(".json.bak1")
-    assert bak1.exists()
-    with open(bak0, "r", encoding="utf-8") as f:
-        assert json.load(f)["val"] == 2
-    with open(bak1, "r", encoding="utf-8") as f:
-        assert json.load(f)["val"] == 1
+    assert len(backups.versions()) == 3  # unchanged content is not recorded
+
+
+def test_item_store_backups_are_deltas(tmp_path):
+    path = tmp_path / "items.json"
+    storage = JsonStorage(hot_days=None)
+    storage.upsert_items(path, [_item(1), _item(2)])
+    storage.upsert_items(path, [_item(3)])
+    changed = dict(_item(1), summary="updated")
+    storage.upsert_items(path, [changed])
+
+    backups = BackupSet(path)
+    assert [v["kind"] for v in backups.versions()] == ["snapshot", "delta", "delta"]
+    delta = json.loads(gzip.decompress((backups.dir / backups.versions()[2]["file"]).read_bytes()))
+    assert delta["upserts"] == [changed] and delta["deletes"] == []
+    assert [it["hash"] for it in json.loads(backups.restore(2))] == ["h1", "h2", "h3"]
+    assert backups.restore(3) == path.read_bytes()
+    assert backups.verify() == []
+
+
+def test_backups_snapshot_after_outside_edit(tmp_path):
+    path = tmp_path / "items.json"
+    save(path, [_item(1)])
+    path.write_text(json.dumps([_item(2)]), encoding="utf-8")
+    save(path, [_item(2), _item(3)])
+    backups = BackupSet(path)
+    assert [v["kind"] for v in backups.versions()] == ["snapshot", "snapshot"]
+    assert backups.restore() == path.read_bytes()
+
+
+def test_backups_prune_keeps_needed_snapshot(tmp_path):
+    path = tmp_path / "items.json"
+    backups = BackupSet(path, keep=3, snapshot_every=4)
+    previous = None
+    for n in range(1, 9):
+        content = backup.dumps([_item(i) for i in range(1, n + 1)])
+        backups.record(content, previous)
+        previous = content
+    versions = backups.versions()
+    # v5 is a snapshot, so v6-v8 need nothing older.
+    assert [v["version"] for v in versions] == [5, 6, 7, 8]
+    assert sorted(p.name for p in backups.dir.glob("v*")) == [v["file"] for v in versions]
+    assert json.loads(backups.restore(6))[-1]["hash"] == "h6"
+    with pytest.raises(KeyError):
+        backups.restore(4)
+
+
+def test_backups_verify_reports_corruption(tmp_path):
+    path = tmp_path / "items.json"
+    save(path, [_item(1)])
+    save(path, [_item(1), _item(2)])
+    backups = BackupSet(path)
+    delta = backups.dir / backups.versions()[1]["file"]
+    delta.write_bytes(gzip.compress(b'{"upserts": [], "deletes": []}'))
+    problems = backups.verify()
+    assert len(problems) == 1 and "v2" in problems[0]
+    with pytest.raises(ValueError):
+        backups.restore(2)
+    assert json.loads(backups.restore(1)) == [_item(1)]
+
+
+def _item(n, published="2024-01-0{}T00:00:00+00:00", domain="e.com"):
+    return {
+        "title": f"t{n}",
+        "url": f"https://e.com/{n}",
+        "summary": "s",
+        "published": published.format(n),
+        "tags": ["x"],
+        "source": "src",
+        "hash": f"h{n}",
+        "domain": domain,
+        "signal": None,
+    }
+
+
+def test_sqlite_upsert_and_iter(tmp_path):
+    path = tmp_path / "store.db"
+    assert upsert_items(path, [_item(1), _item(2)]) == 2
+    assert has_hash(path, "h1")
+    assert not has_hash(path, "h3")
+
+    updated = dict(_item(1), title="changed")
+    upsert_items(path, [updated, _item(3)])
+    items = list(iter_items(path))
+    assert [it["hash"] for it in items] == ["h1", "h2", "h3"]
+    assert items[0]["title"] == "changed"
+    assert items[0]["tags"] == ["x"]
+
+
+def test_sqlite_iter_since(tmp_path):
+    path = tmp_path / "store.db"
+    upsert_items(path, [_item(1), _item(2), _item(3)])
+    recent = list(iter_items(path, since=datetime(2024, 1, 2)))
+    assert [it["hash"] for it in recent] == ["h2", "h3"]
+
+
+def test_migrate_json_store_to_sqlite(tmp_path):
+    src = tmp_path / "store.json"
+    old = _item(1)
+    del old["domain"]
+    save(src, [old, _item(2)])
+    dst = tmp_path / "store.db"
+    assert migrate_store(src, dst) == 2
+    items = list(iter_items(dst))
+    assert [it["hash"] for it in items] == ["h1", "h2"]
+    assert items[0]["domain"] == "e.com"
+
+
+def test_json_store_tiers_old_items_into_monthly_partitions(tmp_path, monkeypatch):
+    path = tmp_path / "store.json"
+    recent = datetime.now(timezone.utc).isoformat()
+    items = [_item(1), _item(2, "2024-02-0{}T00:00:00+00:00"), dict(_item(3), published=recent)]
+    assert upsert_items(path, items) == 3
+
+    assert [it["hash"] for it in load(path, [])] == ["h3"]
+    assert sorted(p.name for p in cold_dir(path).iterdir()) == ["2024-01.json.gz", "2024-02.json.gz"]
+    assert [it["hash"] for it in iter_items(path)] == ["h1", "h2", "h3"]
+    assert has_hash(path, "h1") and not has_hash(path, "h4")
+
+    # Updating an archived item rewrites it in place.
+    upsert_items(path, [dict(_item(1), title="changed")])
+    archived = [it for it in iter_items(path) if it["hash"] == "h1"]
+    assert [it["title"] for it in archived] == ["changed"]
+
+    # Reads with ``since`` skip partitions of earlier months.
+    opened = []
+    real_read = JsonStorage._read_partition
+    monkeypatch.setattr(JsonStorage, "_read_partition", staticmethod(lambda p: opened.append(p.name) or real_read(p)))
+    assert [it["hash"] for it in iter_items(path, since=datetime(2024, 2, 1))] == ["h2", "h3"]
+    assert opened == ["2024-02.json.gz"]
+
+
+def test_cold_partitions_are_backed_up(tmp_path):
+    path = tmp_path / "store.json"
+    part = cold_dir(path) / "2024-01.json.gz"
+    upsert_items(path, [_item(1), _item(2)])
+    upsert_items(path, [dict(_item(1), title="changed")])
+
+    backups = partition_backup(path, "2024-01")
+    assert list(partition_backups(path)) == ["2024-01"]
+    assert [v["kind"] for v in backups.versions()] == ["snapshot", "delta"]
+    assert [it["title"] for it in json.loads(backups.restore(1))] == ["t1", "t2"]
+    assert backups.restore() == gzip.decompress(part.read_bytes())
+    assert backups.verify() == []
+    # Partition backups live with the store's own, not among the partitions.
+    assert backups.dir.is_relative_to(BackupSet(path).dir)
@@ -62,3 +62,93 @@ def test_top_bullets_no_llm_when_disabled():
     bullets = top_bullets([item], use_llm=False, client=client, cfg=cfg)
     assert bullets[0][1] == ""
     client.chat.assert_not_called()
+
+
+def test_top_bullets_concurrent_preserves_order():
+    import threading
+
+    cfg = StyleConfig(summary_min_words=10, summary_max_words=20)
+    items = [make_item(f"short {i}") for i in range(4)]
+    barrier = threading.Barrier(4, timeout=5)
+
+    class Provider:
+        model = "m"
+
+        def chat(self, messages):
+            barrier.wait()  # only passes when all four requests are in flight
+            return messages[1]["content"].split("Existing summary (may be poor): ")[1]
+
+    bullets = top_bullets(items, use_llm=True, client=Provider(), cfg=cfg, max_concurrency=4)
+    assert [b[0] for b in bullets] == items
+    assert [b[1] for b in bullets] == [f"short {i}" for i in range(4)]
+
+
+def test_top_bullets_batch_retries_failing_items_per_item():
+    import json
+
+    cfg = StyleConfig(summary_min_words=3, summary_max_words=5)
+    items = [make_item("x").model_copy(update={"hash": f"h{i}"}) for i in range(3)]
+    client = Mock()
+    client.chat.side_effect = [
+        "```json\n" + json.dumps({"h0": "one two three", "h1": "too short", "h2": "four five six"}) + "\n```",
+        "per item summary",
+    ]
+
+    bullets = top_bullets(items, use_llm=True, client=client, cfg=cfg, batch=True)
+
+    assert [b[1] for b in bullets] == ["one two three", "per item summary", "four five six"]
+    assert client.chat.call_count == 2
+    retry_messages = client.chat.call_args_list[1][0][0]
+    assert "Existing summary" in retry_messages[1]["content"]
+
+
+def test_top_bullets_batch_falls_back_on_invalid_json():
+    cfg = StyleConfig(summary_min_words=3, summary_max_words=5)
+    items = [make_item("x"), make_item("y")]
+    client = Mock()
+    client.chat.side_effect = ["not json", "a b c", "d e f"]
+    bullets = top_bullets(items, use_llm=True, client=client, cfg=cfg, batch=True)
+    assert [b[1] for b in bullets] == ["a b c", "d e f"]
+
+
+def test_batch_response_cached_only_when_complete():
+    import json
+
+    from signalai.llm.cache import LLMCache
+    from signalai.llm.summarize import summarize_batch_llm
+
+    cfg = StyleConfig(summary_min_words=3, summary_max_words=5)
+    items = [make_item("x").model_copy(update={"hash": f"h{i}"}) for i in range(2)]
+    cache = LLMCache()
+    complete = json.dumps({"h0": "one two three", "h1": "four five six"})
+    client = Mock(spec=["chat"])
+    client.chat.side_effect = ["not json", json.dumps({"h0": "one two three"}), complete]
+
+    assert summarize_batch_llm(items, client, cfg, cache=cache) == {}
+    # Partial responses are used but not cached either.
+    assert summarize_batch_llm(items, client, cfg, cache=cache) == {0: "one two three"}
+    assert summarize_batch_llm(items, client, cfg, cache=cache) == {0: "one two three", 1: "four five six"}
+    assert summarize_batch_llm(items, client, cfg, cache=cache) == {0: "one two three", 1: "four five six"}
+    assert client.chat.call_count == 3
+
+
+def test_summary_usage_counts_the_fallback_provider(caplog):
+    from signalai.llm.provider import TokenUsage
+
+    cfg = StyleConfig(summary_min_words=3, summary_max_words=5)
+    items = [make_item("x"), make_item("y")]
+
+    def provider(reply):
+        usage = TokenUsage()
+
+        def chat(messages):
+            usage.add({"prompt_tokens": 10, "completion_tokens": 2})
+            return reply
+
+        return Mock(spec=["chat", "usage"], chat=Mock(side_effect=chat), usage=usage)
+
+    # The primary provider fails every request, so the fallback answers them.
+    client, fallback = provider(""), provider("a b c")
+    with caplog.at_level("INFO", logger="signalai.llm.summarize"):
+        top_bullets(items, use_llm=True, client=client, cfg=cfg, fallback=fallback)
+    assert "4 requests, 40 prompt tokens, 8 completion tokens" in caplog.text
@@ -1,6 +1,8 @@
 from datetime import datetime, timezone
 from unittest.mock import patch
 
+import pytest
+
 from signalai.pipeline import theme
 from signalai.models import Item
 
@@ -62,3 +64,31 @@ def test_refresh_themes_respects_interval():
         assert mock_cluster.call_count == 1
         theme.refresh_themes(items, interval_hours=0)
         assert mock_cluster.call_count == 2
+
+
+def test_vectorized_clustering_matches_pure_python():
+    np = pytest.importorskip("numpy")
+    titles = [
+        "Agent orchestration breakthrough", "Orchestrating agents at scale",
+        "Benchmark evaluation released", "Evaluation benchmark improved",
+        "Pruning reduces latency", "Distillation improves throughput",
+        "Vision language model", "Multimodal VLM release",
+        "Safety alignment research", "RLHF and DPO compared",
+    ]
+    items = [make_item(t, t.split()[0]) for t in titles]
+    vecs = theme._embed_items(items)
+    X = np.asarray(vecs, dtype=float)
+    for k in range(2, 6):
+        labels = theme._kmeans(vecs, k)
+        assert theme._kmeans_np(X, k) == labels
+        assert theme._silhouette_np(X, labels, k) == pytest.approx(theme._silhouette(vecs, labels, k))
+
+
+def test_sampled_silhouette_close_to_exact():
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(1)
+    X = np.vstack([rng.normal(0, 1, (300, 8)), rng.normal(6, 1, (300, 8))])
+    labels = [0] * 300 + [1] * 300
+    exact = theme._silhouette_np(X, labels, 2, sample_size=len(X))
+    sampled = theme._silhouette_np(X, labels, 2, sample_size=200)
+    assert sampled == pytest.approx(exact, abs=0.05)
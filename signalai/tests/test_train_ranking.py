@@ -0,0 +1,156 @@
+import csv
+import pickle
+import random
+
+import pytest
+
+from signalai.pipeline import ranker, train_ranking
+
+np = pytest.importorskip("numpy")
+
+FIELDS = ["timestamp", "item_url", "novelty", "authority", "keyword_hits", "engagement", "event"]
+
+
+@pytest.fixture
+def log(tmp_path, monkeypatch):
+    path = tmp_path / "ranker_log.csv"
+    rnd = random.Random(0)
+    with path.open("w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=FIELDS)
+        writer.writeheader()
+        for i in range(3000):
+            hits = rnd.randint(0, 4)
+            clicked = rnd.random() < 0.02 + 0.08 * hits
+            writer.writerow(
+                {"timestamp": "2025-01-01T00:00:00+00:00", "item_url": f"u{i}",
+                 "novelty": rnd.random(), "authority": 0.6, "keyword_hits": hits,
+                 "engagement": 0.3, "event": "click" if clicked else "impression"}
+            )
+    monkeypatch.setattr(train_ranking, "LOG_PATH", path)
+    monkeypatch.setattr(train_ranking, "MODEL_PATH", tmp_path / "model.pkl")
+    return path
+
+
+def test_train_sgd_writes_versioned_artifact(log, tmp_path, monkeypatch):
+    report = train_ranking.train_sgd(epochs=30, chunk_rows=500, patience=2)
+    assert report["rows"] == 3000
+    assert 1 <= report["epochs"] <= 30
+    assert report["rows_per_s"] > 0
+    assert report["val_loss"] is not None
+
+    with report["path"].open("rb") as fh:
+        artifact = pickle.load(fh)
+    assert artifact["version"] == train_ranking.MODEL_VERSION
+    assert artifact["features"] == ranker.MODEL_FEATURES
+    # Clicks were generated from keyword hits.
+    assert artifact["weights"][3] > 0
+
+    monkeypatch.setattr(ranker, "MODEL_PATH", report["path"])
+    monkeypatch.setattr(ranker, "_MODEL_CACHE", None)
+    assert ranker._load_model() == artifact["weights"]
+
+
+def test_class_weighting_raises_rare_click_scores(log):
+    def mean_prediction(**kwargs):
+        path = train_ranking.train_sgd(epochs=5, **kwargs)["path"]
+        with path.open("rb") as fh:
+            w = np.asarray(pickle.load(fh)["weights"])
+        X = np.concatenate([X for X, _ in train_ranking.iter_chunks()])
+        return float(train_ranking._sigmoid(X @ w).mean())
+
+    assert mean_prediction(class_weight="balanced") > mean_prediction(class_weight=None)
+
+
+def test_ranker_ignores_unknown_feature_schema(tmp_path, monkeypatch):
+    path = train_ranking.save_model([0.0] * 3, tmp_path / "model.pkl")
+    with path.open("rb") as fh:
+        artifact = pickle.load(fh)
+    artifact["features"] = ["bias", "other", "feature"]
+    with path.open("wb") as fh:
+        pickle.dump(artifact, fh)
+    monkeypatch.setattr(ranker, "MODEL_PATH", path)
+    monkeypatch.setattr(ranker, "_MODEL_CACHE", None)
+    assert ranker._load_model() is None
+
+
+def _append(path, n, event="click"):
+    with path.open("a", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=FIELDS)
+        for i in range(n):
+            writer.writerow(
+                {"timestamp": "2025-01-02T00:00:00+00:00", "item_url": f"new{i}", "novelty": 1.0,
+                 "authority": 0.6, "keyword_hits": 4, "engagement": 0.3, "event": event}
+            )
+
+
+def test_online_update_reads_only_new_events(log, monkeypatch):
+    model_path = train_ranking.train_sgd(epochs=3)["path"]
+    monkeypatch.setattr(ranker, "MODEL_PATH", model_path)
+    monkeypatch.setattr(ranker, "_MODEL_CACHE", None)
+    before = ranker._load_model()
+
+    assert train_ranking.update_online() == {"rows": 0, "path": None}
+
+    _append(log, 50)
+    report = train_ranking.update_online()
+    assert report["rows"] == 50
+    after = ranker._load_model()
+    # The cached weights were replaced without a restart; clicks on
+    # keyword-heavy items raise the keyword weight.
+    assert after != before
+    assert after[3] > before[3]
+    assert train_ranking.load_model()["rows"] == 3050
+
+    _append(log, 5)
+    assert train_ranking.update_online()["rows"] == 5
+
+
+def test_sgd_epochs_stop_at_the_saved_cursor(log, monkeypatch):
+    expected = train_ranking.train_sgd(epochs=2, patience=5)
+    expected_w = train_ranking.load_model()["weights"]
+    real_chunks = train_ranking.iter_chunks
+
+    def growing_chunks(*args, **kwargs):
+        # Events keep arriving while the epochs run.
+        _append(log, 10)
+        yield from real_chunks(*args, **kwargs)
+
+    monkeypatch.setattr(train_ranking, "iter_chunks", growing_chunks)
+    report = train_ranking.train_sgd(epochs=2, patience=5)
+    assert report["rows"] == expected["rows"] == 3000
+    assert train_ranking.load_model()["weights"] == expected_w
+    # Rows logged during training are applied once, by the next update.
+    assert train_ranking.update_online()["rows"] == 20
+
+
+def test_online_update_without_model_replays_log(log):
+    assert train_ranking.update_online()["rows"] == 3000
+    assert train_ranking.load_model()["trainer"] == "online"
+
+
+def test_online_update_requires_a_cursor_or_replay(log):
+    # The full-batch trainer records where in the log it stopped.
+    train_ranking.train_model(epochs=1)
+    assert train_ranking.load_model()["cursor"] is not None
+    assert train_ranking.update_online() == {"rows": 0, "path": None}
+
+    # Legacy weight lists (and date-range models) have no cursor.
+    with open(train_ranking.MODEL_PATH, "wb") as fh:
+        pickle.dump([0.0] * len(ranker.MODEL_FEATURES), fh)
+    with pytest.raises(ValueError):
+        train_ranking.update_online()
+    assert train_ranking.update_online(replay=True)["rows"] == 3000
+    assert train_ranking.update_online()["rows"] == 0
+
+
+def test_flat_csv_logs_tolerate_empty_features(log):
+    with log.open("a", newline="") as fh:
+        csv.DictWriter(fh, fieldnames=FIELDS).writerow(
+            {"timestamp": "2025-01-01T00:00:00+00:00", "item_url": "blank", "novelty": "",
+             "authority": "", "keyword_hits": "", "engagement": "", "event": "click"}
+        )
+    X, y = train_ranking.load_training_data()
+    assert X[-1] == [1.0, 0.0, 0.0, 0.0, 0.0] and y[-1] == 1.0
+    assert train_ranking.train_sgd(epochs=1)["rows"] == 3001
+    train_ranking.MODEL_PATH.unlink()
+    assert train_ranking.update_online()["rows"] == 3001
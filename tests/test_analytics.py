@@ -1,5 +1,7 @@
 import datetime
 
+import pytest
+
 from signalai import analytics
 from signalai.pipeline import ranker
 from signalai.models import Item
@@ -44,3 +46,45 @@ def test_personalized_feed(tmp_path, monkeypatch):
     base_score = ranker.score(item)
     personalized = ranker.score(item, profile)
     assert personalized > base_score
+
+
+def test_summary_view_reads_only_new_events(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics, "LOG_PATH", tmp_path / "log.csv")
+    item = make_item()
+    analytics.log_event(item, "click")
+    assert analytics.summarize()["source"] == {"Example": 1}
+    assert (tmp_path / "log.agg.json").exists()
+
+    seen = []
+    read_tail = analytics.eventlog.read_tail
+
+    def spy(path, columns, cursor=None):
+        for block, new_cursor in read_tail(path, columns, cursor):
+            seen.append(len(block["source"]))
+            yield block, new_cursor
+
+    monkeypatch.setattr(analytics.eventlog, "read_tail", spy)
+    analytics.log_event(item, "click")
+    assert analytics.summarize()["source"] == {"Example": 2}
+    assert seen == [1]
+    assert analytics.summarize()["theme"] == {"security": 2}
+    assert seen == [1, 0]
+
+
+def test_decayed_counts_fade_with_half_life(tmp_path, monkeypatch):
+    log = tmp_path / "engagement_log"
+    monkeypatch.setattr(analytics, "LOG_PATH", log)
+    item = make_item()
+    old = (
+        datetime.datetime.now(datetime.timezone.utc)
+        - datetime.timedelta(days=analytics.DECAY_HALF_LIFE_DAYS)
+    ).isoformat()
+    analytics.eventlog.get_log(log, analytics._LOG_FIELDS).append(
+        {"timestamp": old, "item_url": item.url, "source": "Example", "themes": "", "event": "click"}
+    )
+    analytics.log_event(item, "click")
+
+    assert analytics.summarize()["source"] == {"Example": 2}
+    decayed = analytics.summarize(decayed=True)
+    assert decayed["source"]["Example"] == pytest.approx(1.5, rel=1e-3)
+    assert decayed["theme"]["security"] == pytest.approx(1.0, rel=1e-3)
@@ -1,5 +1,5 @@
 from signalai.llm.provider import FallbackProvider
-from signalai.llm.cache import LLMCache
+from signalai.llm.cache import DiskLLMCache, LLMCache
 
 
 class DummyProvider:
@@ -55,3 +55,108 @@ def test_fallback_and_cache_behavior():
     assert fb.chat(messages) == "fallback"
     assert failing.calls == 2
     assert secondary.calls == 1
+
+
+def test_cache_key_covers_sampling_params():
+    cache = LLMCache()
+    messages = [{"role": "user", "content": "hello"}]
+
+    p1 = DummyProvider(model="m1")
+    p1.temperature = 0.2
+    FallbackProvider([p1], cache=cache).chat(messages)
+
+    p2 = DummyProvider(model="m1")
+    p2.temperature = 0.9
+    FallbackProvider([p2], cache=cache).chat(messages)
+    assert p2.calls == 1  # same model, different temperature -> not cached
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_disk_cache_persists_across_instances(tmp_path):
+    messages = [{"role": "user", "content": "hello"}]
+    path = tmp_path / "llm_cache.sqlite"
+
+    cache = DiskLLMCache(path)
+    FallbackProvider([DummyProvider()], cache=cache).chat(messages)
+    cache.close()
+
+    provider = DummyProvider()
+    cache = DiskLLMCache(path)
+    assert FallbackProvider([provider], cache=cache).chat(messages) == "ok"
+    assert provider.calls == 0
+    assert cache.hits == 1
+
+
+def test_disk_cache_ttl_and_lru(tmp_path, monkeypatch):
+    clock = {"now": 1000.0}
+    monkeypatch.setattr("signalai.llm.cache.time.time", lambda: clock["now"])
+    cache = DiskLLMCache(tmp_path / "c.sqlite", max_entries=2, ttl_s=10)
+    msgs = lambda text: [{"role": "user", "content": text}]
+
+    cache.set(msgs("a"), {}, "A")
+    clock["now"] += 1
+    cache.set(msgs("b"), {}, "B")
+    clock["now"] += 1
+    assert cache.get(msgs("a"), {}) == "A"  # "a" is now most recently used
+    clock["now"] += 1
+    cache.set(msgs("c"), {}, "C", ttl_s=100)
+    assert cache.get(msgs("b"), {}) is None  # evicted as least recently used
+
+    clock["now"] += 20
+    assert cache.get(msgs("a"), {}) is None  # expired
+    assert cache.get(msgs("c"), {}) == "C"  # per-entry TTL
+
+
+def test_openai_provider_records_token_usage(monkeypatch):
+    import requests
+
+    from signalai.llm import provider as provider_mod
+
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = (
+        b'{"choices": [{"message": {"content": "hi"}}],'
+        b' "usage": {"prompt_tokens": 12, "completion_tokens": 3}}'
+    )
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    monkeypatch.setattr(provider_mod.http, "post", lambda *a, **k: resp)
+
+    p = provider_mod.OpenAIProvider(model="m")
+    assert p.chat([{"role": "user", "content": "x"}]) == "hi"
+    assert p.chat([{"role": "user", "content": "x"}]) == "hi"
+    assert p.usage.snapshot() == {"requests": 2, "prompt_tokens": 24, "completion_tokens": 6}
+
+
+def test_summary_makes_one_retry_loop_per_provider(monkeypatch):
+    import datetime
+
+    import requests
+
+    from signalai.config import StyleConfig
+    from signalai.io import http
+    from signalai.llm.provider import LocalProvider, OpenAIProvider
+    from signalai.llm.summarize import summarize_item_llm
+    from signalai.models import Item
+
+    posts = []
+
+    class DownSession:
+        def request(self, method, url, **kwargs):
+            posts.append(url)
+            raise requests.ConnectionError("down")
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(http, "session_for", lambda url: DownSession())
+    monkeypatch.setattr(http.time, "sleep", lambda s: None)
+    item = Item(
+        title="T",
+        url="https://example.com/a",
+        summary="S",
+        published=datetime.datetime.now(datetime.timezone.utc),
+        tags=[],
+        source="rss",
+        domain="example.com",
+    )
+    summarize_item_llm(item, OpenAIProvider(), StyleConfig(), cache=LLMCache(), fallback=LocalProvider())
+    # Only io.http retries the POST; the fallback layer does not multiply it.
+    assert len(posts) == 3